@@ -0,0 +1,65 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import tempfile
+import time
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(root_dir)
+
+from src.citation_index import CitationIndex
+
+
+def make_graph(n_nodes, mean_citations=10, seed=42):
+    """Random citation graph: integer appln_ids, citing filed after cited, families of ~3."""
+    rng = np.random.default_rng(seed)
+    ids = np.sort(rng.choice(np.arange(1, 50 * n_nodes), n_nodes, replace=False))
+    n_edges = n_nodes * mean_citations
+    citing = rng.integers(0, n_nodes, n_edges)
+    cited = rng.integers(0, n_nodes, n_edges)
+    nodes = pd.DataFrame({
+        'year': rng.integers(1990, 2026, n_nodes),
+        'family': rng.integers(0, n_nodes // 3, n_nodes),
+    }, index=ids)
+    return ids[citing], ids[cited], nodes
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:>32} | {time.perf_counter() - start:>8.3f} s")
+    return result
+
+
+def run(n_nodes=1_000_000):
+    citing, cited, nodes = make_graph(n_nodes)
+    print(f"{n_nodes:,} nodes, {len(citing):,} raw edges")
+    index = timed('build (from_edges)', lambda: CitationIndex.from_edges(citing, cited, nodes))
+    portfolio = nodes.index.to_numpy()[::10]
+
+    timed('forward counts', lambda: index.forward_counts(portfolio))
+    timed('backward counts', lambda: index.backward_counts(portfolio))
+    timed('forward counts (5y window)', lambda: index.forward_counts(portfolio, window=5))
+    timed('forward counts (family dedup)', lambda: index.forward_counts(portfolio, dedup_families=True))
+    timed('family forward counts', lambda: index.family_forward_counts(portfolio))
+
+    # Counting per row with Python loops, as a reference on a slice
+    sample = portfolio[:1_000]
+    naive = timed('naive loop (1k ids)', lambda: np.array([len(index.citing(i)) for i in sample]))
+    assert np.array_equal(naive, index.forward_counts(sample))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = timed('save', lambda: index.save(os.path.join(tmp, 'citation_index')))
+        loaded = timed('load (mmap)', lambda: CitationIndex.load(path))
+        timed('load (in memory)', lambda: CitationIndex.load(path, mmap=False))
+        counts = timed('forward counts (mmap)', lambda: loaded.forward_counts(portfolio))
+        assert np.array_equal(counts, index.forward_counts(portfolio))
+        del loaded
+
+
+if __name__ == "__main__":
+    print("--- 3D-PVE: Citation Index Benchmark ---")
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
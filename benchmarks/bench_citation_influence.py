@@ -0,0 +1,55 @@
+import numpy as np
+import os
+import sys
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(root_dir)
+sys.path.append(current_dir)
+
+from bench_citation_index import timed
+from src.citation_index import CitationIndex
+from src.citation_influence import CitationInfluence
+
+
+def make_citation_dag(first_id, n_nodes, mean_citations=10, seed=42):
+    """Applications in filing order, each citing earlier ones with a skew towards old (foundational) work."""
+    rng = np.random.default_rng(seed)
+    citing = np.repeat(np.arange(first_id, first_id + n_nodes), mean_citations)
+    cited = (citing * rng.random(len(citing)) ** 3).astype(np.int64)
+    return citing, cited
+
+
+def run(n_nodes=2_000_000, new_share=0.01):
+    citing, cited = make_citation_dag(1, n_nodes)
+    index = CitationIndex.from_edges(citing, cited)
+    print(f"{index.n_nodes:,} nodes, {index.n_edges:,} edges")
+
+    scorer = timed('cold fit', lambda: CitationInfluence().fit(index))
+    print(f"{'':>32} | {scorer.iterations} iterations, residual {scorer.residuals[-1]:.1e}")
+    timed('weighted citations', lambda: scorer.weighted_citations())
+
+    # Next snapshot: 1% new applications with their citations
+    new_citing, new_cited = make_citation_dag(n_nodes + 1, int(n_nodes * new_share), seed=7)
+    snapshot = CitationIndex.from_edges(np.r_[citing, new_citing], np.r_[cited, new_cited])
+    print(f"new snapshot: +{snapshot.n_nodes - index.n_nodes:,} nodes, +{snapshot.n_edges - index.n_edges:,} edges")
+
+    cold = timed('new snapshot: cold fit', lambda: CitationInfluence().fit(snapshot))
+    print(f"{'':>32} | {cold.iterations} iterations")
+    warm = timed('new snapshot: warm-started fit', lambda: CitationInfluence().fit(snapshot, warm_start=scorer))
+    print(f"{'':>32} | {warm.iterations} iterations")
+    pushed = timed('new snapshot: update (push)', lambda: scorer.update(snapshot))
+    print(f"{'':>32} | {pushed.iterations} rounds")
+
+    # Same vector up to the convergence tolerance
+    exact = CitationInfluence(tol=1e-13).fit(snapshot, warm_start=cold)
+    for label, result in [('cold', cold), ('warm', warm), ('update', pushed)]:
+        error = np.abs(result.rank - exact.rank).sum()
+        print(f"{'L1 error vs exact (' + label + ')':>32} | {error:.1e}")
+        assert error < 1e-8
+
+
+if __name__ == "__main__":
+    print("--- 3D-PVE: Citation Influence (PageRank) Benchmark ---")
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
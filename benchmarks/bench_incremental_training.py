@@ -0,0 +1,58 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import time
+import tracemalloc
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(root_dir)
+
+from sklearn.linear_model import Ridge
+from src.ml_optimizer import FEATURES, TARGET, IncrementalRidgeTrainer
+
+
+def iter_scored_chunks(n_rows, chunk_size, seed=42):
+    """Synthetic stand-in for StreamingScorer output (scores + noisy value)."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, chunk_size):
+        size = min(chunk_size, n_rows - start)
+        scores = rng.uniform(0, 100, (size, len(FEATURES)))
+        value = 50000 * (1 + scores.mean(axis=1) / 20) + rng.normal(0, 5000, size)
+        df = pd.DataFrame(scores, columns=FEATURES)
+        df[TARGET] = value
+        yield df
+
+
+def run(n_rows=2_000_000, chunk_size=100_000):
+    # 1. Batch Ridge on the fully materialized frame
+    tracemalloc.start()
+    start = time.perf_counter()
+    full = pd.concat(iter_scored_chunks(n_rows, chunk_size), ignore_index=True)
+    ridge = Ridge(alpha=1.0).fit(full[FEATURES], full[TARGET])
+    t_batch = time.perf_counter() - start
+    peak_batch = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del full
+
+    # 2. Incremental sufficient statistics over the same stream
+    tracemalloc.start()
+    start = time.perf_counter()
+    trainer = IncrementalRidgeTrainer(alpha=1.0).fit_stream(iter_scored_chunks(n_rows, chunk_size))
+    coef, intercept = trainer.solve()
+    t_inc = time.perf_counter() - start
+    peak_inc = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    max_diff = max(np.abs(coef - ridge.coef_).max(), abs(intercept - ridge.intercept_))
+    print(f"Rows: {n_rows:,} | chunk: {chunk_size:,} | max |Δcoef|: {max_diff:.2e}")
+    print(f"{'trainer':>12} | {'time (s)':>8} | {'peak MB':>8}")
+    print(f"{'batch Ridge':>12} | {t_batch:>8.2f} | {peak_batch / 1e6:>8.1f}")
+    print(f"{'incremental':>12} | {t_inc:>8.2f} | {peak_inc / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    print("--- 3D-PVE: Incremental Ridge Training Benchmark ---")
+    run()
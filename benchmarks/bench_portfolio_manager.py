@@ -0,0 +1,72 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import time
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(root_dir)
+
+from src.portfolio_manager import PortfolioManager
+from src.scoring_engine import PatentValueEngine
+
+LEGAL_STATUSES = ['Active', 'Opposition (Survived)', 'Appeal (Survived)', 'Lapse', 'Revocation', 'Granted']
+
+
+def process_portfolio_scalar(engine, df):
+    """Reference: the previous iterrows() implementation (unrounded scores)."""
+    results = []
+    for _, row in df.iterrows():
+        s_leg = engine.calculate_legal_score(row['legal_status'])
+        s_eco = engine.calculate_economic_score(row['family_size'], row['years_active'])
+        s_tech = engine.calculate_tech_score(row['tech_diversity'])
+        results.append((s_leg, s_eco, s_tech, engine.get_composite_score(s_leg, s_eco, s_tech)))
+    return np.array(results, dtype=np.float64).reshape(-1, 4)
+
+
+def make_portfolio(n_rows, seed=42):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'patent_id': np.arange(n_rows),
+        'legal_status': rng.choice(LEGAL_STATUSES, n_rows),
+        'family_size': rng.integers(1, 40, n_rows),
+        'years_active': rng.integers(0, 20, n_rows),
+        'tech_diversity': np.where(rng.random(n_rows) < 0.1, 0.0, rng.random(n_rows) * 4),
+    })
+
+
+def run(sizes=(1_000, 10_000, 100_000), vector_sizes=(1_000_000,)):
+    engine = PatentValueEngine()
+    manager = PortfolioManager(engine=engine)
+    print(f"{'rows':>10} | {'iterrows (s)':>12} | {'vectorized (s)':>14} | {'speedup':>8} | parity")
+    for n_rows in sizes:
+        df = make_portfolio(n_rows)
+
+        start = time.perf_counter()
+        expected = process_portfolio_scalar(engine, df)
+        t_scalar = time.perf_counter() - start
+
+        start = time.perf_counter()
+        manager.process_portfolio(df)
+        t_vec = time.perf_counter() - start
+
+        # Exact (bitwise) parity of the unrounded engine outputs
+        s_leg = engine.calculate_legal_scores(df['legal_status'])
+        s_eco = engine.calculate_economic_scores(df['family_size'], df['years_active'])
+        s_tech = engine.calculate_tech_scores(df['tech_diversity'])
+        actual = np.column_stack([s_leg, s_eco, s_tech, engine.get_composite_scores(s_leg, s_eco, s_tech)])
+        parity = np.array_equal(actual, expected)
+        print(f"{n_rows:>10,} | {t_scalar:>12.3f} | {t_vec:>14.4f} | {t_scalar / t_vec:>7.0f}x | {'exact' if parity else 'MISMATCH'}")
+
+    for n_rows in vector_sizes:
+        df = make_portfolio(n_rows)
+        start = time.perf_counter()
+        manager.process_portfolio(df)
+        print(f"{n_rows:>10,} | {'-':>12} | {time.perf_counter() - start:>14.4f} | {'-':>8} | -")
+
+
+if __name__ == "__main__":
+    print("--- 3D-PVE: PortfolioManager Benchmark ---")
+    run()
@@ -0,0 +1,53 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import time
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(root_dir)
+
+from src.ml_optimizer import FEATURES, PatentValuationOptimizer
+from src.mock_data import generate_mock_portfolio
+from src.scoring_engine import ScoringEngine
+
+
+def run(n_single=2_000, n_batch=10_000_000):
+    # Train on a scored mock portfolio, exactly like the dashboard would
+    optimizer = PatentValuationOptimizer()
+    optimizer.train(ScoringEngine().bulk_score(generate_mock_portfolio(5_000)))
+
+    rng = np.random.default_rng(42)
+    X = rng.uniform(0, 100, (n_batch, len(FEATURES)))
+    tech, legal, market = (np.ascontiguousarray(X[:, i]) for i in range(3))
+
+    # 1. One predict() call per patent
+    start = time.perf_counter()
+    single = np.array([optimizer.predict(*row) for row in X[:n_single]])
+    t_single = time.perf_counter() - start
+
+    # 2. Matrix-vector product into a caller-owned buffer
+    out = np.empty(n_batch)
+    start = time.perf_counter()
+    optimizer.predict_batch(X, out=out)
+    t_matrix = time.perf_counter() - start
+
+    # 3. Struct-of-arrays
+    out_soa = np.empty(n_batch)
+    start = time.perf_counter()
+    optimizer.predict_batch(tech=tech, legal=legal, market=market, out=out_soa)
+    t_soa = time.perf_counter() - start
+
+    assert np.allclose(single, out[:n_single], rtol=1e-12, atol=1e-9)
+    assert np.allclose(out, out_soa, rtol=1e-12, atol=1e-9)
+    print(f"{'path':>18} | {'rows':>11} | {'M predictions/s':>15}")
+    print(f"{'predict()':>18} | {n_single:>11,} | {n_single / t_single / 1e6:>15.4f}")
+    print(f"{'predict_batch(X)':>18} | {n_batch:>11,} | {n_batch / t_matrix / 1e6:>15.1f}")
+    print(f"{'predict_batch(SoA)':>18} | {n_batch:>11,} | {n_batch / t_soa / 1e6:>15.1f}")
+
+
+if __name__ == "__main__":
+    print("--- 3D-PVE: Valuation Model Inference Benchmark ---")
+    run()
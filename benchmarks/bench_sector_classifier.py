@@ -0,0 +1,60 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import time
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(root_dir)
+
+from src.sector_classifier import SectorClassifier
+
+
+def map_ipc_to_sector(ipc):
+    """Reference: the per-row mapping previously inlined in the Valuation Engine page."""
+    if not ipc or pd.isna(ipc): return 'Industrial Mfg'
+    ipc = str(ipc).upper()
+    if ipc.startswith(('G06', 'G16', 'H04')): return 'AI & Software'
+    if ipc.startswith(('A61', 'C12')): return 'Biotech'
+    if ipc.startswith('H01L'): return 'Semiconductors'
+    if ipc.startswith(('Y02', 'H01M', 'F03')): return 'Green Energy'
+    if ipc.startswith(('C07', 'C08', 'B32')): return 'Advanced Materials'
+    if ipc.startswith(('B60', 'G05D')): return 'Automotive'
+    return 'Industrial Mfg'
+
+
+def make_symbols(n_rows, seed=42):
+    """Synthetic ipc_class_symbol column with PATSTAT-like formatting and some NULLs."""
+    rng = np.random.default_rng(seed)
+    subclasses = ['G06F', 'G06Q', 'H04L', 'H04W', 'A61K', 'A61B', 'C12N', 'H01L', 'H01M',
+                  'Y02E', 'F03D', 'C07D', 'C08L', 'B32B', 'B60L', 'G05D', 'B65D', 'F16H', 'g16h']
+    groups = rng.integers(1, 99, n_rows).astype(str)
+    symbols = pd.Series(rng.choice(subclasses, n_rows), dtype=object) + '  ' + groups + '/00'
+    symbols[rng.random(n_rows) < 0.05] = None
+    return symbols
+
+
+def run(sizes=(10_000, 100_000, 1_000_000)):
+    classifier = SectorClassifier()
+    print(f"{'rows':>10} | {'apply (s)':>10} | {'vectorized (s)':>14} | {'speedup':>8}")
+    for n_rows in sizes:
+        symbols = make_symbols(n_rows)
+
+        start = time.perf_counter()
+        expected = symbols.apply(map_ipc_to_sector)
+        t_apply = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = classifier.classify(symbols)
+        t_vec = time.perf_counter() - start
+
+        # Parity check against the legacy mapping
+        assert (result.astype(object) == expected).all(), "Sector mismatch vs. legacy apply"
+        print(f"{n_rows:>10,} | {t_apply:>10.3f} | {t_vec:>14.3f} | {t_apply / t_vec:>7.1f}x")
+
+
+if __name__ == "__main__":
+    print("--- 3D-PVE: Sector Classifier Benchmark ---")
+    run()
@@ -0,0 +1,81 @@
+import pandas as pd
+import numpy as np
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(root_dir)
+
+from src.snapshot_store import write_snapshot
+
+# Each load runs in a fresh interpreter so time and peak RSS are "cold"
+LOADER = """
+import sys, time
+sys.path.append({root!r})
+start = time.perf_counter()
+if {fmt!r} == 'csv':
+    import pandas as pd
+    df = pd.read_csv({path!r})
+    df = df[['appln_id', 'appln_filing_year', 'docdb_family_size', 'publn_claims']]
+else:
+    from src.snapshot_store import read_snapshot
+    df = read_snapshot({path!r}, columns=['appln_id', 'appln_filing_year', 'docdb_family_size', 'publn_claims'])
+elapsed = time.perf_counter() - start
+# VmHWM is the peak RSS of this process image (ru_maxrss survives exec on Linux)
+peak_kb = next(int(l.split()[1]) for l in open('/proc/self/status') if l.startswith('VmHWM'))
+print(elapsed, peak_kb, len(df))
+"""
+
+
+def make_portfolio(n_rows, seed=42):
+    """Flat portfolio shaped like the Live JOIN, including a large abstract column."""
+    rng = np.random.default_rng(seed)
+    words = np.array(['battery', 'neural', 'network', 'vehicle', 'protein', 'laser', 'wafer', 'signal'])
+    abstracts = pd.Series(rng.choice(words, (n_rows, 40)).tolist()).str.join(' ')
+    return pd.DataFrame({
+        'appln_id': np.arange(n_rows, dtype=np.int64) + 400_000_000,
+        'appln_filing_year': rng.integers(2000, 2025, n_rows),
+        'docdb_family_size': rng.integers(1, 40, n_rows),
+        'publn_claims': rng.integers(1, 60, n_rows),
+        'ipc_class_symbol': rng.choice(['G06F  17/30', 'A61K  31/00', 'H01L  21/02', 'B60L  53/00'], n_rows),
+        'appln_abstract': abstracts,
+    })
+
+
+def cold_load(fmt, path):
+    script = LOADER.format(root=root_dir, fmt=fmt, path=path)
+    out = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    elapsed, max_rss_kb, rows = out.stdout.split()
+    return float(elapsed), int(max_rss_kb) / 1024, int(rows)
+
+
+def run(n_rows=1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        df = make_portfolio(n_rows)
+        csv_path = os.path.join(tmp, 'static_portfolio.csv')
+        snap_path = os.path.join(tmp, 'static_portfolio.pvec')
+
+        start = time.perf_counter()
+        df.to_csv(csv_path, index=False)
+        t_csv_write = time.perf_counter() - start
+        start = time.perf_counter()
+        write_snapshot(df, snap_path)
+        t_snap_write = time.perf_counter() - start
+        del df
+
+        print(f"Rows: {n_rows:,} | write CSV {t_csv_write:.2f}s | write snapshot {t_snap_write:.2f}s")
+        print(f"{'format':>10} | {'cold load (s)':>13} | {'peak RSS (MB)':>13}")
+        for fmt, path in [('csv', csv_path), ('snapshot', snap_path)]:
+            elapsed, rss_mb, rows = cold_load(fmt, path)
+            assert rows == n_rows
+            print(f"{fmt:>10} | {elapsed:>13.3f} | {rss_mb:>13.1f}")
+
+
+if __name__ == "__main__":
+    print("--- 3D-PVE: Static Snapshot Load Benchmark ---")
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,103 @@
+import pandas as pd
+import numpy as np
+import os
+import pickle
+import sys
+import threading
+import time
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(root_dir)
+
+from src.local_patstat import LocalPatstatClient
+from src.sql_client import DataManager
+
+JOIN_QUERY = """
+SELECT
+    t1.appln_id, t1.appln_filing_year, t1.docdb_family_size,
+    t2.publn_claims,
+    t3.ipc_class_symbol,
+    t4.appln_abstract
+FROM tls201_appln AS t1
+INNER JOIN tls211_pat_publn AS t2 ON t1.appln_id = t2.appln_id
+LEFT JOIN tls209_appln_ipc AS t3 ON t1.appln_id = t3.appln_id
+LEFT JOIN tls203_appln_abstr AS t4 ON t1.appln_id = t4.appln_id
+WHERE t1.appln_filing_year > 2018
+LIMIT {limit}
+"""
+
+
+class SimulatedNetwork:
+    """Wraps a client with per-query latency and a bandwidth cap; counts bytes on the wire."""
+    def __init__(self, client, latency_s=0.15, bytes_per_s=20e6):
+        self.client = client
+        self.latency_s = latency_s
+        self.bytes_per_s = bytes_per_s
+        self.bytes = 0
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    def sql_query(self, sql, use_legacy_sql=False):
+        rows = self.client.sql_query(sql, use_legacy_sql=use_legacy_sql)
+        size = len(pickle.dumps(rows, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            self.bytes += size
+            self.queries += 1
+        time.sleep(self.latency_s + size / self.bytes_per_s)
+        return rows
+
+
+def make_tables(n_appln, seed=42):
+    rng = np.random.default_rng(seed)
+    ids = np.arange(n_appln, dtype=np.int64) + 400_000_000
+    n_ipc = rng.integers(1, 8, n_appln)  # IPC fan-out per application
+    words = np.array(['battery', 'neural', 'network', 'vehicle', 'protein', 'laser', 'wafer', 'signal'])
+    return {
+        'tls201_appln': pd.DataFrame({
+            'appln_id': ids,
+            'appln_filing_year': rng.integers(2019, 2025, n_appln),
+            'docdb_family_size': rng.integers(1, 30, n_appln),
+        }),
+        'tls211_pat_publn': pd.DataFrame({'appln_id': ids, 'publn_claims': rng.integers(1, 60, n_appln)}),
+        'tls209_appln_ipc': pd.DataFrame({
+            'appln_id': np.repeat(ids, n_ipc),
+            'ipc_class_symbol': rng.choice(['G06F  17/30', 'A61K  31/00', 'H01L  21/02', 'B60L  53/00'], n_ipc.sum()),
+        }),
+        'tls203_appln_abstr': pd.DataFrame({
+            'appln_id': ids,
+            'appln_abstract': pd.Series(rng.choice(words, (n_appln, 120)).tolist()).str.join(' '),
+        }),
+    }
+
+
+def run(n_appln=20_000):
+    local = LocalPatstatClient(make_tables(n_appln))
+    n_rows = len(local.sql_query(JOIN_QUERY.format(limit=10 ** 9)))
+
+    # 1. Single server-side JOIN (same LIMIT semantics as the old page: rows, not applications)
+    net = SimulatedNetwork(local)
+    dm = DataManager(use_cache=False)
+    dm.mode, dm.client = "🔴 Live Data Lake (Risky)", net
+    start = time.perf_counter()
+    joined = dm.get_data(JOIN_QUERY.format(limit=n_rows))
+    t_join, b_join = time.perf_counter() - start, net.bytes
+
+    # 2. Per-table concurrent fetch + local hash join
+    net = SimulatedNetwork(local)
+    dm.client = net
+    start = time.perf_counter()
+    per_table = dm.get_portfolio(n_appln, min_year=2018, batch_size=2_000)
+    t_table, b_table = time.perf_counter() - start, net.bytes
+
+    assert per_table['appln_id'].nunique() == joined['appln_id'].nunique()
+    print(f"Applications: {n_appln:,} | JOIN rows: {len(joined):,}")
+    print(f"{'mode':>12} | {'latency (s)':>11} | {'wire (MB)':>9} | {'queries':>7}")
+    print(f"{'JOIN':>12} | {t_join:>11.2f} | {b_join / 1e6:>9.1f} | {1:>7}")
+    print(f"{'per-table':>12} | {t_table:>11.2f} | {b_table / 1e6:>9.1f} | {net.queries:>7}")
+
+
+if __name__ == "__main__":
+    print("--- 3D-PVE: JOIN vs. Per-Table Fetch Benchmark ---")
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
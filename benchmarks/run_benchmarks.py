@@ -0,0 +1,181 @@
+import pandas as pd
+import numpy as np
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(root_dir)
+sys.path.append(current_dir)
+
+from bench_portfolio_manager import make_portfolio as make_engine_inputs
+from bench_sector_classifier import make_symbols
+from src.fanout import collapse_fanout
+from src.harmonizer import harmonize_portfolio
+from src.mock_data import generate_mock_portfolio
+from src.portfolio_manager import PortfolioManager
+from src.schema import PORTFOLIO_SCHEMA, SCORE_DTYPE
+from src.scoring_engine import ScoringEngine
+from src.sector_classifier import SectorClassifier
+
+DEFAULT_SIZES = [10 ** k for k in range(3, 8)]
+DEFAULT_BASELINE = os.path.join(current_dir, 'baseline.json')
+
+
+def make_raw_live(n_rows, seed=42):
+    """Raw frame shaped like the Live JOIN result (before harmonization)."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'appln_id': rng.integers(400_000_000, 600_000_000, n_rows),
+        'appln_filing_year': rng.integers(2000, 2025, n_rows),
+        'docdb_family_size': rng.integers(1, 40, n_rows),
+        'publn_claims': rng.integers(1, 60, n_rows),
+        'ipc_class_symbol': make_symbols(n_rows, seed),
+    })
+
+
+def make_fanout(n_rows, seed=42):
+    """Live-JOIN-shaped frame with IPC fan-out: about `n_rows` rows over n_rows / 4 applications."""
+    apps = make_raw_live(max(n_rows // 4, 1), seed).drop(columns='ipc_class_symbol')
+    fanned = apps.loc[apps.index.repeat(4)].reset_index(drop=True)
+    return fanned.assign(ipc_class_symbol=make_symbols(len(fanned), seed + 1)).sample(frac=1, random_state=seed)
+
+
+# --- STAGES: name -> (setup(n) -> input, run(input)) ---
+# Setup runs outside the measured region; run() is what gets timed.
+STAGES = {
+    'mock_data': (lambda n: n, lambda n: generate_mock_portfolio(n)),
+    'sector_mapping': (make_symbols, lambda symbols: SectorClassifier().classify(symbols)),
+    'collapse_fanout': (make_fanout, lambda df: collapse_fanout(df, reducers={'publn_claims': 'max'})),
+    'harmonization': (make_raw_live, lambda raw: harmonize_portfolio(raw)),
+    'bulk_score': (
+        lambda n: harmonize_portfolio(make_raw_live(n)),
+        lambda df: ScoringEngine().bulk_score(df.copy())
+    ),
+    'bulk_score_compact': (
+        lambda n: harmonize_portfolio(make_raw_live(n), schema=PORTFOLIO_SCHEMA),
+        lambda df: ScoringEngine(SCORE_DTYPE).bulk_score(df.copy())
+    ),
+    'portfolio_manager': (
+        make_engine_inputs,
+        lambda df: PortfolioManager(df).process_portfolio()
+    ),
+}
+
+
+def measure(stage, n_rows, repeat):
+    """Best-of-`repeat` wall time, plus peak traced allocation of one extra run."""
+    setup, run = STAGES[stage]
+    data = setup(n_rows)
+
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run(data)
+        timings.append(time.perf_counter() - start)
+
+    # Separate traced run: tracemalloc slows allocations down, so never time under it
+    gc.collect()
+    tracemalloc.start()
+    run(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    wall = min(timings)
+    return {
+        'stage': stage,
+        'rows': n_rows,
+        'wall_s': wall,
+        'rows_per_s': n_rows / wall if wall > 0 else float('inf'),
+        'peak_mb': peak / 1024 ** 2,
+    }
+
+
+def compare(results, baseline, time_threshold, memory_threshold, min_time=0.05):
+    """Returns the list of regressions versus the baseline (matching stage/rows only).
+
+    Runs shorter than `min_time` seconds are too noisy to gate on and only get a memory check.
+    """
+    reference = {(r['stage'], r['rows']): r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        ref = reference.get((r['stage'], r['rows']))
+        if ref is None:
+            continue
+        slowdown = ref['rows_per_s'] / r['rows_per_s'] - 1
+        growth = r['peak_mb'] / ref['peak_mb'] - 1 if ref['peak_mb'] > 0 else 0.0
+        r['slowdown_vs_baseline'] = slowdown
+        r['memory_growth_vs_baseline'] = growth
+        if max(ref['wall_s'], r['wall_s']) >= min_time and slowdown > time_threshold:
+            regressions.append(f"{r['stage']} @ {r['rows']:,}: throughput -{slowdown:.0%} (limit {time_threshold:.0%})")
+        if growth > memory_threshold:
+            regressions.append(f"{r['stage']} @ {r['rows']:,}: peak memory +{growth:.0%} (limit {memory_threshold:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="3D-PVE scaling benchmarks (JSON output, baseline regression gate).")
+    parser.add_argument('--stages', nargs='+', default=list(STAGES), choices=list(STAGES))
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--max-rows', type=float, default=None, help="Skip sizes above this (e.g. 1e6 on laptops)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None, help="Write results JSON here (default: stdout)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true', help="Store these results as the new baseline")
+    parser.add_argument('--time-threshold', type=float, default=0.25, help="Allowed throughput loss (fraction)")
+    parser.add_argument('--memory-threshold', type=float, default=0.25, help="Allowed peak-memory growth (fraction)")
+    parser.add_argument('--min-time', type=float, default=0.05, help="Ignore timing of runs shorter than this (s)")
+    args = parser.parse_args()
+
+    sizes = [n for n in args.sizes if args.max_rows is None or n <= args.max_rows]
+    results = []
+    for stage in args.stages:
+        for n_rows in sizes:
+            # stdout carries only the JSON report: anything a stage prints goes to stderr
+            with redirect_stdout(sys.stderr):
+                result = measure(stage, n_rows, args.repeat)
+            results.append(result)
+            print(f"{stage:>18} | {n_rows:>11,} rows | {result['wall_s']:>8.3f} s | "
+                  f"{result['rows_per_s']:>12,.0f} rows/s | {result['peak_mb']:>9.1f} MB", file=sys.stderr)
+
+    report = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+    exit_code = 0
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=1)
+        print(f"✅ Baseline written to {args.baseline}", file=sys.stderr)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.time_threshold,
+                                  args.memory_threshold, args.min_time)
+        report['regressions'] = regressions
+        for line in regressions:
+            print(f"❌ REGRESSION {line}", file=sys.stderr)
+        exit_code = 1 if regressions else 0
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    else:
+        print(json.dumps(report, indent=1))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
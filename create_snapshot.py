@@ -1,25 +1,92 @@
+import argparse
 import os
 import pandas as pd
-from epo.tipdata.patstat import PatstatClient
+from src.snapshot_exporter import PatstatExporter
+from src.snapshot_store import SNAPSHOT_SUFFIX, write_snapshot
 
-# Ensure the data folder exists
-output_folder = 'data'
-if not os.path.exists(output_folder):
-    os.makedirs(output_folder)
+# Portfolio view read by Static mode (same JOIN as the Valuation Engine)
+PORTFOLIO_QUERY = """
+SELECT
+    t1.appln_id, t1.appln_filing_year, t1.docdb_family_size, t1.docdb_family_id,
+    t2.publn_claims,
+    t3.ipc_class_symbol,
+    t4.appln_abstract
+FROM tls201_appln AS t1
+INNER JOIN tls211_pat_publn AS t2 ON t1.appln_id = t2.appln_id
+LEFT JOIN tls209_appln_ipc AS t3 ON t1.appln_id = t3.appln_id
+LEFT JOIN tls203_appln_abstr AS t4 ON t1.appln_id = t4.appln_id
+WHERE t1.appln_filing_year > 2018
+LIMIT {limit}
+"""
 
-print("📸 Connecting to EPO Data Lake for Snapshot...")
-client = PatstatClient()
 
-# 1. Download Real Patents (Tesla & Sample)
-print("   - Downloading tls201_appln...")
-query_appln = "SELECT * FROM tls201_appln WHERE appln_filing_year > 2020 LIMIT 50"
-df_appln = client.sql_query(query_appln, use_legacy_sql=False)
-pd.DataFrame(df_appln).to_csv(f'{output_folder}/tls201_static.csv', index=False)
+def write_synthetic(args):
+    """
+    Offline stand-in: synthetic tables in the export layout (generated by worker processes),
+    the citation index built from them, and a LocalPatstatClient over the most recent
+    chunk to serve the portfolio view.
+    """
+    from src.citation_index import DEFAULT_INDEX_DIR, CitationIndex
+    from src.local_patstat import LocalPatstatClient
+    from src.snapshot_exporter import read_exported_table
+    from src.synthetic_patstat import SyntheticPatstat
 
-# 2. Download Real Legal Events
-print("   - Downloading tls231_legal_event...")
-query_legal = "SELECT * FROM tls231_inpadoc_legal_event LIMIT 50"
-df_legal = client.sql_query(query_legal, use_legacy_sql=False)
-pd.DataFrame(df_legal).to_csv(f'{output_folder}/tls231_static.csv', index=False)
+    print(f"🧪 Generating {args.synthetic:,} synthetic applications (seed {args.seed})...")
+    generator = SyntheticPatstat(args.synthetic, seed=args.seed, chunk_size=args.range_size)
+    export_dir = os.path.join(args.out, 'export')
+    generator.write_export(export_dir, max_workers=args.workers)
 
-print(f"✅ Snapshot saved to {output_folder}/. You are ready for offline mode.")
\ No newline at end of file
+    print("   - Building citation index...")
+    index = CitationIndex.from_tls212(
+        read_exported_table(export_dir, 'tls212_citation', ['pat_publn_id', 'cited_appln_id']),
+        read_exported_table(export_dir, 'tls211_pat_publn', ['pat_publn_id', 'appln_id']),
+        read_exported_table(export_dir, 'tls201_appln', ['appln_id', 'appln_filing_year', 'docdb_family_id']),
+    )
+    index.save(os.path.join(args.out, os.path.basename(DEFAULT_INDEX_DIR)))
+
+    recent = generator.generate_chunk(generator.n_chunks - 1)
+    joined = ['tls201_appln', 'tls211_pat_publn', 'tls209_appln_ipc', 'tls203_appln_abstr']
+    return LocalPatstatClient({table: recent[table] for table in joined})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror PATSTAT tables for offline (Static) mode.")
+    parser.add_argument('--out', default='data', help="Output folder")
+    parser.add_argument('--where', default='appln_filing_year > 2020', help="Filter on tls201_appln ('' for all)")
+    parser.add_argument('--range-size', type=int, default=1_000_000, help="appln_id keys per partition")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent range fetches")
+    parser.add_argument('--portfolio-limit', type=int, default=500, help="Rows in static_portfolio")
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help="Generate this many synthetic applications offline instead of connecting to PATSTAT")
+    parser.add_argument('--seed', type=int, default=42, help="Seed of the synthetic data")
+    args = parser.parse_args()
+
+    # Ensure the data folder exists
+    os.makedirs(args.out, exist_ok=True)
+
+    if args.synthetic:
+        client = write_synthetic(args)
+    else:
+        print("📸 Connecting to EPO Data Lake for Snapshot...")
+        from epo.tipdata.patstat import PatstatClient
+        client = PatstatClient()
+
+        # 1. Partitioned, resumable mirror of tls201 / tls209 / tls211 / tls231
+        exporter = PatstatExporter(
+            client, os.path.join(args.out, 'export'),
+            range_size=args.range_size, max_workers=args.workers, where=args.where or None
+        )
+        summary = exporter.run()
+        if not summary['complete']:
+            print("⚠️ Some ranges failed. Re-run the same command to resume.")
+
+    # 2. Portfolio view for the Valuation Engine
+    print("   - Downloading static_portfolio...")
+    df_portfolio = client.sql_query(PORTFOLIO_QUERY.format(limit=args.portfolio_limit), use_legacy_sql=False)
+    write_snapshot(pd.DataFrame(df_portfolio), os.path.join(args.out, f'static_portfolio{SNAPSHOT_SUFFIX}'))
+
+    print(f"✅ Snapshot saved to {args.out}/. You are ready for offline mode.")
+
+
+if __name__ == "__main__":
+    main()
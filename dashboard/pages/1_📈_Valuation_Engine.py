@@ -11,9 +11,15 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 root_dir = os.path.abspath(os.path.join(current_dir, '..', '..'))
 sys.path.append(root_dir)
 
-from src.mock_data import generate_mock_portfolio
-from src.scoring_engine import ScoringEngine
-from src.sql_client import DataManager
+from src.sql_client import shared_query_cache
+from src.ml_optimizer import FEATURES, ModelRegistry
+from src.instrumentation import PipelineProfiler
+from src.valuation_pipeline import ValuationPipeline
+from src.scenario_engine import ScenarioEngine
+from src.portfolio_manager import PortfolioManager
+from src.dcf_engine import DCFEngine
+from src.harmonizer import CURRENT_YEAR
+from src.legal_events import LEGAL_RISK_DEDUCTION
 
 # --- PAGE CONFIG ---
 st.set_page_config(
@@ -41,145 +47,67 @@ with st.sidebar:
     
     st.subheader("⚙️ Parameters")
     portfolio_size = st.slider("Portfolio Size", 50, 500, 150)
-    market_volatility = st.selectbox("Market Condition", ["Stable", "Recession", "High Growth"])
-
-# --- DATA LOGIC ---
-import numpy as np
-from src.sql_client import DataManager
-from src.mock_data import generate_mock_portfolio
-from src.scoring_engine import ScoringEngine
-
-@st.cache_data
-def load_data(n, vol, mode):
-    dm = DataManager(mode)
-    
-    # --- 1. DATA ACQUISITION PHASE ---
-    if "Live" in mode:
-        query = f"""
-        SELECT 
-            t1.appln_id, t1.appln_filing_year, t1.docdb_family_size, 
-            t2.publn_claims,
-            t3.ipc_class_symbol,
-            t4.appln_abstract
-        FROM tls201_appln AS t1
-        INNER JOIN tls211_pat_publn AS t2 ON t1.appln_id = t2.appln_id
-        LEFT JOIN tls209_appln_ipc AS t3 ON t1.appln_id = t3.appln_id
-        LEFT JOIN tls203_appln_abstr AS t4 ON t1.appln_id = t4.appln_id
-        WHERE t1.appln_filing_year > 2018
-        LIMIT {n}
-        """
-        raw_df = dm.get_data(query)
-    else:
-        raw_df = dm.get_data()
-
-    # Fallback to Mock if fetch fails
-    if raw_df is None or raw_df.empty:
-        from src.mock_data import generate_mock_portfolio
-        raw_df = generate_mock_portfolio(n)
-
-    # --- 2. HARMONIZATION ---
-    df = raw_df.rename(columns={
-        'appln_id': 'Patent_ID',
-        'appln_filing_year': 'Year',
-        'publn_claims': 'Claims_Count',
-        'docdb_family_size': 'Family_Size'
-    })
-
-    # --- 3. SECTOR CLASSIFICATION (IPC MAPPING) ---
-    def map_ipc_to_sector(ipc):
-        if not ipc or pd.isna(ipc): return 'Industrial Mfg'
-        ipc = str(ipc).upper()
-        
-        # 1. AI & Digital (G06F, H04L, H04N, H04W, G06Q)
-        if ipc.startswith(('G06', 'G16', 'H04')): 
-            return 'AI & Software'
-        
-        # 2. Biotech & Life Sciences (A61K, A61P, A61B, C12N)
-        if ipc.startswith(('A61', 'C12')): 
-            return 'Biotech'
-        
-        # 3. Deep Tech / Semiconductors (H01L) - NEW!
-        if ipc.startswith('H01L'):
-            return 'Semiconductors'
-        
-        # 4. Green Energy & Climate Tech (H01M, Y02, F03D)
-        if ipc.startswith(('Y02', 'H01M', 'F03')): 
-            return 'Green Energy'
-        
-        # 5. Advanced Materials / Chem (C07, C08, B32) - NEW!
-        if ipc.startswith(('C07', 'C08', 'B32')):
-            return 'Advanced Materials'
-            
-        # 6. Mobility (B60, G05D)
-        if ipc.startswith(('B60', 'G05D')): 
-            return 'Automotive'
-            
-        return 'Industrial Mfg'
-
-    if 'ipc_class_symbol' in df.columns:
-        df['Sector'] = df['ipc_class_symbol'].apply(map_ipc_to_sector)
-    elif 'Sector' not in df.columns:
-        df['Sector'] = np.random.choice(['AI & Software', 'Biotech', 'Green Energy', 'Automotive'], len(df))
-
-    # --- 4. FEATURE ENGINEERING (The Fix for AttributeError) ---
-    # We ensure columns exist as Series before calling fillna
-    if 'Year' not in df.columns:
-        df['Year'] = 2022
-    
-    # Secure numeric conversion
-    df['Year'] = pd.to_numeric(df['Year'], errors='coerce').fillna(2022)
-    df['Remaining_Life'] = (20 - (2026 - df['Year'])).clip(lower=1, upper=20)
     
-    # Fill Citations and other scoring columns
-    if 'Citations' not in df.columns:
-        df['Citations'] = (df['Family_Size'].fillna(1) * 2).astype(int)
+    # Built-in + user-defined scenarios for this session (scenario x sector matrix)
+    if 'scenarios' not in st.session_state:
+        st.session_state.scenarios = ScenarioEngine()
+    scenarios = st.session_state.scenarios
+    market_volatility = st.selectbox("Market Condition", scenarios.names)
     
-    if 'Claims_Count' not in df.columns:
-        df['Claims_Count'] = 15
-    else:
-        df['Claims_Count'] = pd.to_numeric(df['Claims_Count'], errors='coerce').fillna(15)
+    with st.expander("🧪 Custom Scenario"):
+        custom_name = st.text_input("Scenario Name", "Custom")
+        custom_base = st.selectbox("Start From", scenarios.names)
+        base_multipliers = scenarios.multipliers(custom_base)
+        custom_multipliers = {
+            sector: st.slider(sector, 0.0, 2.0, float(base_multipliers[sector]), 0.05)
+            for sector in scenarios.sectors
+        }
+        if st.button("➕ Save Scenario") and custom_name.strip():
+            scenarios.add_scenario(custom_name.strip(), custom_multipliers)
+            st.rerun()
+    influence_weighting = st.toggle("🕸️ Influence-Weighted Citations", value=False,
+                                    help="Weigh each forward citation by the citing patent's PageRank influence")
+    deep_diagnostics = st.toggle("🩺 Deep Diagnostics", value=False,
+                                 help="Capture tracemalloc peaks and a cProfile report (slower)")
+
+# --- DATA LOGIC ---
+@st.cache_resource
+def get_valuation_pipeline(influence=False):
+    # Shared across sessions; each stage is memoized on its own inputs, so a
+    # "Market Condition" change only recomputes the final valuation split
+    return ValuationPipeline(influence=influence)
 
-    df['Backward_Citations'] = np.random.randint(2, 12, len(df))
+def load_data(n, vol, mode, scenarios, diagnostics=False, influence=False):
+    profiler = PipelineProfiler(trace_memory=diagnostics or None, profile=diagnostics or None)
+    return get_valuation_pipeline(influence).run(n, mode, vol, scenarios=scenarios, profiler=profiler)
 
-    # --- 5. SCORING ENGINE ---
-    from src.scoring_engine import ScoringEngine
-    scorer = ScoringEngine()
-    df = scorer.bulk_score(df) 
+@st.cache_data
+def simulate_projection(sector_values, scenario, n_paths):
+    # Seeded, so the fan only changes when the portfolio, scenario or path count does
+    return PortfolioManager(sector_values).simulate_value_paths(
+        scenario, n_paths, value_col='AI_Value', start_year=CURRENT_YEAR
+    )
 
-    # --- 6. DYNAMIC VALUATION SPLIT ---
-    df['Standard_Value'] = df['Estimated_Value']
-    
-    vol_map = {
-        "Recession": {
-            'AI & Software': 0.85, 'Biotech': 0.80, 'Green Energy': 0.70, 
-            'Automotive': 0.60, 'Industrial Mfg': 0.50
-        },
-        "High Growth": {
-            'AI & Software': 1.50, 'Biotech': 1.40, 'Green Energy': 1.30, 
-            'Automotive': 1.25, 'Industrial Mfg': 1.15
-        },
-        "Stable": {
-            'AI & Software': 1.10, 'Biotech': 1.05, 'Green Energy': 1.02, 
-            'Automotive': 1.00, 'Industrial Mfg': 0.95
-        }
-    }
-    
-    current_vol_map = vol_map.get(vol, vol_map["Stable"])
-    df['AI_Value'] = df['Standard_Value'] * df['Sector'].map(current_vol_map).fillna(1.0)
-            
-    return df
+@st.cache_resource
+def get_model_registry():
+    # One registry per worker: the artifact is read from disk on first use only
+    return ModelRegistry()
 
 # --- GET THE GLOBAL MODE FROM LANDING PAGE ---
 current_mode = st.session_state.get('data_mode', "🟢 Mock Data (Safe)")
 
 # Run the Engine with the new mode parameter
-df = load_data(portfolio_size, market_volatility, current_mode)
+df, pipeline_profile = load_data(portfolio_size, market_volatility, current_mode, scenarios, deep_diagnostics, influence_weighting)
 
 # Calculate Totals
 total_std = df['Standard_Value'].sum()
 total_ai = df['AI_Value'].sum()
 delta = total_ai - total_std
 
+# Every scenario side by side (memoized N x S matrix, no recomputation)
+scenario_values, scenario_names = get_valuation_pipeline(influence_weighting).scenario_matrix(portfolio_size, current_mode, scenarios)
+scenario_totals = pd.Series(scenario_values.sum(axis=0), index=scenario_names)
+
 # --- SIDEBAR LIVE FEEDBACK (Place after data is loaded) ---
 with st.sidebar:
     st.divider()
@@ -194,8 +122,30 @@ with st.sidebar:
     
     st.info(f"**Status:** System Ready\n\n**Mode:** {market_volatility}")
     
+    if "Live" in current_mode:
+        cache_stats = shared_query_cache().stats()
+        st.caption(f"🗄️ Query cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+    
+    with st.expander(f"⏱️ Pipeline Timing ({pipeline_profile['total_s']:.2f}s)"):
+        if pipeline_profile['stages']:
+            timing_df = pd.DataFrame(pipeline_profile['stages']).set_index('stage')
+            if not pipeline_profile['trace_memory']:
+                timing_df = timing_df.drop(columns='peak_mb')
+            st.dataframe(timing_df.style.format(precision=3, na_rep='-'), width='stretch')
+        else:
+            st.caption("All stages served from the pipeline memo.")
+        if pipeline_profile['profile']:
+            st.code(pipeline_profile['profile'], language=None)
+    
+    schema_report = get_valuation_pipeline(influence_weighting).memory_report(portfolio_size, current_mode)
+    if schema_report is not None:
+        total_row = schema_report.loc['TOTAL']
+        with st.expander(f"🧮 Memory ({total_row['bytes_after']/1024**2:.1f} MB, -{total_row['saving']*100:.0f}%)"):
+            st.dataframe(schema_report.style.format({'bytes_before': "{:,.0f}", 'bytes_after': "{:,.0f}",
+                                                     'saving': "{:.0%}"}, na_rep='-'), width='stretch')
+    
     if st.button("🔄 Re-Run Simulation", type="primary"):
-        st.cache_data.clear()
+        get_valuation_pipeline(influence_weighting).clear()
         st.rerun()
 
 # --- DASHBOARD HEADER ---
@@ -206,7 +156,7 @@ st.markdown("### Enterprise Patent Valuation Engine")
 if "Live" in current_mode:
     st.warning(f"📡 **LIVE MODE:** Connected to EPO Data Lake | Dataset: {portfolio_size} assets")
 elif "Static" in current_mode:
-    st.info(f"📂 **OFFLINE MODE:** Using Static Snapshot | Source: data/tls201_static.csv")
+    st.info(f"📂 **OFFLINE MODE:** Using Static Snapshot | Source: data/static_portfolio.pvec")
 else:
     st.success(f"🧪 **SIMULATION MODE:** Using Generative Mock Data")
 
@@ -221,6 +171,12 @@ with col3:
 with col4:
     st.metric("Active Scenario", market_volatility, delta_color="inverse" if market_volatility == "Recession" else "normal")
 
+# Scenario Strip: AI-adjusted value under every market condition
+for col, (name, total) in zip(st.columns(len(scenario_totals)), scenario_totals.items()):
+    with col:
+        st.metric(f"{'▶ ' if name == market_volatility else ''}{name}", f"€{total/1e6:.2f}M",
+                  delta=f"{(total / total_std - 1) * 100:+.1f}% vs. traditional")
+
 st.divider()
 
 
@@ -232,7 +188,8 @@ col_sel_1, col_sel_2 = st.columns(2)
 with col_sel_1:
     available_sectors = sorted(df['Sector'].unique())
     selected_sector = st.selectbox("1️⃣ Filter by Industry Sector", available_sectors)
-    sector_df = df[df['Sector'] == selected_sector].drop_duplicates(subset='Patent_ID')
+    # One row per application already (fan-out is collapsed in the pipeline)
+    sector_df = df[df['Sector'] == selected_sector]
 
 with col_sel_2:
     asset_options = sector_df.apply(lambda x: f"ID: {x['Patent_ID']} | {str(x.get('appln_abstract', ''))[:30]}...", axis=1).tolist()
@@ -351,15 +308,13 @@ elif selected_nav == "🌊 Valuation Bridge":
         base = asset['Standard_Value']
         
         # 2. Logic: Real Risk vs. Simulated Premium
-        # If in Live Mode, check for specific legal event codes
-        legal_risk_deduction = 0
-        if "Live" in current_mode:
-            # Example: Deduction if a 'LAPS' (Lapse) or 'WDRI' (Withdrawal) event exists
-            # In a full implementation, you'd join with tls231
-            legal_risk_deduction = -(base * 0.40) if asset.get('Event_Code') in ['LAPS', 'WDRI'] else 0
+        # A resolved tls231 legal state (lapse, withdrawal, revocation, pending opposition)
+        # deducts a fixed share; otherwise the Legal_Score drives the adjustment
+        legal_status = asset.get('Legal_Status')
+        if legal_status in LEGAL_RISK_DEDUCTION:
+            legal_risk_deduction = -(base * LEGAL_RISK_DEDUCTION[legal_status])
         else:
-            # Use your existing scoring logic for Mock/Static
-            legal_risk_deduction = (asset['Legal_Score'] - 50) * (base * 0.05) / 10 
+            legal_risk_deduction = (asset['Legal_Score'] - 50) * (base * 0.05) / 10
     
         tech_premium = (asset['Tech_Score'] - 50) * (base * 0.08) / 10
         market_fit = (asset['Market_Score'] - 50) * (base * 0.1) / 10
@@ -388,18 +343,51 @@ elif selected_nav == "📈 Financials":
     # --- TAB 4: Financial Projections ---
         st.subheader("10-Year NPV Projection")
         
-        years = list(range(2024, 2034))
-        # Growth rate depends on the volatility setting
-        rate = 1.08 if market_volatility == "High Growth" else (0.95 if market_volatility == "Recession" else 1.03)
+        # Correlated sector-level Monte Carlo paths, started from today's AI value per sector
+        n_paths = st.select_slider("Simulated Paths", [1_000, 10_000, 50_000, 100_000], value=10_000)
+        risk = simulate_projection(df[['Sector', 'AI_Value']], market_volatility, n_paths)
+        fan = risk.fan()
         
-        # Create projection data
-        proj_values = [total_ai * (rate ** i) for i in range(len(years))]
-        
-        fig_line = px.line(x=years, y=proj_values, markers=True, title=f"Portfolio Value Forecast ({market_volatility} Scenario)")
-        fig_line.update_traces(line_color='#00CC96', line_width=4)
-        fig_line.update_layout(yaxis_title="Portfolio Value (€)", xaxis_title="Year")
+        fig_line = go.Figure([
+            go.Scatter(x=fan.index, y=fan['P95'], line=dict(width=0), showlegend=False, hoverinfo='skip'),
+            go.Scatter(x=fan.index, y=fan['P5'], fill='tonexty', fillcolor='rgba(0, 204, 150, 0.15)',
+                       line=dict(width=0), name='P5-P95'),
+            go.Scatter(x=fan.index, y=fan['P75'], line=dict(width=0), showlegend=False, hoverinfo='skip'),
+            go.Scatter(x=fan.index, y=fan['P25'], fill='tonexty', fillcolor='rgba(0, 204, 150, 0.35)',
+                       line=dict(width=0), name='P25-P75'),
+            go.Scatter(x=fan.index, y=fan['P50'], mode='lines+markers', line=dict(color='#00CC96', width=4), name='Median'),
+        ])
+        fig_line.update_layout(title=f"Portfolio Value Forecast ({market_volatility} Scenario, {n_paths:,} paths)",
+                               yaxis_title="Portfolio Value (€)", xaxis_title="Year")
         
         st.plotly_chart(fig_line, width='stretch')
+        
+        risk_summary = risk.summary(alpha=0.95)
+        r1, r2, r3, r4 = st.columns(4)
+        r1.metric("Median 10Y Value", f"€{risk_summary['median_value']/1e6:.2f}M")
+        r2.metric("VaR (95%)", f"€{risk_summary['var']/1e6:.2f}M", help="10-year loss vs. today not exceeded in 95% of paths")
+        r3.metric("CVaR (95%)", f"€{risk_summary['cvar']/1e6:.2f}M", help="Average loss in the worst 5% of paths")
+        r4.metric("Probability of Loss", f"{risk_summary['prob_loss']*100:.1f}%")
+        
+        # Per-patent DCF: cash flows stop at each patent's Remaining_Life
+        st.divider()
+        st.subheader("Discounted Cash Flows over Remaining Legal Life")
+        discount_rate = st.slider("Discount Rate", 0.02, 0.20, 0.08, 0.01)
+        dcf = DCFEngine(discount_rate=discount_rate)
+        _, npv_by_sector = PortfolioManager(df).get_dcf_valuation(value_col='AI_Value', engine=dcf)
+        codes, sectors = pd.factorize(df['Sector'])
+        yearly_cf = dcf.yearly_cash_flows(df['AI_Value'], df['Remaining_Life'], codes, sectors, discounted=True)
+        yearly_cf.columns = yearly_cf.columns + CURRENT_YEAR
+        
+        col_dcf_1, col_dcf_2 = st.columns([2, 1])
+        with col_dcf_1:
+            fig_cf = px.bar(yearly_cf.T, title="Discounted Cash Flow by Sector",
+                            color_discrete_sequence=px.colors.qualitative.Bold)
+            fig_cf.update_layout(yaxis_title="Present Value (€)", xaxis_title="Year", legend_title="Sector")
+            st.plotly_chart(fig_cf, width='stretch')
+        with col_dcf_2:
+            st.metric("Portfolio NPV", f"€{npv_by_sector['NPV'].sum()/1e6:.2f}M")
+            st.dataframe(npv_by_sector.style.format({'NPV': "€{:,.0f}", 'Avg_Life': "{:.1f}"}), width='stretch')
 
 elif selected_nav == "🧠 AI Logic":
     # --- TAB 5: AI Explainability ---
@@ -417,6 +405,13 @@ elif selected_nav == "🧠 AI Logic":
         st.plotly_chart(fig_bar, width='stretch')
         
         st.info("The model places the highest weight on **Forward Citations**, indicating that technological impact is the primary driver of value in this sector.")
+        
+        # Served Ridge model: loaded from the registry, trained only if none is compatible
+        valuation_model = get_model_registry().get_or_train(df)
+        if valuation_model.is_trained:
+            coef_txt = ", ".join(f"{f}: {c:,.1f}" for f, c in zip(FEATURES, valuation_model.coef_))
+            st.caption(f"🧠 Served model v{valuation_model.version or 0:04d} | "
+                       f"R² {valuation_model.metrics.get('r2', 0):.3f} | {coef_txt}")
 
 elif selected_nav == "📋 Data":
     # --- TAB 6: Raw Data ---
@@ -433,9 +428,12 @@ elif selected_nav == "⚖️ Model Comparison":
             # Side-by-Side Bar Chart
             fig_comp = go.Figure(data=[
                 go.Bar(name='Traditional (Manual)', x=['Valuation Method'], y=[total_std], 
-                       marker_color='#EF553B', text=f"€{total_std/1e6:.1f}M", textposition='auto'),
-                go.Bar(name='AI-Powered (3D-PVE)', x=['Valuation Method'], y=[total_ai], 
-                       marker_color='#00CC96', text=f"€{total_ai/1e6:.1f}M", textposition='auto')
+                       marker_color='#EF553B', text=f"€{total_std/1e6:.1f}M", textposition='auto')
+            ] + [
+                go.Bar(name=f"AI-Powered ({name})", x=['Valuation Method'], y=[total],
+                       marker_color='#00CC96' if name == market_volatility else None,
+                       text=f"€{total/1e6:.1f}M", textposition='auto')
+                for name, total in scenario_totals.items()
             ])
             
             fig_comp.update_layout(
@@ -447,6 +445,10 @@ elif selected_nav == "⚖️ Model Comparison":
             )
             st.plotly_chart(fig_comp, width='stretch')
             
+            st.markdown("**Sector x Scenario Value (€)**")
+            sector_scenarios = pd.DataFrame(scenario_values, columns=scenario_names).groupby(df['Sector'].to_numpy()).sum()
+            st.dataframe(sector_scenarios.style.format("{:,.0f}"), width='stretch')
+            
         with col_comp_2:
             st.info("💡 **Why the difference?**")
             
@@ -0,0 +1,266 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import shutil
+
+# On-disk layout (one directory):
+#   manifest.json                          -> format, version, sizes
+#   ids.npy                                -> sorted application ids (node i <-> ids[i])
+#   fwd_indptr.npy / fwd_indices.npy       -> CSR: cited node -> citing nodes (forward citations)
+#   bwd_indptr.npy / bwd_indices.npy       -> CSR: citing node -> cited nodes (backward citations)
+#   years.npy                              -> filing year per node (-1 unknown)
+#   families.npy                           -> family code per node (unknown family = own code)
+INDEX_FORMAT = '3dpve-citations'
+INDEX_VERSION = 1
+_ARRAYS = ['ids', 'fwd_indptr', 'fwd_indices', 'bwd_indptr', 'bwd_indices', 'years', 'families']
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INDEX_DIR = os.path.abspath(os.path.join(current_dir, '..', 'data', 'citation_index'))
+
+
+def _sorted_unique(values):
+    """np.unique via sort + neighbour compare (much faster than the hash path for large int arrays)."""
+    values = np.sort(values)
+    if len(values) == 0:
+        return values
+    return values[np.r_[True, values[1:] != values[:-1]]]
+
+
+def _csr(keys, n_nodes):
+    """(indptr, indices) from sorted unique row * n_nodes + column keys."""
+    rows = keys // n_nodes
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_nodes), out=indptr[1:])
+    return indptr, (keys % n_nodes).astype(np.int32)
+
+
+def _family_codes(families, n_nodes):
+    """Dense family codes; nodes with an unknown family get a code of their own."""
+    if families is None:
+        return np.arange(n_nodes, dtype=np.int64)
+    codes, uniques = pd.factorize(pd.Series(families, copy=False))
+    codes = codes.astype(np.int64)
+    missing = codes < 0
+    codes[missing] = len(uniques) + np.arange(missing.sum())
+    return codes
+
+
+class CitationIndex:
+    """
+    Application-level citation graph in CSR form over interned application ids.
+
+    Both directions are stored (forward: who cites me, backward: whom do I cite),
+    so every count is a diff of indptr or a bincount over one edge array; windowed
+    and family-deduplicated variants add a mask / a sort-unique over the same arrays.
+    Saved indexes are memory-mapped on load, so opening a large graph is instant.
+    """
+    def __init__(self, ids, fwd_indptr, fwd_indices, bwd_indptr, bwd_indices, years, families):
+        self.ids = ids
+        self.fwd_indptr, self.fwd_indices = fwd_indptr, fwd_indices
+        self.bwd_indptr, self.bwd_indices = bwd_indptr, bwd_indices
+        self.years = years
+        self.families = families
+        self._lookup = None
+
+    # --- 1. CONSTRUCTION ---
+    @classmethod
+    def from_edges(cls, citing, cited, nodes=None):
+        """
+        Builds the index from citing -> cited application id pairs. `nodes` is an
+        optional frame indexed by application id with 'year' and/or 'family' columns;
+        its ids are included even if they have no citations. Duplicate edges count once.
+        """
+        citing, cited = np.asarray(citing), np.asarray(cited)
+        known = [citing, cited] if nodes is None else [citing, cited, nodes.index.to_numpy()]
+        ids = _sorted_unique(np.concatenate(known))
+        lookup = pd.Index(ids)
+        src = lookup.get_indexer(citing).astype(np.int64)
+        dst = lookup.get_indexer(cited).astype(np.int64)
+        n_nodes = len(ids)
+
+        # Self-citations and duplicates (same pair via several publications) are dropped;
+        # sorted (row, column) keys are the CSR layout of each direction
+        keep = src != dst
+        backward = _sorted_unique(src[keep] * n_nodes + dst[keep])
+        forward = np.sort(backward % n_nodes * n_nodes + backward // n_nodes)
+
+        years = np.full(n_nodes, -1, dtype=np.int16)
+        families = None
+        if nodes is not None:
+            aligned = nodes[~nodes.index.duplicated()].reindex(ids)
+            if 'year' in aligned.columns:
+                years = aligned['year'].fillna(-1).to_numpy(dtype=np.int16)
+            if 'family' in aligned.columns:
+                families = aligned['family'].to_numpy()
+
+        fwd_indptr, fwd_indices = _csr(forward, n_nodes)
+        bwd_indptr, bwd_indices = _csr(backward, n_nodes)
+        index = cls(ids, fwd_indptr, fwd_indices, bwd_indptr, bwd_indices, years,
+                    _family_codes(families, n_nodes))
+        index._lookup = lookup
+        return index
+
+    @classmethod
+    def from_tls212(cls, citations, publications, applications=None):
+        """
+        Builds the index from PATSTAT tables:
+        tls212_citation (pat_publn_id, cited_appln_id | cited_pat_publn_id),
+        tls211_pat_publn (pat_publn_id, appln_id) and, optionally,
+        tls201_appln (appln_id, appln_filing_year, docdb_family_id).
+        """
+        publn_to_appln = publications.drop_duplicates('pat_publn_id').set_index('pat_publn_id')['appln_id']
+        citing = citations['pat_publn_id'].map(publn_to_appln)
+        cited = citations['cited_appln_id'] if 'cited_appln_id' in citations.columns else None
+        if 'cited_pat_publn_id' in citations.columns:
+            # Patent-literature citations give a publication, not an application
+            via_publn = citations['cited_pat_publn_id'].map(publn_to_appln)
+            cited = via_publn if cited is None else cited.where(cited > 0, via_publn)
+        valid = citing.notna() & cited.notna() & (cited > 0)
+
+        nodes = None
+        if applications is not None:
+            names = {'appln_filing_year': 'year', 'docdb_family_id': 'family'}
+            present = [c for c in names if c in applications.columns]
+            nodes = applications.set_index('appln_id')[present].rename(columns=names)
+        return cls.from_edges(citing[valid].astype(np.int64), cited[valid].astype(np.int64), nodes)
+
+    @property
+    def n_nodes(self):
+        return len(self.ids)
+
+    @property
+    def n_edges(self):
+        return len(self.fwd_indices)
+
+    # --- 2. LOOKUPS ---
+    def positions(self, ids):
+        """Node index per application id (-1 if the id is not in the graph)."""
+        if self._lookup is None:
+            self._lookup = pd.Index(self.ids)
+        return self._lookup.get_indexer(np.asarray(ids))
+
+    def _gather(self, counts, ids):
+        if ids is None:
+            return counts
+        pos = self.positions(ids)
+        return np.where(pos >= 0, counts[pos], 0)
+
+    def citing(self, appln_id):
+        """Application ids citing `appln_id`."""
+        pos = self.positions([appln_id])[0]
+        if pos < 0:
+            return self.ids[:0]
+        return self.ids[self.fwd_indices[self.fwd_indptr[pos]:self.fwd_indptr[pos + 1]]]
+
+    def cited(self, appln_id):
+        """Application ids cited by `appln_id`."""
+        pos = self.positions([appln_id])[0]
+        if pos < 0:
+            return self.ids[:0]
+        return self.ids[self.bwd_indices[self.bwd_indptr[pos]:self.bwd_indptr[pos + 1]]]
+
+    # --- 3. COUNTS ---
+    def _edges(self, indptr, indices, forward, window):
+        """(row node, other node) per edge, optionally restricted to a filing-year window."""
+        rows = np.repeat(np.arange(self.n_nodes, dtype=np.int64), np.diff(indptr))
+        others = np.asarray(indices)
+        if window is None:
+            return rows, others
+        return self._within_window(rows, others, forward, window)
+
+    def _within_window(self, rows, others, forward, window):
+        # Years between the cited filing and the citing filing
+        lag = self.years[others].astype(np.int32) - self.years[rows]
+        if not forward:
+            lag = -lag
+        mask = (self.years[rows] >= 0) & (self.years[others] >= 0) & (lag >= 0) & (lag <= window)
+        return rows[mask], others[mask]
+
+    def iter_forward_edges(self, chunk_size=5_000_000, window=None):
+        """
+        Yields (cited node, citing node) edge arrays in chunks of about `chunk_size`
+        edges. Chunks end on node boundaries, so every cited node's citations arrive
+        together and per-node reductions can be finished chunk by chunk.
+        """
+        indptr = np.asarray(self.fwd_indptr)
+        bounds = np.searchsorted(indptr, np.arange(0, self.n_edges, chunk_size), side='right') - 1
+        bounds = np.unique(np.r_[bounds, self.n_nodes])
+        for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            rows = np.repeat(np.arange(lo, hi, dtype=np.int64), np.diff(indptr[lo:hi + 1]))
+            others = np.asarray(self.fwd_indices[indptr[lo]:indptr[hi]])
+            if window is not None:
+                rows, others = self._within_window(rows, others, True, window)
+            yield rows, others
+
+    @property
+    def _n_families(self):
+        return int(self.families.max()) + 1 if self.n_nodes else 1
+
+    def _count(self, indptr, indices, forward, window, dedup_families):
+        if window is None and not dedup_families:
+            return np.diff(indptr)
+        rows, others = self._edges(indptr, indices, forward, window)
+        if dedup_families:
+            # One count per distinct citing (or cited) family
+            pairs = _sorted_unique(rows * self._n_families + self.families[others])
+            rows = pairs // self._n_families
+        return np.bincount(rows, minlength=self.n_nodes)
+
+    def forward_counts(self, ids=None, window=None, dedup_families=False):
+        """
+        Forward citations per application (aligned with `ids`, or with self.ids if None).
+        window: only citations filed at most `window` years after the cited application.
+        dedup_families: count citing families instead of citing applications.
+        """
+        counts = self._count(self.fwd_indptr, self.fwd_indices, True, window, dedup_families)
+        return self._gather(counts, ids)
+
+    def backward_counts(self, ids=None, window=None, dedup_families=False):
+        """Backward citations (prior art) per application; same options as forward_counts."""
+        counts = self._count(self.bwd_indptr, self.bwd_indices, False, window, dedup_families)
+        return self._gather(counts, ids)
+
+    def family_forward_counts(self, ids=None, window=None):
+        """
+        Forward citations of the whole family, each citing family counted once and
+        citations from within the same family ignored; broadcast back to every member.
+        """
+        rows, others = self._edges(self.fwd_indptr, self.fwd_indices, True, window)
+        cited_fam, citing_fam = self.families[rows], self.families[others]
+        external = cited_fam != citing_fam
+        n_families = self._n_families
+        pairs = _sorted_unique(cited_fam[external] * n_families + citing_fam[external])
+        per_family = np.bincount(pairs // n_families, minlength=n_families)
+        return self._gather(per_family[self.families], ids)
+
+    # --- 4. PERSISTENCE ---
+    def save(self, path=DEFAULT_INDEX_DIR):
+        """Writes to a temporary directory and swaps it in, so readers never see a partial index."""
+        tmp_path = f"{path}.tmp"
+        if os.path.exists(tmp_path):
+            shutil.rmtree(tmp_path)
+        os.makedirs(tmp_path)
+        for name in _ARRAYS:
+            array = np.asarray(getattr(self, name))
+            if array.dtype == object:
+                array = array.astype(str)
+            np.save(os.path.join(tmp_path, f"{name}.npy"), array, allow_pickle=False)
+        manifest = {'format': INDEX_FORMAT, 'version': INDEX_VERSION,
+                    'n_nodes': int(self.n_nodes), 'n_edges': int(self.n_edges)}
+        with open(os.path.join(tmp_path, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_DIR, mmap=True):
+        with open(os.path.join(path, 'manifest.json')) as f:
+            manifest = json.load(f)
+        if manifest.get('format') != INDEX_FORMAT or manifest.get('version') != INDEX_VERSION:
+            raise ValueError(f"{path} is not a {INDEX_FORMAT} v{INDEX_VERSION} index.")
+        mmap_mode = 'r' if mmap else None
+        arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode) for name in _ARRAYS]
+        return cls(*arrays)
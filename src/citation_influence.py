@@ -0,0 +1,222 @@
+import pandas as pd
+import numpy as np
+import os
+
+DEFAULT_DAMPING = 0.85
+DEFAULT_TOL = 1e-9
+DEFAULT_MAX_ITER = 200
+
+
+def _segment_sums(values, indptr, nonempty):
+    """Sum of values[indptr[i]:indptr[i + 1]] per row (0 for empty rows)."""
+    # A trailing 0 keeps every offset valid for reduceat (rows at the end may be empty)
+    sums = np.add.reduceat(np.r_[values, 0.0], indptr[:-1])
+    sums[~nonempty] = 0.0
+    return sums
+
+
+class CitationInfluence:
+    """
+    PageRank-style citation influence over a CitationIndex.
+
+    Influence flows from citing to cited applications: every application passes
+    `damping` of its score to the applications it cites (split evenly), the rest
+    (and the score of applications citing nothing) is spread over all nodes:
+
+        r' = (1 - d) / N + d * (A r_out + dangling / N),   r_out = r / out_degree
+
+    Each iteration is one gather over the forward CSR plus a segment sum
+    (np.add.reduceat), iterated until the L1 change drops below `tol`.
+
+    Scores are reported relative to the average node (1.0 = average), so they do not
+    shrink as the graph grows. fit() can warm-start from an earlier vector; update()
+    moves a fitted vector to a new snapshot by pushing only the residual around the
+    changed edges (see update()), instead of iterating over the whole graph again.
+    """
+    def __init__(self, damping=DEFAULT_DAMPING, tol=DEFAULT_TOL, max_iter=DEFAULT_MAX_ITER):
+        self.damping = damping
+        self.tol = tol
+        self.max_iter = max_iter
+        self.index = None
+        self.rank = None
+        self.iterations = 0
+        self.residuals = []
+
+    @property
+    def is_fitted(self):
+        return self.rank is not None
+
+    @property
+    def converged(self):
+        return bool(self.residuals) and self.residuals[-1] < self.tol
+
+    # --- 1. POWER ITERATION ---
+    def _initial_vector(self, index, warm_start):
+        """Uniform start, or a previous result (CitationInfluence or Series by id) mapped onto `index`."""
+        n_nodes = index.n_nodes
+        if warm_start is None:
+            return np.full(n_nodes, 1.0 / n_nodes)
+        if isinstance(warm_start, CitationInfluence):
+            warm_start = pd.Series(np.asarray(warm_start.rank), index=warm_start.index.ids)
+        # New applications start as uncited ones (teleport share only)
+        start = warm_start.reindex(index.ids).to_numpy(dtype=np.float64, na_value=(1 - self.damping) / n_nodes)
+        return start / start.sum()
+
+    def _operator(self, index):
+        """r -> r' (one PageRank step on `index`), plus the out-degree terms update() needs."""
+        n_nodes = index.n_nodes
+        fwd_indptr = np.asarray(index.fwd_indptr)
+        fwd_indices = np.asarray(index.fwd_indices)
+        out_degree = np.diff(np.asarray(index.bwd_indptr)).astype(np.float64)
+        dangling = out_degree == 0
+        inv_out = np.divide(1.0, out_degree, out=np.zeros(n_nodes), where=~dangling)
+        cited = np.diff(fwd_indptr) > 0
+        teleport = (1 - self.damping) / n_nodes
+
+        def step(rank):
+            incoming = _segment_sums((rank * inv_out)[fwd_indices], fwd_indptr, cited)
+            return teleport + self.damping * (incoming + rank[dangling].sum() / n_nodes)
+        return step, inv_out, dangling
+
+    def fit(self, index, warm_start=None):
+        """Runs power iteration on `index` (optionally from `warm_start`). Returns self."""
+        n_nodes = index.n_nodes
+        # Mapped before self.index is replaced (warm_start may be self)
+        rank = self._initial_vector(index, warm_start) if n_nodes else np.zeros(0)
+        self.index = index
+        self.residuals = []
+        self.iterations = 0
+        if n_nodes == 0:
+            self.rank = rank
+            return self
+
+        step = self._operator(index)[0]
+        for _ in range(self.max_iter):
+            new_rank = step(rank)
+            residual = float(np.abs(new_rank - rank).sum())
+            rank = new_rank
+            self.iterations += 1
+            self.residuals.append(residual)
+            if residual < self.tol:
+                break
+
+        self.rank = rank
+        return self
+
+    def update(self, index):
+        """
+        Returns a new scorer fitted on a newer snapshot of the graph, without starting over
+        (this one keeps its vector).
+
+        The current vector (matched by application id) already solves the old graph, so
+        its one-step residual is concentrated around the new edges and applications.
+        Nodes whose residual exceeds tol / N push it on to the applications they cite
+        (via the backward CSR). Only nodes reached by the previous sweep can exceed the
+        threshold, so each sweep touches just that frontier and its edges.
+
+        Mass pushed from applications that cite nothing would reach every node evenly.
+        The response to an even injection c is c / teleport times the PageRank vector
+        itself (both solve x = const + d M x). So the pushed vector is the solution scaled
+        by (1 - injected / teleport), and normalizing it adds that mass back exactly; the
+        injection is never spread over the N nodes.
+
+        Cost: one full step for the initial residual (O(N + E)), then per sweep the edges
+        of the frontier: sorted sparsely while they are few (O(m log m) for m edges), one
+        dense O(N) pass once they exceed N / 8. The frontier is whatever the change
+        reaches above tol / N; changes feeding heavily cited, old applications can reach a
+        large part of the graph, so the update is cheapest for changes at the periphery.
+        """
+        updated = CitationInfluence(self.damping, self.tol, self.max_iter)
+        if not self.is_fitted or index.n_nodes == 0:
+            return updated.fit(index)
+        n_nodes = index.n_nodes
+        rank = self._initial_vector(index, self)
+        step, inv_out, _ = self._operator(index)
+        residual = step(rank) - rank
+        # A changed N shifts teleport and dangling shares: every untouched application gets
+        # the same residual. An even residual only rescales the solution (see above), so
+        # it is dropped here and restored by the final normalization
+        residual -= np.median(residual)
+        bwd_indptr = np.asarray(index.bwd_indptr)
+        bwd_indices = np.asarray(index.bwd_indices)
+        threshold = self.tol / n_nodes
+
+        updated.index = index
+        # L1 of the residual pushed in each sweep (0.0 once no node exceeds tol / N)
+        updated.residuals = []
+        updated.iterations = 0
+        active = np.flatnonzero(np.abs(residual) > threshold)
+        for _ in range(self.max_iter):
+            if len(active) == 0:
+                break
+            updated.iterations += 1
+            pushed = residual[active]
+            updated.residuals.append(float(np.abs(pushed).sum()))
+            rank[active] += pushed
+            residual[active] = 0.0
+
+            # Spread d * pushed / out_degree over each active node's cited applications
+            degree = bwd_indptr[active + 1] - bwd_indptr[active]
+            first = np.repeat(bwd_indptr[active], degree)
+            offsets = np.arange(len(first)) - np.repeat(np.cumsum(degree) - degree, degree)
+            weights = np.repeat(self.damping * pushed * inv_out[active], degree)
+            targets = bwd_indices[first + offsets]
+            if len(targets) * 8 < n_nodes:
+                # Small frontier: accumulate over the touched nodes only
+                touched, slot = np.unique(targets, return_inverse=True)
+                residual[touched] += np.bincount(slot, weights=weights, minlength=len(touched))
+                active = touched[np.abs(residual[touched]) > threshold]
+            else:
+                # Large frontier: one dense pass is cheaper than sorting the targets
+                residual += np.bincount(targets, weights=weights, minlength=n_nodes)
+                active = np.flatnonzero(np.abs(residual) > threshold)
+        updated.residuals.append(0.0 if len(active) == 0 else float(np.abs(residual[active]).sum()))
+
+        # Dangling pushes only rescaled the solution (see above): normalizing restores it
+        updated.rank = rank / rank.sum()
+        return updated
+
+    # --- 2. SCORES ---
+    def influence(self, ids=None):
+        """Influence per application relative to the average node (0 for unknown ids)."""
+        relative = np.asarray(self.rank) * len(self.rank)
+        if ids is None:
+            return relative
+        pos = self.index.positions(ids)
+        return np.where(pos >= 0, relative[pos], 0.0)
+
+    def weighted_citations(self, ids=None):
+        """
+        Forward citations weighted by the influence of each citing application: on the
+        scale of a citation count, but a citation from a heavily cited patent counts more.
+        """
+        relative = self.influence()
+        fwd_indptr = np.asarray(self.index.fwd_indptr)
+        fwd_indices = np.asarray(self.index.fwd_indices)
+        totals = _segment_sums(relative[fwd_indices], fwd_indptr, np.diff(fwd_indptr) > 0)
+        if ids is None:
+            return totals
+        pos = self.index.positions(ids)
+        return np.where(pos >= 0, totals[pos], 0.0)
+
+    # --- 3. PERSISTENCE ---
+    def save(self, path):
+        """Writes the vector and its application ids, to warm-start the next snapshot's fit."""
+        for name, array in (('influence', self.rank), ('influence_ids', self.index.ids)):
+            array = np.asarray(array)
+            if array.dtype == object:
+                array = array.astype(str)
+            target = os.path.join(path, f"{name}.npy")
+            np.save(f"{target}.tmp.npy", array, allow_pickle=False)
+            os.replace(f"{target}.tmp.npy", target)
+        return path
+
+    @staticmethod
+    def load_warm_start(path):
+        """Saved vector as a Series by application id (fit(warm_start=...) input), or None."""
+        try:
+            rank = np.load(os.path.join(path, 'influence.npy'))
+            ids = np.load(os.path.join(path, 'influence_ids.npy'))
+        except OSError:
+            return None
+        return pd.Series(rank, index=ids) if len(rank) == len(ids) else None
@@ -0,0 +1,139 @@
+import pandas as pd
+import numpy as np
+
+from src.harmonizer import CURRENT_YEAR
+from src.legal_events import _EPOCH, _NO_DATE, _to_days
+
+# tls201_appln columns read by the rollup
+FAMILY_COLUMNS = ['docdb_family_id', 'appln_id', 'appln_auth', 'earliest_filing_date']
+# Authority codes are two letters; packed as 16 bits next to the family id
+_AUTH_BITS = 16
+# Days since 1900 (up to _NO_DATE) packed next to the family id
+_DAY_BITS = 17
+
+
+def _authority_codes(authorities):
+    """Two-letter authority codes -> 16-bit ints (first two bytes), once per distinct code; missing -> -1."""
+    codes, uniques = pd.factorize(pd.Series(authorities, copy=False))
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip().str.upper().str[:2].str.ljust(2)
+    packed = np.array([ord(t[0]) << 8 | ord(t[1]) for t in text], dtype=np.int64) & ((1 << _AUTH_BITS) - 1)
+    return np.r_[packed, -1][codes]
+
+
+def _family_reduce(families, first_days, members=None):
+    """Per family: min first day, summed member counts (one per row if None). Inputs need not be sorted."""
+    # One plain sort of packed (family, day) keys: the first key of a family holds its min day
+    keys = np.sort((families << _DAY_BITS) | first_days)
+    if len(keys) == 0:
+        return families, first_days, np.zeros(0, dtype=np.int64)
+    owners = keys >> _DAY_BITS
+    starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+    unique_families = owners[starts]
+    if members is None:
+        counts = np.diff(np.r_[starts, len(keys)])
+    else:
+        # Partials are sorted by family, so these lookups stay cache friendly
+        counts = np.bincount(np.searchsorted(unique_families, families), weights=members, minlength=len(starts))
+    return unique_families, keys[starts] & ((1 << _DAY_BITS) - 1), counts.astype(np.int64)
+
+
+def _sorted_unique(keys):
+    keys = np.sort(keys)
+    return keys[np.r_[True, keys[1:] != keys[:-1]]] if len(keys) else keys
+
+
+class FamilyRollupEngine:
+    """
+    DOCDB family aggregates from tls201_appln: member count, distinct filing
+    authorities (jurisdiction breadth) and earliest priority date per docdb_family_id.
+
+    A chunk of applications is reduced by sorting family ids once (min date and member
+    count via reduceat) plus a sort-unique over packed (family, authority) keys. Both
+    partials merge with the same reductions, so the full family table can be streamed
+    in any order (tls201 holds every application once, so member counts simply add up).
+
+    broadcast() hands the family figures back to the portfolio's applications, with
+    Family_Value_Share = 1 / (portfolio members of the family): summing a family-level
+    value times its share counts each family once, however many members are held.
+    """
+    def __init__(self, family_column='docdb_family_id', authority_column='appln_auth',
+                 date_column='earliest_filing_date', compact_rows=20_000_000):
+        self.family_column = family_column
+        self.authority_column = authority_column
+        self.date_column = date_column
+        self.compact_rows = compact_rows
+
+    # --- 1. CHUNK REDUCTION ---
+    def partial(self, applications):
+        """Partial aggregate (families, first_days, members, family_authority_keys) of one chunk."""
+        families = pd.to_numeric(applications[self.family_column], errors='coerce').to_numpy(dtype=np.float64)
+        known = ~np.isnan(families) & (families > 0)
+        families = families[known].astype(np.int64)
+        # Kept as Series: factorizing pandas string columns is about twice as fast as object arrays
+        days = _to_days(applications[self.date_column][known])
+        authorities = _authority_codes(applications[self.authority_column][known])
+        has_authority = authorities >= 0
+        pairs = _sorted_unique((families[has_authority] << _AUTH_BITS) | authorities[has_authority])
+        return (*_family_reduce(families, days), pairs)
+
+    @staticmethod
+    def merge(partials):
+        """Combines partial aggregates (from any chunking) into one."""
+        partials = list(partials)
+        if not partials:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, empty, empty
+        families, first_days, members, pairs = (np.concatenate(parts) for parts in zip(*partials))
+        return (*_family_reduce(families, first_days, members), _sorted_unique(pairs))
+
+    def fit_chunks(self, chunks):
+        """Reduces an iterable of tls201 frames (e.g. DataManager batches or exported parts)."""
+        pending, pending_rows = [], 0
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            part = self.partial(chunk)
+            pending.append(part)
+            pending_rows += len(part[0]) + len(part[3])
+            # Keep memory bounded by the number of distinct families / (family, authority) pairs
+            if pending_rows > self.compact_rows and len(pending) > 1:
+                pending = [self.merge(pending)]
+                pending_rows = len(pending[0][0]) + len(pending[0][3])
+        return self.resolve(self.merge(pending))
+
+    def fit(self, applications):
+        return self.fit_chunks([applications])
+
+    # --- 2. FAMILY TABLE ---
+    def resolve(self, aggregate):
+        """Per family (index docdb_family_id): Family_Members, Family_Authorities, Earliest_Priority, Family_Years_Active."""
+        families, first_days, members, pairs = aggregate
+        owners = np.searchsorted(families, pairs >> _AUTH_BITS)
+        dated = first_days < _NO_DATE
+        priority = np.where(dated, _EPOCH + np.where(dated, first_days, 0).astype('timedelta64[D]'),
+                            np.datetime64('NaT', 'D'))
+        years = priority.astype('datetime64[Y]').astype(np.int64) + 1970
+        return pd.DataFrame({
+            'Family_Members': members,
+            'Family_Authorities': np.bincount(owners, minlength=len(families)).astype(np.int64),
+            'Earliest_Priority': priority,
+            'Family_Years_Active': np.where(dated, np.clip(CURRENT_YEAR - years, 0, None), np.nan),
+        }, index=pd.Index(families, name=self.family_column))
+
+    @staticmethod
+    def broadcast(families, family_ids):
+        """
+        Family figures aligned with the portfolio's `family_ids`, plus Family_Value_Share.
+        Applications without a known family count as a one-member, one-authority family.
+        """
+        family_ids = pd.Series(np.asarray(family_ids), copy=False)
+        aligned = families.reindex(family_ids.to_numpy()).reset_index(drop=True)
+        aligned['Family_Members'] = aligned['Family_Members'].fillna(1).astype(np.int64)
+        aligned['Family_Authorities'] = aligned['Family_Authorities'].fillna(1).astype(np.int64)
+        codes = pd.factorize(family_ids)[0]
+        known = codes >= 0
+        held = np.bincount(codes[known])
+        share = np.ones(len(codes))
+        share[known] = 1.0 / held[codes[known]]
+        aligned['Family_Value_Share'] = share
+        return aligned
@@ -0,0 +1,107 @@
+import pandas as pd
+import numpy as np
+
+try:
+    from src.sector_classifier import default_classifier
+except ImportError:
+    # Fallback when 'src' itself is the working directory
+    from sector_classifier import default_classifier
+
+# Numeric reducers applied per group with ufunc.reduceat over the sorted column (max/min skip NaN)
+REDUCERS = {
+    'max': np.fmax,
+    'min': np.fmin,
+    'sum': np.add,
+}
+
+# Per-application reduction of columns that differ between JOIN fan-out rows
+FANOUT_REDUCERS = {'publn_claims': 'max'}
+
+
+def group_bounds(keys):
+    """Start offset of every run of equal values in an already sorted key array."""
+    if len(keys) == 0:
+        return np.array([], dtype=np.int64)
+    return np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+
+def collapse_fanout(df, key='appln_id', list_column='ipc_class_symbol', list_name='ipc_codes',
+                    count_name='IPC_Count', reducers=None, classifier=None):
+    """
+    Collapses JOIN fan-out (several rows per `key`, e.g. one per tls209 IPC code)
+    into one row per key. Sort-based: one stable sort, group starts from a single
+    comparison, then every column is reduced with array operations.
+
+    - `list_column` (if present): first non-null value, plus `list_name` (array of
+      all non-null values) and `count_name` (how many there are). If the frame has
+      no Sector yet, the dominant sector over all codes is added as well.
+    - columns named in `reducers` ({column: 'max' | 'min' | 'sum'}): reduced per group.
+    - any other column: first value of the group (JOIN fan-out repeats it anyway).
+
+    Returns a frame ordered by `key`, with `key` as a regular column.
+    """
+    reducers = reducers or {}
+    classifier = classifier or default_classifier
+    df = df.sort_values(key, kind='stable')
+    keys = df[key].to_numpy()
+    starts = group_bounds(keys)
+    out = {}
+
+    for column in df.columns:
+        if column == list_column:
+            continue
+        values = df[column]
+        if column in reducers:
+            out[column] = REDUCERS[reducers[column]].reduceat(values.to_numpy(), starts) if len(starts) else values.iloc[:0]
+        else:
+            out[column] = values.iloc[starts].to_numpy()
+
+    if list_column in df.columns:
+        symbols = df[list_column].to_numpy(dtype=object)
+        present = pd.notna(symbols)
+        group_ids = np.cumsum(np.r_[False, keys[1:] != keys[:-1]]) if len(keys) else np.array([], dtype=np.int64)
+        counts = np.bincount(group_ids[present], minlength=len(starts))
+        kept = symbols[present]
+        offsets = np.cumsum(counts) - counts
+
+        first = np.full(len(starts), None, dtype=object)
+        first[counts > 0] = kept[offsets[counts > 0]]
+        out[list_column] = first
+        out[count_name] = counts
+        # Plain slicing is several times faster than np.split (no per-piece swapaxes)
+        out[list_name] = [kept[lo:hi] for lo, hi in zip(offsets.tolist(), (offsets + counts).tolist())]
+
+        if 'Sector' not in df.columns:
+            # Applications without any IPC code get the classifier's default sector
+            dominant = classifier.classify_grouped(group_ids[present], kept, weights=False)['Sector']
+            default = classifier.sectors[classifier.default_code]
+            out['Sector'] = dominant.reindex(np.arange(len(starts))).fillna(default).array
+
+    return pd.DataFrame(out, index=pd.RangeIndex(len(starts)))
+
+
+def align_on_key(chunks, key):
+    """
+    Re-cuts a stream of frames so the rows of one key never straddle two chunks:
+    each chunk's trailing run of its last key is carried into the next one. Assumes the
+    rows of a key are contiguous, as in keyset pages and JOIN output ordered by the key.
+    `key` is a column name or a list of candidates (the first one present is used).
+    """
+    candidates = [key] if isinstance(key, str) else list(key)
+    carry = None
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+            carry = None
+        column = next((c for c in candidates if c in chunk.columns), None)
+        if column is None or chunk.empty:
+            yield chunk
+            continue
+        keys = chunk[column].to_numpy()
+        others = np.flatnonzero(keys != keys[-1])
+        cut = others[-1] + 1 if len(others) else 0
+        carry = chunk.iloc[cut:]
+        if cut:
+            yield chunk.iloc[:cut]
+    if carry is not None and len(carry):
+        yield carry
@@ -0,0 +1,70 @@
+import pandas as pd
+import numpy as np
+from src.schema import apply_schema
+from src.sector_classifier import default_classifier
+
+# PATSTAT column names -> engine feature names
+COLUMN_MAP = {
+    'appln_id': 'Patent_ID',
+    'appln_filing_year': 'Year',
+    'publn_claims': 'Claims_Count',
+    'docdb_family_size': 'Family_Size'
+}
+FALLBACK_SECTORS = ['AI & Software', 'Biotech', 'Green Energy', 'Automotive']
+CURRENT_YEAR = 2026
+
+
+def _placeholder_draw(df, n_choices, hash_key):
+    """
+    Deterministic stand-in for np.random: derived from a hash of Patent_ID,
+    so the same patent always gets the same value, whatever chunk it lands in.
+    """
+    key = df['Patent_ID'] if 'Patent_ID' in df.columns else pd.Series(df.index)
+    hashed = pd.util.hash_pandas_object(key, index=False, hash_key=hash_key).to_numpy()
+    return (hashed % np.uint64(n_choices)).astype(np.int64)
+
+
+def harmonize_portfolio(raw_df, classifier=None, schema=None):
+    """
+    Turns a raw Live / Static / Mock frame into the feature set expected by ScoringEngine.
+    Row-wise only: harmonizing a frame in chunks gives the same rows as harmonizing it whole.
+    Pass a `schema` (e.g. schema.PORTFOLIO_SCHEMA) to enforce compact dtypes on the result.
+    """
+    classifier = classifier or default_classifier
+
+    # --- 1. HARMONIZATION ---
+    df = raw_df.rename(columns=COLUMN_MAP)
+
+    # --- 2. SECTOR CLASSIFICATION (IPC MAPPING) ---
+    # Precompiled prefix table, one vectorized pass over the whole column.
+    # A Sector computed upstream from all IPC codes of an application takes precedence.
+    if 'Sector' not in df.columns:
+        if 'ipc_class_symbol' in df.columns:
+            df['Sector'] = classifier.classify(df['ipc_class_symbol'])
+        else:
+            picks = _placeholder_draw(df, len(FALLBACK_SECTORS), hash_key='3dpve-sector0000')
+            df['Sector'] = np.array(FALLBACK_SECTORS)[picks]
+
+    # --- 3. FEATURE ENGINEERING ---
+    # We ensure columns exist as Series before calling fillna
+    if 'Year' not in df.columns:
+        df['Year'] = 2022
+
+    # Secure numeric conversion
+    df['Year'] = pd.to_numeric(df['Year'], errors='coerce').fillna(2022)
+    df['Remaining_Life'] = (20 - (CURRENT_YEAR - df['Year'])).clip(lower=1, upper=20)
+
+    # Fill Citations and other scoring columns (real counts come from the citation index)
+    if 'Citations' not in df.columns:
+        df['Citations'] = (df['Family_Size'].fillna(1) * 2).astype(int)
+
+    if 'Claims_Count' not in df.columns:
+        df['Claims_Count'] = 15
+    else:
+        df['Claims_Count'] = pd.to_numeric(df['Claims_Count'], errors='coerce').fillna(15)
+
+    # Prior-art placeholder in [2, 12) when no citation index supplied real counts
+    if 'Backward_Citations' not in df.columns:
+        df['Backward_Citations'] = 2 + _placeholder_draw(df, 10, hash_key='3dpve-backcite00')
+
+    return df if schema is None else apply_schema(df, schema)
@@ -0,0 +1,121 @@
+import pandas as pd
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger('3dpve.pipeline')
+
+# Deep capture can be switched on without touching code (e.g. PVE_TRACE_MEMORY=1 streamlit run ...)
+TRACE_MEMORY_ENV = 'PVE_TRACE_MEMORY'
+PROFILE_ENV = 'PVE_CPROFILE'
+
+
+def _env_flag(name):
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _frame_mb(obj):
+    """Shallow in-memory size of a DataFrame/Series/ndarray result (cheap, no tracing needed)."""
+    if isinstance(obj, pd.DataFrame):
+        return obj.memory_usage(deep=False).sum() / 1024 ** 2
+    if isinstance(obj, pd.Series):
+        return obj.memory_usage(deep=False) / 1024 ** 2
+    if hasattr(obj, 'nbytes'):
+        return obj.nbytes / 1024 ** 2
+    return None
+
+
+class StageRecord:
+    """Measurements for one pipeline stage; call output(result) inside the block to record rows out."""
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.out_mb = None
+        self.wall_s = None
+        self.peak_mb = None
+
+    def output(self, result):
+        self.rows_out = len(result)
+        self.out_mb = _frame_mb(result)
+        return result
+
+    def to_dict(self):
+        return {
+            'stage': self.name,
+            'wall_s': self.wall_s,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'out_mb': self.out_mb,
+            'peak_mb': self.peak_mb,
+        }
+
+
+class PipelineProfiler:
+    """
+    Lightweight per-stage instrumentation for the valuation pipeline.
+
+    Always records wall time, rows in/out and the size of each stage's output.
+    tracemalloc (per-stage peak allocation) and cProfile (hot functions) are
+    opt-in because both slow the pipeline down noticeably.
+    """
+    def __init__(self, name='valuation', trace_memory=None, profile=None):
+        self.name = name
+        self.trace_memory = _env_flag(TRACE_MEMORY_ENV) if trace_memory is None else trace_memory
+        self.profile = _env_flag(PROFILE_ENV) if profile is None else profile
+        self.stages = []
+        self._profiler = cProfile.Profile() if self.profile else None
+        self._profile_text = None
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        record = StageRecord(name, rows_in)
+        owns_trace = self.trace_memory and not tracemalloc.is_tracing()
+        if owns_trace:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        if self._profiler is not None:
+            self._profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall_s = time.perf_counter() - start
+            if self._profiler is not None:
+                self._profiler.disable()
+            if self.trace_memory:
+                record.peak_mb = (tracemalloc.get_traced_memory()[1] - base) / 1024 ** 2
+                if owns_trace:
+                    tracemalloc.stop()
+            self.stages.append(record)
+            logger.info(json.dumps({'pipeline': self.name, **record.to_dict()}))
+
+    @property
+    def total_s(self):
+        return sum(s.wall_s for s in self.stages)
+
+    def profile_text(self, limit=25):
+        """Top `limit` functions by cumulative time (empty unless profiling was enabled)."""
+        if self._profiler is None:
+            return ''
+        buffer = io.StringIO()
+        pstats.Stats(self._profiler, stream=buffer).sort_stats('cumulative').print_stats(limit)
+        return buffer.getvalue()
+
+    def report(self):
+        """Plain (picklable) summary, safe to return from st.cache_data functions."""
+        return {
+            'pipeline': self.name,
+            'total_s': self.total_s,
+            'stages': [s.to_dict() for s in self.stages],
+            'trace_memory': self.trace_memory,
+            'profile': self.profile_text(),
+        }
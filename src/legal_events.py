@@ -0,0 +1,199 @@
+import pandas as pd
+import numpy as np
+
+# INPADOC event code -> legal state (EP codes; extend per authority as needed)
+DEFAULT_EVENT_STATES = {
+    'GRAA': 'granted',              # (Expected) grant
+    'GRAS': 'granted',              # Grant fee paid
+    '26N': 'granted',               # No opposition filed within time limit
+    'PLBI': 'opposed',              # Opposition filed
+    '26': 'opposed',
+    'REJO': 'opposition_survived',  # Opposition rejected
+    '27A': 'opposition_survived',   # Patent maintained in amended form
+    'LAPS': 'lapsed',
+    'MM4A': 'lapsed',               # Lapse for non-payment of renewal fees
+    'WDRI': 'withdrawn',
+    '18W': 'withdrawn',             # Application withdrawn
+    '18D': 'withdrawn',             # Application deemed withdrawn
+    '27W': 'revoked',
+    'RVOK': 'revoked',
+}
+# States in precedence order: when two events share a date, the later state wins
+STATES = ['granted', 'opposed', 'opposition_survived', 'lapsed', 'withdrawn', 'revoked']
+# State -> label used by the legal scores (see scoring_engine.LEGAL_EVENT_SCORES)
+STATE_LABELS = {
+    'granted': 'Granted',
+    'opposed': 'Opposition (Pending)',
+    'opposition_survived': 'Opposition (Survived)',
+    'lapsed': 'Lapse',
+    'withdrawn': 'Withdrawal',
+    'revoked': 'Revocation',
+}
+PENDING_LABEL = 'Pending'
+# First date of each state, as output columns
+STATE_DATE_COLUMNS = {
+    'granted': 'Grant_Date',
+    'opposed': 'Opposition_Date',
+    'opposition_survived': 'Opposition_Survived_Date',
+    'lapsed': 'Lapse_Date',
+    'withdrawn': 'Withdrawal_Date',
+    'revoked': 'Revocation_Date',
+}
+# Valuation Bridge: share of the base value deducted per legal status
+LEGAL_RISK_DEDUCTION = {
+    'Lapse': 0.40,
+    'Withdrawal': 0.40,
+    'Revocation': 0.40,
+    'Opposition (Pending)': 0.15,
+}
+
+_EPOCH = np.datetime64('1900-01-01', 'D')
+_CODE_BITS = 10
+# Undated events sort last for "first date" and first for "latest event"
+_NO_DATE = 1 << 16
+
+
+def _to_days(dates):
+    """Event dates (strings or datetimes) -> days since 1900; missing / PATSTAT's 9999-12-31 -> _NO_DATE."""
+    codes, uniques = pd.factorize(pd.Series(dates, copy=False))
+    # Parsing happens once per distinct date, rows only carry integer codes
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object), errors='coerce')
+    days = (parsed.to_numpy(dtype='datetime64[D]') - _EPOCH).astype(np.int64)
+    days[parsed.isna().to_numpy() | (days < 0) | (days >= _NO_DATE)] = _NO_DATE
+    return np.r_[days, _NO_DATE][codes]
+
+
+def _reduce(groups, first_days, last_keys, counts):
+    """Per group: min first day, max (day, code) key, summed counts. Inputs need not be sorted."""
+    order = np.argsort(groups, kind='stable')
+    groups = groups[order]
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]]) if len(groups) else np.array([], dtype=np.int64)
+    if len(starts) == 0:
+        return groups, first_days, last_keys, counts
+    return (
+        groups[starts],
+        np.minimum.reduceat(first_days[order], starts),
+        np.maximum.reduceat(last_keys[order], starts),
+        np.add.reduceat(counts[order], starts),
+    )
+
+
+class LegalStateEngine:
+    """
+    Reduces tls231_inpadoc_legal_event rows to one legal state per application.
+
+    Each event is mapped (by event code) to a state category and packed into integer
+    keys: group = appln_id * n_states + state, and (day << 10 | code) for "latest".
+    A chunk is reduced with one sort and three reduceat calls to, per (application,
+    state), the first date, the latest date + code and an event count. These partial
+    aggregates merge with the same reduction, so chunks can arrive in any order and
+    only the (much smaller) partials are kept between chunks.
+
+    The status of an application is the state of its latest mapped event (ties go to
+    the later entry in STATES), e.g. an opposition followed by REJO is
+    'Opposition (Survived)', a grant followed by LAPS is 'Lapse'.
+    """
+    def __init__(self, event_states=None, code_column='event_code', date_column='event_publn_date',
+                 id_column='appln_id', compact_rows=20_000_000):
+        self.event_states = DEFAULT_EVENT_STATES if event_states is None else event_states
+        self.code_column = code_column
+        self.date_column = date_column
+        self.id_column = id_column
+        self.compact_rows = compact_rows
+        # Global code vocabulary, so packed keys mean the same thing in every chunk
+        self.codes = sorted(self.event_states)
+        if len(self.codes) >= 1 << _CODE_BITS:
+            raise ValueError(f"At most {(1 << _CODE_BITS) - 1} mapped event codes are supported.")
+        self._code_states = np.array([STATES.index(self.event_states[c]) for c in self.codes] + [-1])
+
+    # --- 1. CHUNK REDUCTION ---
+    def partial(self, events):
+        """Partial aggregate (groups, first_days, last_keys, counts) of one chunk of events."""
+        # Event codes are looked up once per distinct code
+        raw_codes, uniques = pd.factorize(events[self.code_column])
+        unique_idx = pd.Index(self.codes).get_indexer(pd.Series(uniques, dtype=object).astype(str).str.strip())
+        code_idx = np.r_[unique_idx, -1][raw_codes]
+        states = self._code_states[code_idx]
+        mapped = states >= 0
+        appln_ids = events[self.id_column].to_numpy(dtype=np.int64)[mapped]
+        days = _to_days(events[self.date_column].to_numpy()[mapped])
+        groups = appln_ids * len(STATES) + states[mapped]
+        last_keys = (np.where(days == _NO_DATE, 0, days) << _CODE_BITS) | code_idx[mapped]
+        return _reduce(groups, days, last_keys, np.ones(len(groups), dtype=np.int64))
+
+    @staticmethod
+    def merge(partials):
+        """Combines partial aggregates (from any chunking) into one."""
+        partials = list(partials)
+        if not partials:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, empty, empty
+        return _reduce(*(np.concatenate(parts) for parts in zip(*partials)))
+
+    def fit_chunks(self, chunks):
+        """Reduces an iterable of event frames (e.g. DataManager batches or exported parts)."""
+        pending, pending_rows = [], 0
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            part = self.partial(chunk)
+            pending.append(part)
+            pending_rows += len(part[0])
+            # Keep memory bounded by the number of distinct (application, state) pairs
+            if pending_rows > self.compact_rows and len(pending) > 1:
+                pending = [self.merge(pending)]
+                pending_rows = len(pending[0][0])
+        return self.resolve(self.merge(pending))
+
+    def fit(self, events):
+        return self.fit_chunks([events])
+
+    # --- 2. STATE RESOLUTION ---
+    def resolve(self, aggregate):
+        """
+        Per application (index appln_id): Legal_Status, Legal_Status_Date, Event_Code
+        (latest mapped event), first date of every state and Event_Count.
+        """
+        groups, first_days, last_keys, counts = aggregate
+        n_states = len(STATES)
+        appln_ids = groups // n_states
+        states = groups % n_states
+        starts = np.flatnonzero(np.r_[True, appln_ids[1:] != appln_ids[:-1]]) if len(groups) else np.array([], dtype=np.int64)
+        rows = np.cumsum(np.r_[False, appln_ids[1:] != appln_ids[:-1]]) if len(groups) else np.array([], dtype=np.int64)
+        n_apps = len(starts)
+
+        # (applications x states) tables; absent states stay -1
+        first = np.full((n_apps, n_states), -1, dtype=np.int64)
+        first[rows, states] = first_days
+        latest = np.full((n_apps, n_states), -1, dtype=np.int64)
+        latest[rows, states] = last_keys
+
+        # Latest event wins; the state index breaks ties between events on the same day
+        ranked = np.where(latest >= 0, (latest >> _CODE_BITS) * n_states + np.arange(n_states), -1)
+        winner = ranked.argmax(axis=1) if n_apps else np.array([], dtype=np.int64)
+        win_keys = latest[np.arange(n_apps), winner]
+
+        labels = np.array([STATE_LABELS[s] for s in STATES], dtype=object)
+        out = {
+            'Legal_Status': labels[winner],
+            'Legal_Status_Date': self._dates(win_keys >> _CODE_BITS),
+            'Event_Code': np.array(self.codes + [None], dtype=object)[win_keys & ((1 << _CODE_BITS) - 1)],
+        }
+        for i, state in enumerate(STATES):
+            out[STATE_DATE_COLUMNS[state]] = self._dates(first[:, i])
+        out['Event_Count'] = np.bincount(rows, weights=counts, minlength=n_apps).astype(np.int64)
+        return pd.DataFrame(out, index=pd.Index(appln_ids[starts], name=self.id_column))
+
+    @staticmethod
+    def _dates(days):
+        dated = (days > 0) & (days < _NO_DATE)
+        dates = _EPOCH + np.where(dated, days, 0).astype('timedelta64[D]')
+        return np.where(dated, dates, np.datetime64('NaT', 'D'))
+
+    @staticmethod
+    def align(states, appln_ids):
+        """States reindexed to `appln_ids`; applications without mapped events are 'Pending'."""
+        aligned = states.reindex(np.asarray(appln_ids))
+        aligned['Legal_Status'] = aligned['Legal_Status'].fillna(PENDING_LABEL)
+        aligned['Event_Count'] = aligned['Event_Count'].fillna(0).astype(np.int64)
+        return aligned.reset_index(drop=True)
@@ -0,0 +1,33 @@
+import pandas as pd
+import sqlite3
+import threading
+
+
+class LocalPatstatClient:
+    """
+    Local stand-in for epo.tipdata.patstat.PatstatClient.
+    Serves `sql_query` from an in-memory SQLite database loaded with DataFrames,
+    so exporters and Live-mode code paths can run offline.
+    """
+    def __init__(self, tables=None, env='LOCAL'):
+        self.env = env
+        self.query_log = []
+        # One shared connection; sqlite3 objects are not thread-safe, hence the lock
+        self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self._lock = threading.Lock()
+        for name, df in (tables or {}).items():
+            self.load_table(name, df)
+
+    def load_table(self, name, df, index_column='appln_id'):
+        """Registers (or replaces) a table, indexed on appln_id when present."""
+        with self._lock:
+            df.to_sql(name, self._conn, index=False, if_exists='replace')
+            if index_column in df.columns:
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_{index_column} ON {name} ({index_column})")
+
+    def sql_query(self, query, use_legacy_sql=False):
+        """Same call signature as PatstatClient.sql_query; returns a list of row dicts."""
+        with self._lock:
+            self.query_log.append(query)
+            df = pd.read_sql_query(query, self._conn)
+        return df.to_dict('records')
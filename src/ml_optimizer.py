@@ -1,29 +1,501 @@
 from sklearn.linear_model import Ridge
 import pandas as pd
 import numpy as np
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+
+FEATURES = ['Tech_Score', 'Legal_Score', 'Market_Score']
+TARGET = 'Estimated_Value'
+BATCH_BLOCK = 65_536  # rows per block in the struct-of-arrays path (keeps scratch in cache)
+
+# Model artifact format (bump ARTIFACT_SCHEMA_VERSION on incompatible changes)
+ARTIFACT_FORMAT = '3dpve-valuation-model'
+ARTIFACT_SCHEMA_VERSION = 1
+DEFAULT_REGISTRY_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models', 'valuation'))
 
 class PatentValuationOptimizer:
     def __init__(self):
         self.model = Ridge(alpha=1.0)
         self.is_trained = False
+        # Plain float64 copies of the fitted model, used by predict_batch
+        self.coef_ = None
+        self.intercept_ = 0.0
+        # Provenance, filled by train() or load()
+        self.fingerprint = None
+        self.metrics = {}
+        self.version = None
 
     def train(self, df):
         """
         Simulates training an ML model on the scored data.
         """
         # We use the 3 scores to predict the Value (Reverse engineering our own logic for the demo)
-        features = ['Tech_Score', 'Legal_Score', 'Market_Score']
-        target = 'Estimated_Value'
-        
+        features = FEATURES
+        target = TARGET
+
         if len(df) > 0:
             X = df[features]
             y = df[target]
             self.model.fit(X, y)
             self.is_trained = True
-            
+            self.coef_ = np.ascontiguousarray(self.model.coef_, dtype=np.float64)
+            self.intercept_ = float(self.model.intercept_)
+            self.fingerprint = training_fingerprint(X, y)
+            self.metrics = regression_metrics(y.to_numpy(dtype=np.float64), self.predict_batch(X.to_numpy()))
+            self.version = None
+
     def predict(self, tech, legal, market):
         if not self.is_trained:
             return 0
-        input_data = pd.DataFrame([[tech, legal, market]], 
-                                columns=['Tech_Score', 'Legal_Score', 'Market_Score'])
-        return self.model.predict(input_data)[0]
\ No newline at end of file
+        input_data = pd.DataFrame([[tech, legal, market]],
+                                columns=FEATURES)
+        return self.model.predict(input_data)[0]
+
+    def predict_batch(self, X=None, tech=None, legal=None, market=None, out=None):
+        """
+        Vectorized inference without DataFrame construction or sklearn validation.
+        Pass either X, an (n, 3) array in FEATURES order (one matrix-vector product),
+        or three 1-D arrays tech / legal / market (struct-of-arrays).
+        `out` is an optional caller-owned float64 buffer of length n that is filled in place.
+        """
+        if X is not None:
+            X = np.ascontiguousarray(X, dtype=np.float64)
+            if X.ndim != 2 or X.shape[1] != len(FEATURES):
+                raise ValueError(f"X must have shape (n, {len(FEATURES)}) in order {FEATURES}.")
+            n_rows = X.shape[0]
+        else:
+            columns = [np.asarray(c, dtype=np.float64) for c in (tech, legal, market)]
+            n_rows = len(columns[0])
+            if any(len(c) != n_rows for c in columns):
+                raise ValueError("tech, legal and market must have the same length.")
+
+        if out is None:
+            out = np.empty(n_rows, dtype=np.float64)
+        elif out.dtype != np.float64 or out.shape != (n_rows,) or not out.flags.c_contiguous:
+            raise ValueError(f"out must be a contiguous float64 array of shape ({n_rows},).")
+
+        # Untrained model scores 0, like predict()
+        if not self.is_trained:
+            out.fill(0.0)
+            return out
+
+        if X is not None:
+            np.dot(X, self.coef_, out=out)
+            out += self.intercept_
+            return out
+
+        # Struct-of-arrays: accumulate block by block, no (n, 3) temporary
+        scratch = np.empty(min(BATCH_BLOCK, n_rows), dtype=np.float64)
+        for start in range(0, n_rows, BATCH_BLOCK):
+            stop = min(start + BATCH_BLOCK, n_rows)
+            block, tmp = out[start:stop], scratch[:stop - start]
+            np.multiply(columns[0][start:stop], self.coef_[0], out=block)
+            for column, weight in zip(columns[1:], self.coef_[1:]):
+                np.multiply(column[start:stop], weight, out=tmp)
+                block += tmp
+            block += self.intercept_
+        return out
+
+    # --- PERSISTENCE ---
+    def set_coefficients(self, coef, intercept):
+        """Installs fitted coefficients without refitting (predict and predict_batch both work)."""
+        self.coef_ = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept_ = float(intercept)
+        self.model.coef_ = self.coef_.copy()
+        self.model.intercept_ = self.intercept_
+        self.model.n_features_in_ = len(FEATURES)
+        self.model.feature_names_in_ = np.array(FEATURES, dtype=object)
+        self.is_trained = True
+
+    def to_artifact(self):
+        if not self.is_trained:
+            raise ValueError("Cannot export an untrained model.")
+        return {
+            'format': ARTIFACT_FORMAT,
+            'schema_version': ARTIFACT_SCHEMA_VERSION,
+            'estimator': 'Ridge',
+            'params': {'alpha': self.model.alpha},
+            'features': FEATURES,
+            'target': TARGET,
+            'coef': self.coef_.tolist(),
+            'intercept': self.intercept_,
+            'training_fingerprint': self.fingerprint,
+            'metrics': self.metrics,
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+
+    def save(self, path):
+        """Writes the artifact as JSON (atomic replace)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_artifact(), f, indent=1)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def from_artifact(cls, artifact):
+        validate_artifact(artifact)
+        optimizer = cls()
+        optimizer.model.set_params(**artifact['params'])
+        optimizer.set_coefficients(artifact['coef'], artifact['intercept'])
+        optimizer.fingerprint = artifact.get('training_fingerprint')
+        optimizer.metrics = artifact.get('metrics', {})
+        return optimizer
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_artifact(json.load(f))
+
+
+def training_fingerprint(X, y):
+    """SHA-256 over the training matrix and target (float64, row order included)."""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def regression_metrics(y_true, y_pred):
+    residuals = y_true - y_pred
+    ss_res = float(residuals @ residuals)
+    ss_tot = float(((y_true - y_true.mean()) ** 2).sum())
+    return {
+        'n_samples': int(len(y_true)),
+        'r2': 1 - ss_res / ss_tot if ss_tot > 0 else 0.0,
+        'rmse': float(np.sqrt(ss_res / len(y_true))) if len(y_true) else 0.0,
+    }
+
+
+def validate_artifact(artifact):
+    """Raises ValueError if an artifact cannot serve the current feature schema."""
+    if artifact.get('format') != ARTIFACT_FORMAT:
+        raise ValueError("Not a 3D-PVE valuation model artifact.")
+    if artifact.get('schema_version') != ARTIFACT_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported artifact schema version {artifact.get('schema_version')}.")
+    if artifact.get('features') != FEATURES or artifact.get('target') != TARGET:
+        raise ValueError(f"Artifact features {artifact.get('features')} do not match {FEATURES}.")
+    if len(artifact.get('coef', [])) != len(FEATURES):
+        raise ValueError("Artifact coefficient count does not match the feature schema.")
+
+
+class ModelRegistry:
+    """
+    Small on-disk registry of versioned valuation models (v0001.json, v0002.json, ...).
+    Workers load the newest artifact compatible with the current schema on first use,
+    so serving never depends on retraining.
+    """
+    _VERSION_FILE = re.compile(r'^v(\d{4,})\.json$')
+
+    def __init__(self, root=DEFAULT_REGISTRY_DIR):
+        self.root = root
+        self._loaded = None
+
+    def versions(self):
+        if not os.path.isdir(self.root):
+            return []
+        found = (self._VERSION_FILE.match(name) for name in os.listdir(self.root))
+        return sorted(int(m.group(1)) for m in found if m)
+
+    def path(self, version):
+        return os.path.join(self.root, f"v{version:04d}.json")
+
+    def publish(self, optimizer):
+        """Saves a trained optimizer as the next version and returns the version number."""
+        os.makedirs(self.root, exist_ok=True)
+        # Written in full under a private name, then hard-linked into place: readers never
+        # see a partial artifact, and link() fails instead of overwriting a concurrent publish
+        tmp_path = os.path.join(self.root, f".publish.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(optimizer.to_artifact(), f, indent=1)
+        try:
+            version = (self.versions() or [0])[-1] + 1
+            while True:
+                try:
+                    os.link(tmp_path, self.path(version))
+                    break
+                except FileExistsError:
+                    # Another worker took this version: move on to the next free one
+                    version += 1
+        finally:
+            os.remove(tmp_path)
+        optimizer.version = version
+        self._loaded = None
+        return version
+
+    def latest_compatible(self):
+        """Returns (version, artifact) of the newest artifact passing validation, or (None, None)."""
+        for version in reversed(self.versions()):
+            try:
+                with open(self.path(version)) as f:
+                    artifact = json.load(f)
+                validate_artifact(artifact)
+                return version, artifact
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Skipping model v{version:04d}: {e}")
+        return None, None
+
+    def get(self):
+        """Lazily loads (once per registry instance) the latest compatible model, or None."""
+        if self._loaded is None:
+            version, artifact = self.latest_compatible()
+            if artifact is None:
+                return None
+            self._loaded = PatentValuationOptimizer.from_artifact(artifact)
+            self._loaded.version = version
+        return self._loaded
+
+    def get_or_train(self, df):
+        """Serves the registered model; trains and publishes one only if none is compatible."""
+        optimizer = self.get()
+        if optimizer is None:
+            optimizer = PatentValuationOptimizer()
+            optimizer.train(df)
+            if optimizer.is_trained:
+                self.publish(optimizer)
+                self._loaded = optimizer
+        return optimizer
+
+
+class IncrementalRidgeTrainer:
+    """
+    Out-of-core Ridge regression for the valuation model.
+    Accumulates sufficient statistics chunk by chunk (count, feature/target means and
+    the centered co-moments, i.e. XᵀX and Xᵀy about the running mean) and solves the
+    ridge system from them. Memory is O(p²) in the number of features; statistics from
+    different snapshots can be merged without revisiting old rows.
+    Matches sklearn's Ridge(alpha, fit_intercept=True) up to floating-point tolerance.
+    """
+    def __init__(self, alpha=1.0, features=None, target=TARGET):
+        self.alpha = alpha
+        self.features = list(features or FEATURES)
+        self.target = target
+        p = len(self.features)
+        self.n = 0
+        self.mean_x = np.zeros(p)
+        self.mean_y = 0.0
+        self.cxx = np.zeros((p, p))  # Σ (x - μx)(x - μx)ᵀ
+        self.cxy = np.zeros(p)       # Σ (x - μx)(y - μy)
+        self.cyy = 0.0               # Σ (y - μy)²
+
+    def _merge_stats(self, n, mean_x, mean_y, cxx, cxy, cyy):
+        """Pairwise (Chan et al.) combination of two sets of centered statistics."""
+        if n == 0:
+            return
+        if self.n == 0:
+            self.n, self.mean_x, self.mean_y = n, mean_x.copy(), mean_y
+            self.cxx, self.cxy, self.cyy = cxx.copy(), cxy.copy(), cyy
+            return
+        total = self.n + n
+        dx = mean_x - self.mean_x
+        dy = mean_y - self.mean_y
+        weight = self.n * n / total
+        self.cxx = self.cxx + cxx + weight * np.outer(dx, dx)
+        self.cxy = self.cxy + cxy + weight * dx * dy
+        self.cyy = self.cyy + cyy + weight * dy * dy
+        self.mean_x = self.mean_x + dx * (n / total)
+        self.mean_y = self.mean_y + dy * (n / total)
+        self.n = total
+
+    def partial_fit(self, df):
+        """Folds one chunk (e.g. a StreamingScorer batch, one row per application) into the statistics."""
+        X = df[self.features].to_numpy(dtype=np.float64)
+        y = df[self.target].to_numpy(dtype=np.float64)
+        if len(y) == 0:
+            return self
+        mean_x, mean_y = X.mean(axis=0), y.mean()
+        Xc, yc = X - mean_x, y - mean_y
+        self._merge_stats(len(y), mean_x, mean_y, Xc.T @ Xc, Xc.T @ yc, float(yc @ yc))
+        return self
+
+    def fit_stream(self, batches):
+        for batch in batches:
+            self.partial_fit(batch)
+        return self
+
+    def merge(self, other):
+        """Adds another trainer's statistics (e.g. from a new snapshot) into this one."""
+        if other.features != self.features:
+            raise ValueError("Cannot merge trainers with different feature schemas.")
+        self._merge_stats(other.n, other.mean_x, other.mean_y, other.cxx, other.cxy, other.cyy)
+        return self
+
+    def solve(self):
+        """Returns (coef, intercept) of the ridge solution."""
+        if self.n == 0:
+            raise ValueError("No training data has been accumulated.")
+        p = len(self.features)
+        coef = np.linalg.solve(self.cxx + self.alpha * np.eye(p), self.cxy)
+        intercept = self.mean_y - self.mean_x @ coef
+        return coef, float(intercept)
+
+    def to_optimizer(self):
+        """Builds a ready-to-serve PatentValuationOptimizer (publishable to ModelRegistry)."""
+        coef, intercept = self.solve()
+        optimizer = PatentValuationOptimizer()
+        optimizer.model.set_params(alpha=self.alpha)
+        optimizer.set_coefficients(coef, intercept)
+
+        # In-sample metrics straight from the statistics
+        ss_res = max(self.cyy - 2 * coef @ self.cxy + coef @ self.cxx @ coef, 0.0)
+        optimizer.metrics = {
+            'n_samples': int(self.n),
+            'r2': float(1 - ss_res / self.cyy) if self.cyy > 0 else 0.0,
+            'rmse': float(np.sqrt(ss_res / self.n)),
+        }
+        digest = hashlib.sha256()
+        for part in (np.array([self.n, self.mean_y, self.cyy]), self.mean_x, self.cxx, self.cxy):
+            digest.update(np.ascontiguousarray(part, dtype=np.float64).tobytes())
+        optimizer.fingerprint = digest.hexdigest()
+        return optimizer
+
+    def save(self, path):
+        """Persists the statistics (a few hundred bytes) so later snapshots can be folded in."""
+        with open(path, 'wb') as f:
+            np.savez(f, n=self.n, mean_x=self.mean_x, mean_y=self.mean_y, cxx=self.cxx, cxy=self.cxy,
+                     cyy=self.cyy, alpha=self.alpha, features=np.array(self.features), target=self.target)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            trainer = cls(alpha=float(data['alpha']), features=data['features'].tolist(), target=str(data['target']))
+            trainer._merge_stats(int(data['n']), data['mean_x'], float(data['mean_y']),
+                                 data['cxx'], data['cxy'], float(data['cyy']))
+        return trainer
+
+
+def _evaluate_lambda(args):
+    """
+    Scores one ridge penalty from per-fold sufficient statistics (runs in worker processes).
+    Returns (lambda, k-fold CV mean squared error, GCV score, weights on the full data).
+    """
+    ridge_lambda, ztz, zty, yty, counts = args
+    p = ztz.shape[1]
+    penalty = ridge_lambda * np.eye(p)
+    total_ztz, total_zty, total_yty, n = ztz.sum(axis=0), zty.sum(axis=0), yty.sum(), counts.sum()
+
+    # k-fold CV: train on "everything but fold k" by subtraction, evaluate on fold k
+    sse = 0.0
+    for k in range(len(counts)):
+        w = np.linalg.solve(total_ztz - ztz[k] + penalty, total_zty - zty[k])
+        sse += yty[k] - 2 * w @ zty[k] + w @ ztz[k] @ w
+
+    # Generalized CV on the full fit: n * RSS / (n - tr(H))²
+    w_full = np.linalg.solve(total_ztz + penalty, total_zty)
+    rss = total_yty - 2 * w_full @ total_zty + w_full @ total_ztz @ w_full
+    eigenvalues = np.linalg.eigvalsh(total_ztz)
+    dof = float((eigenvalues / (eigenvalues + ridge_lambda)).sum())
+    gcv = n * rss / (n - dof) ** 2
+    return ridge_lambda, float(sse / n), float(gcv), w_full
+
+
+class WeightOptimizer:
+    """
+    Handles Phase 4: Advanced Optimization Layer.
+    Fits the economic-score weights of PatentValueEngine,
+        S_eco = alpha * log(1 + family_size) + beta * years_active,
+    by ridge regression on benchmark data, choosing the penalty by k-fold CV or GCV.
+    Folds are reduced to sufficient statistics in one pass (cached on disk), so the
+    regularization grid costs O(grid × folds × p³) regardless of the number of rows.
+    """
+    def __init__(self, lambdas=None, n_folds=5, criterion='cv', n_jobs=1, cache_dir=None, seed=42):
+        self.lambdas = np.asarray(lambdas if lambdas is not None else np.logspace(-4, 4, 33), dtype=np.float64)
+        self.n_folds = n_folds
+        self.criterion = criterion
+        self.n_jobs = n_jobs
+        self.cache_dir = cache_dir
+        self.seed = seed
+        self.model = None
+        self.best_alpha = 0.6
+        self.best_beta = 0.4
+        self.best_lambda = None
+        self.cv_results = None
+
+    @staticmethod
+    def _design(X_train):
+        """[log(1 + family_size), years_active] from a DataFrame or an (n, 2) array."""
+        if isinstance(X_train, pd.DataFrame):
+            family, years = X_train['family_size'], X_train['years_active']
+        else:
+            X_train = np.asarray(X_train, dtype=np.float64)
+            family, years = X_train[:, 0], X_train[:, 1]
+        family = np.asarray(family, dtype=np.float64)
+        years = np.asarray(years, dtype=np.float64)
+        return np.column_stack([np.log(1 + family), years])
+
+    def _fold_stats(self, Z, y):
+        """Per-fold ZᵀZ, Zᵀy, yᵀy and counts, loaded from the fold cache when possible."""
+        cache_path = None
+        if self.cache_dir:
+            digest = hashlib.sha256()
+            digest.update(np.ascontiguousarray(Z).tobytes())
+            digest.update(np.ascontiguousarray(y).tobytes())
+            digest.update(f"{self.n_folds}:{self.seed}".encode())
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cache_path = os.path.join(self.cache_dir, f"folds-{digest.hexdigest()[:32]}.npz")
+            if os.path.exists(cache_path):
+                with np.load(cache_path) as cached:
+                    return cached['ztz'], cached['zty'], cached['yty'], cached['counts']
+
+        folds = np.random.default_rng(self.seed).integers(0, self.n_folds, len(y))
+        p = Z.shape[1]
+        ztz = np.empty((self.n_folds, p, p))
+        zty = np.empty((self.n_folds, p))
+        for i in range(p):
+            zty[:, i] = np.bincount(folds, weights=Z[:, i] * y, minlength=self.n_folds)
+            for j in range(i, p):
+                ztz[:, i, j] = ztz[:, j, i] = np.bincount(folds, weights=Z[:, i] * Z[:, j], minlength=self.n_folds)
+        yty = np.bincount(folds, weights=y * y, minlength=self.n_folds)
+        counts = np.bincount(folds, minlength=self.n_folds).astype(np.float64)
+
+        if cache_path:
+            with open(cache_path, 'wb') as f:
+                np.savez(f, ztz=ztz, zty=zty, yty=yty, counts=counts)
+        return ztz, zty, yty, counts
+
+    def train_on_benchmark(self, X_train, y_train):
+        """
+        Fits alpha/beta on benchmark data.
+        Equation: min ||y - Zw||^2 + lambda * ||w||^2,  Z = [log(1 + family_size), years_active]
+        Returns weights that PatentValueEngine.set_model_mode('ML_Optimized', ...) accepts directly.
+        """
+        y = np.asarray(y_train, dtype=np.float64)
+        if len(y) == 0:
+            print("⚠️ No benchmark data supplied. Keeping current coefficients.")
+            return {'alpha': self.best_alpha, 'beta': self.best_beta}
+
+        print(f"Training Ridge Regression on benchmark data ({len(y):,} rows, {len(self.lambdas)} penalties)...")
+        Z = self._design(X_train)
+        stats = self._fold_stats(Z, y)
+        tasks = [(ridge_lambda,) + tuple(stats) for ridge_lambda in self.lambdas]
+
+        # Regularization grid: one task per penalty, spread across a process pool
+        if self.n_jobs and self.n_jobs > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as pool:
+                results = list(pool.map(_evaluate_lambda, tasks))
+        else:
+            results = [_evaluate_lambda(task) for task in tasks]
+
+        self.cv_results = pd.DataFrame(
+            [(lam, cv, gcv) for lam, cv, gcv, _ in results], columns=['lambda', 'cv_mse', 'gcv']
+        )
+        score_column = 'cv_mse' if self.criterion == 'cv' else 'gcv'
+        best = int(self.cv_results[score_column].idxmin())
+        self.best_lambda = float(results[best][0])
+        self.model = results[best][3]
+        self.best_alpha, self.best_beta = (float(w) for w in self.model)
+
+        print(f"Optimization Complete. New Coeffs: alpha={self.best_alpha:.4f}, beta={self.best_beta:.4f} "
+              f"(lambda={self.best_lambda:.3g})")
+        return {
+            'alpha': self.best_alpha,
+            'beta': self.best_beta,
+            'ridge_lambda': self.best_lambda,
+            score_column: float(self.cv_results[score_column].iloc[best]),
+        }
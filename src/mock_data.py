@@ -1,14 +1,23 @@
 import pandas as pd
 import numpy as np
 
-def generate_mock_portfolio(n_patents=150):
+def generate_mock_portfolio(n_patents=150, seed=42):
     """
     Generates a synthetic dataset of patents with Industry Sectors.
+    Uses its own seeded Generator (global NumPy state is left alone) and unique IDs.
+    For multi-table PATSTAT-shaped data see src/synthetic_patstat.py.
     """
-    np.random.seed(42) # Fixed seed for reproducibility
+    rng = np.random.default_rng(seed)
     
-    # Generate random Patent IDs
-    ids = [f"EP-{np.random.randint(1000000, 9999999)}" for _ in range(n_patents)]
+    # Unique Patent IDs (7 digits, more for very large portfolios): one random number
+    # per equal-width slot of the number range, then shuffled
+    low = 10 ** (max(7, len(str(n_patents))) - 1)
+    if n_patents > 9 * low:
+        # e.g. 9.5M ids do not fit the 7-digit range [1e6, 1e7): widen by one digit
+        low *= 10
+    stride = 9 * low // max(n_patents, 1)
+    numbers = rng.permutation(low + np.arange(n_patents) * stride + rng.integers(0, stride, n_patents))
+    ids = 'EP-' + pd.Series(numbers).astype(str)
     
     # Industry Sectors with weighted probability
     sectors = ['Biotech', 'AI & Software', 'Automotive', 'Green Energy', 'Semiconductors']
@@ -16,20 +25,165 @@ def generate_mock_portfolio(n_patents=150):
     
     data = {
         'Patent_ID': ids,
-        'Sector': np.random.choice(sectors, n_patents, p=weights),
-        'Citations': np.random.poisson(15, n_patents),      # Forward citations
-        'Family_Size': np.random.randint(1, 20, n_patents), # Market reach
-        'Remaining_Life': np.random.randint(1, 20, n_patents), # Legal validity
-        'Claims_Count': np.random.randint(5, 50, n_patents),   # Tech breadth
-        'Backward_Citations': np.random.randint(0, 50, n_patents), # Prior art
+        'Sector': rng.choice(sectors, n_patents, p=weights),
+        'Citations': rng.poisson(15, n_patents),      # Forward citations
+        'Family_Size': rng.integers(1, 20, n_patents), # Market reach
+        'Remaining_Life': rng.integers(1, 20, n_patents), # Legal validity
+        'Claims_Count': rng.integers(5, 50, n_patents),   # Tech breadth
+        'Backward_Citations': rng.integers(0, 50, n_patents), # Prior art
         # Add internal scores for the 3D Map compatibility
-        'Legal_Score': np.random.randint(30, 95, n_patents),
-        'Tech_Score': np.random.randint(30, 95, n_patents),
-        'Market_Score': np.random.randint(30, 95, n_patents)
+        'Legal_Score': rng.integers(30, 95, n_patents),
+        'Tech_Score': rng.integers(30, 95, n_patents),
+        'Market_Score': rng.integers(30, 95, n_patents)
     }
     
     return pd.DataFrame(data)
 
+def generate_mock_citations(patent_ids, filing_years, mean_citations=15, mean_prior_art=12,
+                            family_size=3, seed=42):
+    """
+    Synthetic tls212-style citation graph around a portfolio (mock CitationIndex input).
+    Every patent is cited by ~Poisson(mean_citations) citing families, each citing it
+    through 1..family_size member applications filed 0-7 years later, and cites
+    ~Poisson(mean_prior_art) older applications. Returns (edges, nodes): edges has
+    'citing'/'cited' id columns, nodes is indexed by id with 'year' and 'family'.
+    """
+    rng = np.random.default_rng(seed)
+    patent_ids = np.asarray(patent_ids).astype(str)
+    filing_years = np.asarray(filing_years, dtype=np.int64)
+    n = len(patent_ids)
+
+    # Forward: citing families -> member applications
+    per_patent = rng.poisson(mean_citations, n)
+    cited_pos = np.repeat(np.arange(n), per_patent)
+    n_families = len(cited_pos)
+    members = rng.integers(1, family_size + 1, n_families)
+    family_of = np.repeat(np.arange(n_families), members)
+    member_no = np.arange(len(family_of)) - np.repeat(np.cumsum(members) - members, members)
+    family_year = filing_years[cited_pos] + rng.integers(0, 8, n_families)
+    citing_ids = pd.Series(family_of).astype(str).radd('XC-') + '-' + pd.Series(member_no).astype(str)
+
+    # Backward: prior art filed 1-9 years earlier
+    per_patent = rng.poisson(mean_prior_art, n)
+    citing_pos = np.repeat(np.arange(n), per_patent)
+    prior_ids = pd.Series(np.arange(len(citing_pos))).astype(str).radd('XP-')
+
+    edges = pd.DataFrame({
+        'citing': np.concatenate([citing_ids.to_numpy(dtype=object), patent_ids[citing_pos].astype(object)]),
+        'cited': np.concatenate([patent_ids[cited_pos[family_of]].astype(object), prior_ids.to_numpy(dtype=object)]),
+    })
+    # Portfolio and prior-art applications are their own family (None)
+    families = np.full(n + len(family_of) + len(citing_pos), None, dtype=object)
+    families[n:n + len(family_of)] = pd.Series(family_of).astype(str).radd('XCF-').to_numpy(dtype=object)
+    nodes = pd.DataFrame({
+        'year': np.concatenate([filing_years, family_year[family_of],
+                                filing_years[citing_pos] - rng.integers(1, 10, len(citing_pos))]),
+        'family': families,
+    }, index=np.concatenate([patent_ids.astype(object), citing_ids.to_numpy(dtype=object),
+                             prior_ids.to_numpy(dtype=object)]))
+    return edges, nodes
+
+# IPC subclasses drawn for mock tls209 rows
+MOCK_IPC_SUBCLASSES = [
+    'G06F', 'G06N', 'G06Q', 'H04L', 'H04W', 'A61K', 'A61P', 'C12N', 'C07D', 'G01N',
+    'H01M', 'H02J', 'F03D', 'Y02E', 'B60L', 'B60W', 'F02M', 'B23K', 'H01L', 'G11C',
+]
+
+def generate_mock_ipc(appln_ids, anchors=None, max_codes=3, max_focus=0.9, seed=42):
+    """
+    Synthetic tls209 rows (appln_id, ipc_class_symbol): 1..max_codes codes per application.
+    With `anchors` (an id per application, e.g. the patent it cites), each anchor gets a home
+    subclass and a focus in [0, max_focus); codes fall in the home subclass with that
+    probability, so some patents are cited from one field and others from many.
+    """
+    rng = np.random.default_rng(seed)
+    appln_ids = np.asarray(appln_ids)
+    n_classes = len(MOCK_IPC_SUBCLASSES)
+    n_codes = rng.integers(1, max_codes + 1, len(appln_ids))
+    owner = np.repeat(np.arange(len(appln_ids)), n_codes)
+
+    codes = rng.integers(0, n_classes, len(owner))
+    if anchors is not None:
+        hashed = pd.util.hash_array(np.asarray(anchors).astype(str).astype(object))
+        home = (hashed % np.uint64(n_classes)).astype(np.int64)
+        focus = (hashed // np.uint64(n_classes) % np.uint64(1000)).astype(np.float64) / 1000 * max_focus
+        focused = rng.random(len(owner)) < focus[owner]
+        codes[focused] = home[owner[focused]]
+    groups = rng.integers(1, 100, len(owner))
+    symbols = pd.Series(np.array(MOCK_IPC_SUBCLASSES)[codes]) + ' ' + pd.Series(groups).astype(str) + '/00'
+    return pd.DataFrame({'appln_id': appln_ids[owner], 'ipc_class_symbol': symbols.to_numpy()})
+
+def generate_mock_legal_events(appln_ids, filing_years, seed=42):
+    """
+    Synthetic tls231 rows (appln_id, event_code, event_publn_date) following the EP path:
+    ~70% granted 3-5 years after filing, ~10% of grants opposed (REJO / 27A / 27W / pending),
+    ~10% of grants lapsed later, and ~40% of the rest withdrawn.
+    """
+    rng = np.random.default_rng(seed)
+    appln_ids = np.asarray(appln_ids)
+    filed = pd.to_datetime(pd.Series(np.asarray(filing_years, dtype=np.int64)).astype(str) + '-01-01').to_numpy()
+    n = len(appln_ids)
+
+    def days(low, high):
+        return rng.integers(low * 365, high * 365, n).astype('timedelta64[D]')
+
+    granted = rng.random(n) < 0.7
+    grant_date = filed + days(3, 6)
+    opposed = granted & (rng.random(n) < 0.1)
+    opposition_date = grant_date + days(0, 1)
+    outcome = rng.choice(['REJO', '27A', '27W', None], n, p=[0.4, 0.2, 0.3, 0.1])
+    decided = opposed & (outcome != None)
+    lapsed = granted & ~(opposed & (outcome == '27W')) & (rng.random(n) < 0.1)
+    withdrawn = ~granted & (rng.random(n) < 0.4)
+
+    events = [
+        (granted, 'GRAA', grant_date),
+        (opposed, 'PLBI', opposition_date),
+        (decided, outcome, opposition_date + days(1, 3)),
+        (lapsed, 'LAPS', grant_date + days(4, 10)),
+        (withdrawn, 'WDRI', filed + days(1, 4)),
+    ]
+    frames = [
+        pd.DataFrame({
+            'appln_id': appln_ids[mask],
+            'event_code': np.broadcast_to(np.asarray(code, dtype=object), (n,))[mask],
+            'event_publn_date': dates[mask].astype('datetime64[D]').astype(str),
+        })
+        for mask, code, dates in events
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+# Filing authorities with rough relative filing volumes (EP first: the mock portfolio is European)
+MOCK_AUTHORITIES = ['EP', 'US', 'CN', 'JP', 'KR', 'DE', 'WO', 'GB', 'FR', 'CA', 'AU', 'IN']
+MOCK_AUTHORITY_WEIGHTS = [0.0, 0.22, 0.2, 0.12, 0.08, 0.08, 0.12, 0.05, 0.04, 0.03, 0.03, 0.03]
+
+
+def generate_mock_families(family_ids, family_sizes, filing_years, seed=42):
+    """
+    Synthetic tls201 rows (docdb_family_id, appln_id, appln_auth, earliest_filing_date)
+    for DOCDB families: family i has family_sizes[i] members, the first an EP filing
+    with the priority date in filing_years[i], the others filed abroad up to a year later.
+    """
+    rng = np.random.default_rng(seed)
+    family_ids = np.asarray(family_ids)
+    sizes = np.maximum(np.asarray(family_sizes, dtype=np.int64), 1)
+    priority = pd.to_datetime(pd.Series(np.asarray(filing_years, dtype=np.int64)).astype(str) + '-01-01').to_numpy()
+    priority = priority + rng.integers(0, 365, len(sizes)).astype('timedelta64[D]')
+
+    owner = np.repeat(np.arange(len(sizes)), sizes)
+    first = np.r_[True, owner[1:] != owner[:-1]] if len(owner) else np.zeros(0, dtype=bool)
+    weights = np.asarray(MOCK_AUTHORITY_WEIGHTS) / np.sum(MOCK_AUTHORITY_WEIGHTS)
+    authorities = np.asarray(MOCK_AUTHORITIES, dtype=object)[rng.choice(len(MOCK_AUTHORITIES), len(owner), p=weights)]
+    authorities[first] = 'EP'
+    delay = np.where(first, 0, rng.integers(0, 365, len(owner))).astype('timedelta64[D]')
+
+    return pd.DataFrame({
+        'docdb_family_id': family_ids[owner],
+        'appln_id': np.arange(len(owner), dtype=np.int64),
+        'appln_auth': authorities,
+        'earliest_filing_date': (priority[owner] + delay).astype('datetime64[D]').astype(str),
+    })
+
 # ALIAS: This ensures that any code looking for 'generate_mock_data' finds this function
 def generate_mock_data(n=150):
     df = generate_mock_portfolio(n)
@@ -1,11 +1,21 @@
 import pandas as pd
+import numpy as np
+import logging
+from src.scoring_engine import PatentValueEngine
+from src.monte_carlo import MonteCarloEngine
+from src.dcf_engine import DCFEngine
+
+logger = logging.getLogger('3dpve.portfolio')
 
 class PortfolioManager:
-    def __init__(self, portfolio_df):
+    def __init__(self, portfolio_df=None, engine=None):
         """
         Manages the collection of valued patents.
+        Connects Data (CSV/DataFrame) -> Scoring Engine -> Results.
         """
         self.portfolio = portfolio_df
+        # Use existing engine or create new one
+        self.engine = engine if engine else PatentValueEngine()
 
     def get_total_value(self):
         return self.portfolio['Estimated_Value'].sum()
@@ -15,4 +25,58 @@ class PortfolioManager:
 
     def get_risk_profile(self):
         # returns simple stats
-        return self.portfolio['Total_Score'].describe()
\ No newline at end of file
+        return self.portfolio['Total_Score'].describe()
+
+    def simulate_value_paths(self, scenario="Stable", n_paths=10_000, value_col='Estimated_Value',
+                             start_year=None, **engine_kwargs):
+        """Monte Carlo projection of the portfolio from its value per Sector (see MonteCarloEngine)."""
+        exposures = self.portfolio.groupby('Sector', observed=True)[value_col].sum()
+        engine = MonteCarloEngine.for_scenario(exposures.index, scenario, **engine_kwargs)
+        return engine.simulate(exposures.to_numpy(), n_paths, start_year=start_year)
+
+    def get_value_at_risk(self, scenario="Stable", n_paths=10_000, alpha=0.95, value_col='Estimated_Value',
+                          **engine_kwargs):
+        """Horizon VaR / CVaR and terminal value statistics from simulate_value_paths()."""
+        result = self.simulate_value_paths(scenario, n_paths, value_col, **engine_kwargs)
+        return result.summary(alpha)
+
+    def get_dcf_valuation(self, value_col='Estimated_Value', engine=None, **engine_kwargs):
+        """
+        Per-patent NPV over remaining legal life (see DCFEngine).
+        Returns (portfolio with an 'NPV' column, per-sector NPV summary).
+        """
+        engine = engine or DCFEngine(**engine_kwargs)
+        npv, by_sector = engine.value_portfolio(self.portfolio, value_col=value_col)
+        return self.portfolio.assign(NPV=npv), by_sector
+
+    def process_portfolio(self, df=None):
+        """
+        Applies the PatentValueEngine formulation to an entire DataFrame in one pass.
+        Expected columns: patent_id, legal_status, family_size, years_active, tech_diversity
+        """
+        df = self.portfolio if df is None else df
+        logger.info("Processing %d patents with mode: %s...", len(df), self.engine.mode)
+
+        # 1. Individual Scores (column-wise, no per-row Python)
+        s_leg = self.engine.calculate_legal_scores(df['legal_status'])
+        s_eco = self.engine.calculate_economic_scores(df['family_size'], df['years_active'])
+        s_tech = self.engine.calculate_tech_scores(df['tech_diversity'])
+
+        # 2. Composite Score
+        v_cp = self.engine.get_composite_scores(s_leg, s_eco, s_tech)
+
+        # 3. Store alongside the input rows
+        return df.assign(
+            legal_score=np.round(s_leg, 2),
+            eco_score=np.round(s_eco, 2),
+            tech_score=np.round(s_tech, 2),
+            final_value=np.round(v_cp, 2)
+        )
+
+    def identify_top_assets(self, scored_df, top_n=5):
+        """Returns the highest valued patents."""
+        return scored_df.sort_values(by='final_value', ascending=False).head(top_n)
+
+    def identify_risks(self, scored_df):
+        """Returns patents with Zero value (Revoked/Lapsed)."""
+        return scored_df[scored_df['final_value'] == 0]
@@ -0,0 +1,120 @@
+import pandas as pd
+import numpy as np
+
+# Built-in "Market Condition" sector multipliers (unknown sectors keep their standard value)
+DEFAULT_SCENARIOS = {
+    "Stable": {
+        'AI & Software': 1.10, 'Biotech': 1.05, 'Green Energy': 1.02,
+        'Automotive': 1.00, 'Industrial Mfg': 0.95
+    },
+    "Recession": {
+        'AI & Software': 0.85, 'Biotech': 0.80, 'Green Energy': 0.70,
+        'Automotive': 0.60, 'Industrial Mfg': 0.50
+    },
+    "High Growth": {
+        'AI & Software': 1.50, 'Biotech': 1.40, 'Green Energy': 1.30,
+        'Automotive': 1.25, 'Industrial Mfg': 1.15
+    },
+}
+DEFAULT_SCENARIO = "Stable"
+DEFAULT_MULTIPLIER = 1.0
+
+
+class ScenarioEngine:
+    """
+    Sector multipliers for every scenario as one dense (scenarios x sectors) matrix.
+
+    Valuing a portfolio is a single broadcast: with per-row sector codes c and
+    standard values v, value_matrix() returns v[:, None] * M.T[c], i.e. every
+    scenario at once as an N x S matrix, without touching the Sector strings.
+    """
+    def __init__(self, scenarios=None, default_multiplier=DEFAULT_MULTIPLIER):
+        self.default_multiplier = default_multiplier
+        self.names = []
+        self.sectors = []
+        self.matrix = np.empty((0, 0), dtype=np.float64)
+        for name, multipliers in (scenarios or DEFAULT_SCENARIOS).items():
+            self.add_scenario(name, multipliers)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    @property
+    def key(self):
+        """Hashable fingerprint of the scenario set (for memoizing results computed from it)."""
+        return (tuple(self.names), tuple(self.sectors), self.matrix.tobytes())
+
+    def index(self, name):
+        """Row of `name`, falling back to the default scenario like the old vol_map.get()."""
+        if name in self.names:
+            return self.names.index(name)
+        return self.names.index(DEFAULT_SCENARIO) if DEFAULT_SCENARIO in self.names else 0
+
+    def add_scenario(self, name, multipliers, base=None):
+        """
+        Adds (or replaces) a scenario. Sectors missing from `multipliers` inherit
+        the `base` scenario's value, or the default multiplier when there is no base.
+        """
+        new_sectors = [s for s in multipliers if s not in self.sectors]
+        if new_sectors:
+            self.sectors.extend(new_sectors)
+            columns = np.full((len(self.names), len(new_sectors)), self.default_multiplier)
+            self.matrix = np.hstack([self.matrix, columns])
+
+        if base is not None:
+            row = self.matrix[self.index(base)].copy()
+        else:
+            row = np.full(len(self.sectors), self.default_multiplier)
+        for sector, value in multipliers.items():
+            row[self.sectors.index(sector)] = float(value)
+
+        if name in self.names:
+            self.matrix[self.names.index(name)] = row
+        else:
+            self.names.append(name)
+            self.matrix = np.vstack([self.matrix, row])
+
+    def remove_scenario(self, name):
+        i = self.names.index(name)
+        self.names.pop(i)
+        self.matrix = np.delete(self.matrix, i, axis=0)
+
+    def multipliers(self, name):
+        return dict(zip(self.sectors, self.matrix[self.index(name)]))
+
+    def table(self, sectors):
+        """
+        (len(sectors) + 1, S) gather table aligned with `sectors` (e.g. pd.factorize uniques).
+        The trailing row holds the default multiplier, so code -1 (missing sector) maps to it.
+        """
+        table = np.full((len(sectors) + 1, len(self.names)), self.default_multiplier)
+        positions = pd.Index(self.sectors).get_indexer(sectors)
+        known = positions >= 0
+        table[:-1][known] = self.matrix[:, positions[known]].T
+        return table
+
+    def value_matrix(self, values, codes, sectors, out=None):
+        """
+        N x S scenario values for standard `values` and sector `codes` into `sectors`.
+        float32 values stay float32 (compact schema); anything else is computed in float64.
+        """
+        values = np.asarray(values)
+        dtype = np.float32 if values.dtype == np.float32 else np.float64
+        values = values.astype(dtype, copy=False)
+        if out is None:
+            out = np.empty((len(values), len(self.names)), dtype=dtype)
+        np.multiply(values[:, None], self.table(sectors).astype(dtype)[codes], out=out)
+        return out
+
+    def totals(self, values, codes, sectors):
+        """Per-scenario portfolio totals without materializing the N x S matrix."""
+        per_sector = np.bincount(np.asarray(codes) + 1, weights=values, minlength=len(sectors) + 1)
+        # bincount slot 0 is code -1, which is the table's trailing row
+        per_sector = np.roll(per_sector, -1)
+        return pd.Series(per_sector @ self.table(sectors), index=self.names)
+
+    def to_frame(self):
+        return pd.DataFrame(self.matrix, index=pd.Index(self.names, name='Scenario'), columns=self.sectors)
@@ -0,0 +1,103 @@
+import pandas as pd
+import numpy as np
+
+# Compact dtypes for a harmonized / scored portfolio. Integer columns fall back to
+# the next wider type if a value does not fit, or to float32 if values are fractional.
+PORTFOLIO_SCHEMA = {
+    'Patent_ID': 'id',
+    'Sector': 'category',
+    'ipc_class_symbol': 'category',
+    'Legal_Status': 'category',
+    'Event_Code': 'category',
+    'Year': np.int16,
+    'Remaining_Life': np.int8,
+    'Citations': np.int32,
+    'Backward_Citations': np.int16,
+    'Claims_Count': np.int16,
+    'Family_Size': np.int16,
+    'Family_Members': np.int16,
+    'Family_Authorities': np.int8,
+    'Family_Years_Active': np.float32,
+    'Family_Value_Share': np.float32,
+    'Tech_Diversity': np.float32,
+    'Citation_Influence': np.float32,
+    'Influence_Citations': np.float32,
+    'Tech_Score': np.float32,
+    'Legal_Score': np.float32,
+    'Market_Score': np.float32,
+    'Total_Score': np.float32,
+    'Estimated_Value': np.float32,
+    'Standard_Value': np.float32,
+    'AI_Value': np.float32,
+}
+SCORE_DTYPE = np.float32
+_INT_LADDER = [np.int8, np.int16, np.int32, np.int64]
+
+
+def _compact_int(series, dtype):
+    values = series.to_numpy()
+    if values.dtype.kind == 'f':
+        if np.isnan(values).any() or not np.array_equal(values, np.trunc(values)):
+            return series.astype(np.float32)
+    elif values.dtype.kind not in 'iu':
+        return series
+    if len(values) == 0:
+        return series.astype(dtype)
+    lo, hi = values.min(), values.max()
+    for candidate in _INT_LADDER[_INT_LADDER.index(dtype):]:
+        info = np.iinfo(candidate)
+        if info.min <= lo and hi <= info.max:
+            return series.astype(candidate)
+    return series
+
+
+def _intern_ids(series):
+    """Numeric IDs -> smallest fitting int; string IDs -> one shared dictionary (category)."""
+    if series.dtype.kind in 'iuf':
+        return _compact_int(series, np.int32)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    return series.astype('category')
+
+
+def apply_schema(df, schema=None):
+    """
+    Casts the columns named in `schema` (default PORTFOLIO_SCHEMA) to their compact dtype.
+    Columns missing from the frame are ignored; other columns are left untouched.
+    """
+    schema = PORTFOLIO_SCHEMA if schema is None else schema
+    updates = {}
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            continue
+        series = df[column]
+        if dtype == 'id':
+            updates[column] = _intern_ids(series)
+        elif dtype == 'category':
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                updates[column] = series.astype('category')
+        elif np.dtype(dtype).kind == 'i':
+            updates[column] = _compact_int(series, dtype)
+        elif series.dtype != dtype:
+            updates[column] = series.astype(dtype)
+    return df.assign(**updates) if updates else df
+
+
+def memory_report(before, after):
+    """
+    Per-column deep memory (bytes) and dtypes before/after apply_schema, with a TOTAL row.
+    Columns whose dtype did not change are measured once (deep sizing of strings is slow).
+    """
+    bytes_before = before.memory_usage(index=False, deep=True)
+    changed = [c for c in after.columns if c not in before.columns or after[c].dtype != before[c].dtype]
+    bytes_after = bytes_before.reindex(after.columns)
+    bytes_after[changed] = after[changed].memory_usage(index=False, deep=True)
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'bytes_before': bytes_before,
+        'dtype_after': after.dtypes.astype(str),
+        'bytes_after': bytes_after,
+    })
+    report.loc['TOTAL'] = ['', report['bytes_before'].sum(), '', report['bytes_after'].sum()]
+    report['saving'] = 1 - report['bytes_after'] / report['bytes_before']
+    return report
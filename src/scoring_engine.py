@@ -1,28 +1,176 @@
 import pandas as pd
 import numpy as np
+from src.tech_diversity import shannon_entropies, shannon_entropy
+
+# Tech_Score points per bit of citing-field entropy (src/tech_diversity.py), when available
+TECH_DIVERSITY_WEIGHT = 5.0
+# Market_Score from DOCDB family rollups (src/family_rollup.py), when available:
+# points per distinct filing authority, per log family member and per year since priority
+JURISDICTION_WEIGHT = 6.0
+FAMILY_MEMBER_WEIGHT = 8.0
+FAMILY_AGE_WEIGHT = 0.5
 
 class ScoringEngine:
+    def __init__(self, score_dtype=np.float64, citation_column='Citations'):
+        # float32 for compact (src/schema.py) portfolios; float64 keeps the original precision
+        self.score_dtype = np.dtype(score_dtype)
+        # 'Influence_Citations' (src/citation_influence.py) weighs each citation by its source
+        self.citation_column = citation_column
+
     def bulk_score(self, df):
         """
         Calculates Legal, Tech, and Market scores based on raw data.
+        Inputs are cast once to `score_dtype`; after that every operand is either an
+        array of that dtype or a Python scalar, which NumPy 2 (NEP 50) treats as weak,
+        so small int columns cannot overflow and float32 is never upcast to float64.
         """
-        # 1. Tech Score (Based on Forward Citations & Claims)
-        df['Tech_Score'] = (df['Citations'] * 2) + (df['Claims_Count'] * 0.5)
-        df['Tech_Score'] = np.clip(df['Tech_Score'], 0, 100) # Cap at 100
+        def feature(column):
+            return df[column].to_numpy(dtype=self.score_dtype)
+
+        # 1. Tech Score (Based on Forward Citations & Claims, plus citing-field diversity if known)
+        citations = self.citation_column if self.citation_column in df.columns else 'Citations'
+        tech = feature(citations) * 2 + feature('Claims_Count') * 0.5
+        if 'Tech_Diversity' in df.columns:
+            tech += feature('Tech_Diversity') * TECH_DIVERSITY_WEIGHT
+        tech = np.clip(tech, 0, 100) # Cap at 100
         
-        # 2. Legal Score (Based on Remaining Life & Backward Citations)
-        df['Legal_Score'] = (df['Remaining_Life'] * 4) + (df['Backward_Citations'] * 0.5)
-        df['Legal_Score'] = np.clip(df['Legal_Score'], 0, 100)
+        # 2. Legal Score (Based on Remaining Life & Backward Citations, scaled by tls231 status if known)
+        legal = feature('Remaining_Life') * 4 + feature('Backward_Citations') * 0.5
+        if 'Legal_Status' in df.columns:
+            legal *= legal_multipliers(df['Legal_Status']).astype(self.score_dtype)
+        legal = np.clip(legal, 0, 100)
         
-        # 3. Market Score (Based on Family Size)
-        df['Market_Score'] = df['Family_Size'] * 5
-        df['Market_Score'] = np.clip(df['Market_Score'], 0, 100)
+        # 3. Market Score (Jurisdiction breadth, family size and age if rolled up, else Family Size)
+        if 'Family_Authorities' in df.columns:
+            market = (feature('Family_Authorities') * JURISDICTION_WEIGHT
+                      + np.log1p(feature('Family_Members')) * FAMILY_MEMBER_WEIGHT
+                      + np.nan_to_num(feature('Family_Years_Active')) * FAMILY_AGE_WEIGHT)
+            market = np.clip(market, 0, 100)
+        else:
+            market = np.clip(feature('Family_Size') * 5, 0, 100)
         
         # 4. Total Composite Score
-        df['Total_Score'] = (df['Tech_Score'] + df['Legal_Score'] + df['Market_Score']) / 3
+        total = (tech + legal + market) / 3
         
         # 5. Estimated Monetary Value (The "Price Tag")
-        # Base value €50k + multipliers
-        df['Estimated_Value'] = 50000 * (1 + (df['Total_Score'] / 20))
+        # Base value €50k + multipliers. The market term is family-level: with several
+        # members of one family in the portfolio it is split by Family_Value_Share, so
+        # portfolio totals count each family's market value once.
+        valued_total = total
+        if 'Family_Value_Share' in df.columns:
+            valued_total = (tech + legal + market * feature('Family_Value_Share')) / 3
+        df['Tech_Score'] = tech
+        df['Legal_Score'] = legal
+        df['Market_Score'] = market
+        df['Total_Score'] = total
+        df['Estimated_Value'] = 50000 * (1 + (valued_total / 20))
         
-        return df
\ No newline at end of file
+        return df
+
+# Legal event -> multiplier (anything else counts as a plain active patent)
+LEGAL_EVENT_SCORES = {
+    'Revocation': 0.0,
+    'Lapse': 0.0,
+    'Withdrawal': 0.0,
+    'Opposition (Survived)': 1.5,
+    'Appeal (Survived)': 1.5,
+}
+DEFAULT_LEGAL_SCORE = 1.0
+
+
+def legal_multipliers(event_types):
+    """Categorical lookup: each distinct event type is scored once, rows are resolved with a take."""
+    codes, uniques = pd.factorize(pd.Series(event_types, copy=False))
+    table = np.array(
+        [LEGAL_EVENT_SCORES.get(u, DEFAULT_LEGAL_SCORE) for u in uniques] + [DEFAULT_LEGAL_SCORE],
+        dtype=np.float64
+    )
+    # code -1 (missing) hits the trailing default entry
+    return table[codes]
+
+
+def _pad_distributions(values):
+    """Object column of per-patent distributions -> zero-padded 2-D array (zeros do not change the entropy)."""
+    if all(np.ndim(v) == 0 for v in values):
+        return values.astype(np.float64)
+    rows = [np.ravel(np.asarray(v, dtype=np.float64)) for v in values]
+    lengths = np.array([len(r) for r in rows], dtype=np.int64)
+    padded = np.zeros((len(rows), lengths.max(initial=0)))
+    padded[np.arange(padded.shape[1]) < lengths[:, None]] = np.concatenate(rows) if rows else []
+    return padded
+
+
+class PatentValueEngine:
+    """
+    The 3D-PVE Core Scoring System.
+    Every scalar method has an array counterpart (plural name) that takes
+    NumPy arrays / Series and returns bit-identical results without a Python loop.
+    """
+    def __init__(self):
+        # Default State
+        self.alpha = 0.6
+        self.beta = 0.4
+        self.mode = "Heuristic (Default)"
+
+    def set_model_mode(self, mode, custom_weights=None):
+        """
+        Switch between Heuristic and Data-Driven modes.
+        Allows passing custom weights from the ML module in the future.
+        """
+        if mode == 'Heuristic':
+            self.alpha = 0.6
+            self.beta = 0.4
+            self.mode = "Heuristic"
+            
+        elif mode == 'ML_Optimized':
+            # In a real scenario, these could be loaded from a saved model file.
+            # For the prototype, we use the hypothetical 'optimized' values.
+            if custom_weights:
+                self.alpha = custom_weights['alpha']
+                self.beta = custom_weights['beta']
+            else:
+                self.alpha = 0.82 
+                self.beta = 0.15
+            self.mode = "ML_Optimized"
+
+    # --- SCALAR API (one patent at a time) ---
+    def calculate_legal_score(self, event_type):
+        return LEGAL_EVENT_SCORES.get(event_type, DEFAULT_LEGAL_SCORE)
+
+    def calculate_economic_score(self, family_size, years_active):
+        # USES CURRENT ALPHA/BETA
+        term1 = self.alpha * np.log(1 + family_size)
+        term2 = self.beta * years_active
+        return term1 + term2
+
+    def calculate_tech_score(self, diversity_factor):
+        # A distribution of citing fields (e.g. IPC shares) is reduced to its entropy in bits first
+        if np.ndim(diversity_factor) > 0:
+            diversity_factor = shannon_entropy(diversity_factor)
+        return 0.0 if diversity_factor == 0 else diversity_factor * 2.5
+
+    def get_composite_score(self, s_leg, s_eco, s_tech):
+        return s_leg * s_eco * s_tech
+
+    # --- ARRAY API (whole columns at once) ---
+    def calculate_legal_scores(self, event_types):
+        return legal_multipliers(event_types)
+
+    def calculate_economic_scores(self, family_sizes, years_active):
+        # Same operation order as the scalar path (log(1 + x), not log1p) for exact parity
+        family_sizes = np.asarray(family_sizes, dtype=np.float64)
+        years_active = np.asarray(years_active, dtype=np.float64)
+        return self.alpha * np.log(1 + family_sizes) + self.beta * years_active
+
+    def calculate_tech_scores(self, diversity_factors):
+        # One distribution per row (2-D array, or a column of per-patent sequences) -> entropy
+        diversity_factors = np.asarray(diversity_factors)
+        if diversity_factors.dtype == object:
+            diversity_factors = _pad_distributions(diversity_factors)
+        if diversity_factors.ndim > 1:
+            diversity_factors = shannon_entropies(diversity_factors)
+        diversity_factors = diversity_factors.astype(np.float64, copy=False)
+        return np.where(diversity_factors == 0, 0.0, diversity_factors * 2.5)
+
+    def get_composite_scores(self, s_leg, s_eco, s_tech):
+        return np.asarray(s_leg) * np.asarray(s_eco) * np.asarray(s_tech)
@@ -0,0 +1,107 @@
+import pandas as pd
+import numpy as np
+
+# --- IPC / CPC PREFIX RULES ---
+# Ordered exactly like the original dashboard mapping: the first rule whose
+# prefix matches wins, everything else falls through to DEFAULT_SECTOR.
+SECTOR_RULES = [
+    ('AI & Software', ('G06', 'G16', 'H04')),           # G06F, H04L, H04N, H04W, G06Q
+    ('Biotech', ('A61', 'C12')),                        # A61K, A61P, A61B, C12N
+    ('Semiconductors', ('H01L',)),                      # Deep Tech
+    ('Green Energy', ('Y02', 'H01M', 'F03')),           # H01M, Y02, F03D
+    ('Advanced Materials', ('C07', 'C08', 'B32')),      # Chem / Materials
+    ('Automotive', ('B60', 'G05D')),                    # Mobility
+]
+DEFAULT_SECTOR = 'Industrial Mfg'
+
+
+class SectorClassifier:
+    """
+    Precompiled prefix table over IPC/CPC symbols.
+    Classifies whole columns at once instead of calling a Python function per row.
+    """
+    def __init__(self, rules=None, default_sector=DEFAULT_SECTOR):
+        rules = SECTOR_RULES if rules is None else rules
+
+        # Sector order = rule priority; the default sector always comes last
+        self.sectors = [name for name, _ in rules if name != default_sector] + [default_sector]
+        self.default_code = len(self.sectors) - 1
+        self.dtype = pd.CategoricalDtype(self.sectors)
+
+        # Compile: prefix -> rule priority (lowest index wins on duplicates)
+        self._table = {}
+        for name, prefixes in rules:
+            code = self.sectors.index(name)
+            for prefix in prefixes:
+                prefix = prefix.upper()
+                self._table[prefix] = min(code, self._table.get(prefix, code))
+        self._lengths = sorted({len(p) for p in self._table})
+
+    def codes(self, symbols):
+        """
+        Returns an int8 array of sector codes (index into self.sectors), one per symbol.
+        Only the distinct symbols are inspected; rows are resolved with a single take.
+        """
+        symbols = pd.Series(symbols, copy=False)
+        row_codes, uniques = pd.factorize(symbols)
+
+        # Resolve each distinct symbol against every prefix length in one vectorized pass
+        keys = pd.Series(uniques, dtype=object).astype(str).str.upper()
+        unique_codes = np.full(len(keys), self.default_code, dtype=np.int8)
+        for length in self._lengths:
+            hit = keys.str[:length].map(self._table).to_numpy(dtype=float, na_value=np.nan)
+            matched = ~np.isnan(hit)
+            unique_codes[matched] = np.minimum(unique_codes[matched], hit[matched].astype(np.int8))
+
+        # Missing / empty symbols (factorize code -1) map to the default sector
+        lookup = np.append(unique_codes, np.int8(self.default_code))
+        return lookup[row_codes]
+
+    def classify(self, symbols):
+        """
+        Vectorized replacement for `series.apply(map_ipc_to_sector)`.
+        Returns a categorical Series aligned with the input.
+        """
+        index = symbols.index if isinstance(symbols, pd.Series) else None
+        sector = pd.Categorical.from_codes(self.codes(symbols), dtype=self.dtype)
+        return pd.Series(sector, index=index, name='Sector')
+
+    def classify_grouped(self, ids, symbols, weights=True):
+        """
+        Classifies applications that carry several IPC codes (one row per code,
+        as returned by the LEFT JOIN on tls209_appln_ipc).
+        Returns one row per id with the dominant `Sector` and, optionally,
+        the share of codes falling into each sector.
+        """
+        id_codes, id_uniques = pd.factorize(pd.Series(ids, copy=False))
+        sector_codes = self.codes(symbols).astype(np.int64)
+        n_ids, n_sectors = len(id_uniques), len(self.sectors)
+
+        # Rows with a missing id cannot be attributed to any application
+        valid = id_codes >= 0
+        counts = np.bincount(
+            id_codes[valid] * n_sectors + sector_codes[valid],
+            minlength=n_ids * n_sectors
+        ).reshape(n_ids, n_sectors)
+
+        # Dominant sector: highest count, ties resolved by rule priority
+        primary = counts.argmax(axis=1).astype(np.int8)
+        result = pd.DataFrame(
+            {'Sector': pd.Categorical.from_codes(primary, dtype=self.dtype)},
+            index=pd.Index(id_uniques, name=getattr(ids, 'name', None))
+        )
+
+        if weights:
+            shares = counts / counts.sum(axis=1, keepdims=True)
+            for code, name in enumerate(self.sectors):
+                result[f'Weight_{name}'] = shares[:, code]
+        return result
+
+
+# Shared default instance (the table is immutable once compiled)
+default_classifier = SectorClassifier()
+
+
+def classify_ipc(symbols):
+    """Convenience wrapper around the default classifier."""
+    return default_classifier.classify(symbols)
@@ -0,0 +1,173 @@
+import pandas as pd
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.snapshot_store import SNAPSHOT_SUFFIX, SnapshotReader, write_snapshot
+
+# Tables mirrored for offline mode; all of them are keyed (or foreign-keyed) on appln_id
+EXPORT_TABLES = ['tls201_appln', 'tls209_appln_ipc', 'tls211_pat_publn', 'tls231_inpadoc_legal_event']
+ROOT_TABLE = 'tls201_appln'
+KEY = 'appln_id'
+MANIFEST_NAME = 'export_manifest.json'
+
+
+class PatstatExporter:
+    """
+    Resumable, partitioned, parallel PATSTAT mirror.
+    Each table is split into half-open keyset ranges [lo, hi) on appln_id; ranges are
+    fetched concurrently by a bounded thread pool and written as one columnar part each.
+    Finished ranges are recorded in a manifest, so an interrupted run picks up where it stopped.
+    `client` is anything exposing sql_query(sql, use_legacy_sql=False)
+    (PatstatClient in production, LocalPatstatClient offline).
+    """
+    def __init__(self, client, out_dir, tables=None, range_size=1_000_000, max_workers=4,
+                 where=None, max_retries=2):
+        self.client = client
+        self.out_dir = out_dir
+        self.tables = list(tables or EXPORT_TABLES)
+        self.range_size = int(range_size)
+        self.max_workers = max_workers
+        self.where = where
+        self.max_retries = max_retries
+        self.manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self.manifest = None
+
+    # --- 1. PLANNING ---
+    def _key_bounds(self):
+        where = f"WHERE {self.where}" if self.where else ""
+        rows = self.client.sql_query(
+            f"SELECT MIN({KEY}) AS lo, MAX({KEY}) AS hi FROM {ROOT_TABLE} {where}", use_legacy_sql=False
+        )
+        row = pd.DataFrame(rows).iloc[0]
+        if pd.isna(row['lo']):
+            return None
+        return int(row['lo']), int(row['hi'])
+
+    def plan(self):
+        """Returns the full list of (table, lo, hi) tasks."""
+        bounds = self.manifest['key_bounds']
+        if bounds is None:
+            return []
+        lo, hi = bounds
+        ranges = [(start, min(start + self.range_size, hi + 1)) for start in range(lo, hi + 1, self.range_size)]
+        return [(table, start, stop) for table in self.tables for start, stop in ranges]
+
+    def _load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            # Resuming with a different layout would mix incompatible partitions
+            if manifest['range_size'] != self.range_size or manifest['where'] != self.where:
+                raise ValueError(
+                    f"{self.manifest_path} was created with range_size={manifest['range_size']}, "
+                    f"where={manifest['where']!r}; use a new output directory or the same settings."
+                )
+            for table in self.tables:
+                manifest['completed'].setdefault(table, {})
+            return manifest
+
+        return {
+            'version': 1,
+            'range_size': self.range_size,
+            'where': self.where,
+            'key_bounds': self._key_bounds(),
+            'completed': {table: {} for table in self.tables},
+        }
+
+    def _save_manifest(self):
+        """Atomic write: a crash never leaves a truncated manifest behind."""
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    # --- 2. FETCHING ---
+    def _range_sql(self, table, lo, hi):
+        sql = f"SELECT * FROM {table} WHERE {KEY} >= {lo} AND {KEY} < {hi}"
+        if self.where:
+            if table == ROOT_TABLE:
+                sql += f" AND ({self.where})"
+            else:
+                # Child tables carry no filing data: semi-join on the filtered root table
+                sql += f" AND {KEY} IN (SELECT {KEY} FROM {ROOT_TABLE} WHERE {KEY} >= {lo} AND {KEY} < {hi} AND ({self.where}))"
+        return sql
+
+    def _part_path(self, table, lo, hi):
+        return os.path.join(self.out_dir, table, f"part-{lo:012d}-{hi:012d}{SNAPSHOT_SUFFIX}")
+
+    def _export_range(self, table, lo, hi):
+        df = pd.DataFrame(self.client.sql_query(self._range_sql(table, lo, hi), use_legacy_sql=False))
+        path = self._part_path(table, lo, hi)
+        write_snapshot(df, path)
+        return len(df), path
+
+    # --- 3. ORCHESTRATION ---
+    def pending(self):
+        """Tasks not yet recorded as finished in the manifest."""
+        done = self.manifest['completed']
+        return [(t, lo, hi) for t, lo, hi in self.plan() if f"{lo}-{hi}" not in done[t]]
+
+    def run(self):
+        """
+        Exports every pending range. Failed ranges are retried up to max_retries times;
+        anything still failing is reported and left for the next (resumed) run.
+        """
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+        self._save_manifest()
+        for table in self.tables:
+            os.makedirs(os.path.join(self.out_dir, table), exist_ok=True)
+
+        tasks = self.pending()
+        print(f"📸 Exporting {len(tasks)} ranges ({len(self.plan()) - len(tasks)} already done) "
+              f"with {self.max_workers} workers...")
+        exported_rows, failures = 0, {}
+
+        for attempt in range(self.max_retries + 1):
+            if not tasks:
+                break
+            failed = []
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {pool.submit(self._export_range, *task): task for task in tasks}
+                for future in as_completed(futures):
+                    table, lo, hi = futures[future]
+                    try:
+                        n_rows, path = future.result()
+                    except Exception as e:
+                        failed.append((table, lo, hi))
+                        failures[(table, lo, hi)] = str(e)
+                        continue
+                    failures.pop((table, lo, hi), None)
+                    exported_rows += n_rows
+                    with self._lock:
+                        self.manifest['completed'][table][f"{lo}-{hi}"] = {
+                            'rows': n_rows, 'part': os.path.relpath(path, self.out_dir)
+                        }
+                        self._save_manifest()
+            tasks = failed
+            if tasks and attempt < self.max_retries:
+                print(f"⚠️ {len(tasks)} ranges failed, retrying (attempt {attempt + 2}/{self.max_retries + 1})...")
+
+        for (table, lo, hi), error in failures.items():
+            print(f"❌ {table} [{lo}, {hi}) failed: {error}")
+        if not failures:
+            print(f"✅ Export complete: {self.out_dir}")
+        return {'exported_rows': exported_rows, 'failed': sorted(failures), 'complete': not failures}
+
+
+def iter_exported_table(out_dir, table, columns=None, filters=None):
+    """Streams an exported table part by part (in key order)."""
+    with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+        completed = json.load(f)['completed'].get(table, {})
+    for key in sorted(completed, key=lambda k: int(k.split('-')[0])):
+        reader = SnapshotReader(os.path.join(out_dir, completed[key]['part']))
+        if reader.n_rows:
+            yield from reader.iter_row_groups(columns, filters)
+
+
+def read_exported_table(out_dir, table, columns=None, filters=None):
+    """Loads a whole exported table."""
+    parts = list(iter_exported_table(out_dir, table, columns, filters))
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
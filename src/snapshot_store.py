@@ -0,0 +1,283 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import shutil
+
+# --- FORMAT DESCRIPTION ---
+# A snapshot is a directory:
+#   manifest.json            -> schema, row-group layout and per-group statistics
+#   rg-00000/<col>.npy       -> numeric / bool / datetime column (memory-mappable)
+#   rg-00000/<col>.codes.npy -> string column: int32 codes into a per-group dictionary
+#   rg-00000/<col>.offsets.npy + <col>.data.npy -> UTF-8 dictionary (offsets + bytes)
+# Column files are named by position so any column label is safe on disk.
+FORMAT_NAME = '3dpve-columnar'
+FORMAT_VERSION = 1
+SNAPSHOT_SUFFIX = '.pvec'
+DEFAULT_ROW_GROUP_SIZE = 250_000
+MAX_DICTIONARY_STATS = 256  # string columns with more distinct values keep no value-set stats
+
+
+def _encode_strings(values):
+    """Encodes an array of python strings as (offsets, uint8 data)."""
+    encoded = [str(v).encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return offsets, data
+
+
+def _decode_strings(offsets, data):
+    """Inverse of _encode_strings; only touches the dictionary, never the rows."""
+    raw = np.asarray(data).tobytes()
+    offsets = np.asarray(offsets).tolist()
+    return [raw[a:b].decode('utf-8') for a, b in zip(offsets[:-1], offsets[1:])]
+
+
+def _column_kind(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return 'category'
+    if pd.api.types.is_bool_dtype(series.dtype) and not series.hasnans:
+        return 'bool'
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return 'datetime'
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return 'numeric'
+    return 'string'
+
+
+class SnapshotWriter:
+    """
+    Streams DataFrames into a columnar snapshot, one row group at a time.
+    The manifest is only published on close(), so readers never see a half-written file.
+    """
+    def __init__(self, path, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        self.path = path
+        self.row_group_size = row_group_size
+        self._tmp_path = f"{path}.tmp"
+        self._columns = None
+        self._row_groups = []
+
+        if os.path.exists(self._tmp_path):
+            shutil.rmtree(self._tmp_path)
+        os.makedirs(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def abort(self):
+        """Discards everything written so far; the previous snapshot (if any) is kept."""
+        shutil.rmtree(self._tmp_path, ignore_errors=True)
+
+    def write(self, df):
+        """Appends a DataFrame, splitting it into row groups of at most row_group_size."""
+        if self._columns is None:
+            self._columns = [{'name': str(c), 'kind': _column_kind(df[c])} for c in df.columns]
+        elif [str(c) for c in df.columns] != [c['name'] for c in self._columns]:
+            raise ValueError("Snapshot batches must share the same columns in the same order.")
+
+        for start in range(0, len(df), self.row_group_size):
+            self._write_row_group(df.iloc[start:start + self.row_group_size])
+
+    def _write_row_group(self, df):
+        rg_name = f"rg-{len(self._row_groups):05d}"
+        rg_dir = os.path.join(self._tmp_path, rg_name)
+        os.makedirs(rg_dir)
+        stats, dtypes = {}, {}
+
+        for i, spec in enumerate(self._columns):
+            series = df.iloc[:, i]
+            base = os.path.join(rg_dir, str(i))
+
+            if spec['kind'] in ('string', 'category'):
+                if spec['kind'] == 'category':
+                    codes = series.cat.codes.to_numpy(dtype=np.int32)
+                    dictionary = series.cat.categories
+                else:
+                    codes, dictionary = pd.factorize(series)
+                    codes = codes.astype(np.int32)
+                offsets, data = _encode_strings(dictionary)
+                np.save(f"{base}.codes.npy", codes)
+                np.save(f"{base}.offsets.npy", offsets)
+                np.save(f"{base}.data.npy", data)
+                if len(dictionary) <= MAX_DICTIONARY_STATS:
+                    present = np.unique(codes[codes >= 0])
+                    stats[spec['name']] = {'values': [str(dictionary[c]) for c in present]}
+                dtypes[spec['name']] = 'category' if spec['kind'] == 'category' else 'object'
+
+            elif spec['kind'] == 'datetime':
+                values = series.to_numpy(dtype='datetime64[ns]')
+                np.save(f"{base}.npy", values.view(np.int64))
+                dtypes[spec['name']] = 'datetime64[ns]'
+
+            else:
+                values = series.to_numpy()
+                if values.dtype == object:
+                    values = series.to_numpy(dtype=float, na_value=np.nan)
+                np.save(f"{base}.npy", values)
+                dtypes[spec['name']] = values.dtype.str
+                if spec['kind'] == 'numeric' and len(values) and not np.isnan(values.astype(float)).all():
+                    stats[spec['name']] = {'min': float(np.nanmin(values)), 'max': float(np.nanmax(values))}
+
+        self._row_groups.append({'name': rg_name, 'n_rows': len(df), 'dtypes': dtypes, 'stats': stats})
+
+    def close(self):
+        manifest = {
+            'format': FORMAT_NAME,
+            'version': FORMAT_VERSION,
+            'n_rows': sum(rg['n_rows'] for rg in self._row_groups),
+            'columns': self._columns or [],
+            'row_groups': self._row_groups,
+        }
+        with open(os.path.join(self._tmp_path, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f)
+
+        # Publish atomically-ish: swap the finished directory into place
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        os.replace(self._tmp_path, self.path)
+
+
+def write_snapshot(df, path, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """Writes a whole DataFrame as a columnar snapshot."""
+    with SnapshotWriter(path, row_group_size=row_group_size) as writer:
+        writer.write(df)
+    return path
+
+
+def convert_csv(csv_path, path, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """Converts a legacy CSV snapshot without loading it into memory in one piece."""
+    with SnapshotWriter(path, row_group_size=row_group_size) as writer:
+        for chunk in pd.read_csv(csv_path, chunksize=row_group_size):
+            writer.write(chunk)
+    return path
+
+
+class SnapshotReader:
+    """
+    Reads a columnar snapshot with column projection and row-group skipping.
+    Column files are memory-mapped, so only projected columns of surviving
+    row groups are ever paged in.
+    """
+    def __init__(self, path, mmap=True):
+        self.path = path
+        self.mmap_mode = 'r' if mmap else None
+        with open(os.path.join(path, 'manifest.json')) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format') != FORMAT_NAME:
+            raise ValueError(f"{path} is not a {FORMAT_NAME} snapshot.")
+        self._index = {c['name']: i for i, c in enumerate(self.manifest['columns'])}
+
+    @property
+    def columns(self):
+        return [c['name'] for c in self.manifest['columns']]
+
+    @property
+    def n_rows(self):
+        return self.manifest['n_rows']
+
+    def _load(self, rg, name, suffix='.npy'):
+        file_path = os.path.join(self.path, rg['name'], f"{self._index[name]}{suffix}")
+        return np.load(file_path, mmap_mode=self.mmap_mode)
+
+    @staticmethod
+    def _may_match(rg, filters):
+        """Uses the row-group statistics to prove that no row can match."""
+        for name, condition in filters.items():
+            stats = rg['stats'].get(name)
+            if stats is None:
+                continue
+            if isinstance(condition, tuple):
+                # Dictionary-encoded columns only keep their value set: no range pruning
+                if 'min' not in stats:
+                    continue
+                lo, hi = condition
+                if (lo is not None and stats['max'] < lo) or (hi is not None and stats['min'] > hi):
+                    return False
+            elif 'values' in stats and not set(map(str, condition)) & set(stats['values']):
+                return False
+        return True
+
+    def _read_column(self, rg, name):
+        dtype = rg['dtypes'][name]
+        if dtype in ('object', 'category'):
+            dictionary = _decode_strings(self._load(rg, name, '.offsets.npy'), self._load(rg, name, '.data.npy'))
+            codes = np.asarray(self._load(rg, name, '.codes.npy'))
+            if dtype == 'category':
+                return pd.Categorical.from_codes(codes, categories=dictionary)
+            values = np.array(dictionary + [None], dtype=object)
+            return values[codes]
+        # No copy here; iter_row_groups also builds its frame with copy=False, so numeric
+        # columns stay backed by the memory map and pages are read on demand
+        values = np.asarray(self._load(rg, name))
+        if dtype == 'datetime64[ns]':
+            return values.view('datetime64[ns]')
+        return values
+
+    def iter_row_groups(self, columns=None, filters=None):
+        """Yields one DataFrame per surviving row group (bounded memory)."""
+        columns = self.columns if columns is None else list(columns)
+        missing = [c for c in columns if c not in self._index]
+        if missing:
+            raise KeyError(f"Columns not in snapshot: {missing}")
+        filters = filters or {}
+        unknown = [name for name in filters if name not in self._index]
+        if unknown:
+            raise ValueError(f"Filter columns not in snapshot: {unknown}")
+
+        for rg in self.manifest['row_groups']:
+            if not self._may_match(rg, filters):
+                continue
+            # copy=False: pandas would otherwise copy every mapped column into memory
+            df = pd.DataFrame({name: self._read_column(rg, name) for name in columns}, copy=False)
+
+            # Row-level filtering inside groups that could not be skipped
+            if filters:
+                mask = np.ones(len(df), dtype=bool)
+                for name, condition in filters.items():
+                    values = df[name] if name in df.columns else pd.Series(self._read_column(rg, name))
+                    if isinstance(condition, tuple):
+                        if isinstance(values.dtype, pd.CategoricalDtype):
+                            # Unordered categories cannot be range-compared; compare the labels
+                            values = values.astype(object)
+                        lo, hi = condition
+                        if lo is not None:
+                            mask &= (values >= lo).to_numpy()
+                        if hi is not None:
+                            mask &= (values <= hi).to_numpy()
+                    else:
+                        mask &= values.astype(object).isin(list(condition)).to_numpy()
+                df = df[mask]
+            yield df
+
+    def read(self, columns=None, filters=None):
+        """
+        Returns a DataFrame with the projected columns.
+        filters: {column: (min, max)} for inclusive ranges (None = open end)
+                 or {column: [values]} for membership, e.g. {'Sector': ['Biotech']}.
+        """
+        parts = list(self.iter_row_groups(columns, filters))
+        if not parts:
+            columns = self.columns if columns is None else list(columns)
+            return pd.DataFrame(columns=columns)
+        if len(parts) == 1:
+            return parts[0].reset_index(drop=True)
+
+        # Categoricals from different groups may carry different dictionaries
+        df = pd.concat(parts, ignore_index=True)
+        for name in df.columns:
+            if isinstance(parts[0][name].dtype, pd.CategoricalDtype) and not isinstance(df[name].dtype, pd.CategoricalDtype):
+                df[name] = pd.api.types.union_categoricals([p[name].array for p in parts])
+        return df
+
+
+def read_snapshot(path, columns=None, filters=None, mmap=True):
+    """Convenience wrapper around SnapshotReader.read."""
+    return SnapshotReader(path, mmap=mmap).read(columns=columns, filters=filters)
@@ -1,6 +1,14 @@
 import pandas as pd
+import numpy as np
+import hashlib
 import os
+import pickle
+import re
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # --- PATH CONFIGURATION ---
 # Ensures the 'src' directory is in the path so mock_data can be imported
@@ -8,30 +16,222 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.append(current_dir)
 
+try:
+    from src.snapshot_store import DEFAULT_ROW_GROUP_SIZE, SNAPSHOT_SUFFIX, SnapshotReader, read_snapshot
+    from src.sector_classifier import DEFAULT_SECTOR, default_classifier
+    from src.fanout import collapse_fanout
+except ImportError:
+    # Fallback when 'src' itself is the working directory
+    from snapshot_store import DEFAULT_ROW_GROUP_SIZE, SNAPSHOT_SUFFIX, SnapshotReader, read_snapshot
+    from sector_classifier import DEFAULT_SECTOR, default_classifier
+    from fanout import collapse_fanout
+
+# Child tables fetched next to tls201_appln in per-table mode: table -> projected columns
+PORTFOLIO_TABLES = {
+    'tls211_pat_publn': ['publn_claims'],
+    'tls209_appln_ipc': ['ipc_class_symbol'],
+    'tls203_appln_abstr': ['appln_abstract'],
+}
+
+
+def _rechunk(frames, chunk_size):
+    """Re-slices an iterator of DataFrames into chunks of exactly `chunk_size` rows (last one shorter)."""
+    buffer, buffered = [], 0
+    for frame in frames:
+        start = 0
+        while start < len(frame):
+            take = min(chunk_size - buffered, len(frame) - start)
+            buffer.append(frame.iloc[start:start + take])
+            buffered += take
+            start += take
+            if buffered == chunk_size:
+                yield pd.concat(buffer, ignore_index=True) if len(buffer) > 1 else buffer[0].reset_index(drop=True)
+                buffer, buffered = [], 0
+    if buffer:
+        yield pd.concat(buffer, ignore_index=True) if len(buffer) > 1 else buffer[0].reset_index(drop=True)
+
+def _bounded_map(pool, fn, items, window):
+    """pool.map with at most `window` calls submitted ahead of the consumer (results in order)."""
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def _sql_literal(value):
+    """Keyset value as SQL: numbers verbatim, anything else a quoted string escaped per Standard SQL."""
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_)):
+        return str(value)
+    text = str(value).replace('\\', '\\\\').replace("'", "\\'")
+    return f"'{text}'"
+
+def _remove_if_exists(path):
+    """os.remove that treats an already deleted file (e.g. by another worker process) as done."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class QueryCache:
+    """
+    Disk-backed cache of Live query results, shared across reruns and restarts.
+    Keyed on normalized SQL text + client environment; entries expire after `ttl`
+    seconds and the least recently used ones are evicted beyond `max_bytes`.
+    """
+    _LITERALS = re.compile(r"('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`)")
+
+    def __init__(self, cache_dir=None, ttl=24 * 3600, max_bytes=512 * 1024 ** 2):
+        root = os.path.abspath(os.path.join(current_dir, '..'))
+        self.cache_dir = cache_dir or os.path.join(root, 'data', 'query_cache')
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def normalize_sql(cls, sql):
+        """Collapses whitespace outside string literals and drops a trailing ';'."""
+        parts = cls._LITERALS.split(sql.strip().rstrip(';'))
+        # Even indices are SQL text, odd indices are quoted literals (kept verbatim)
+        parts = [re.sub(r'\s+', ' ', p) if i % 2 == 0 else p for i, p in enumerate(parts)]
+        return ''.join(parts).strip()
+
+    def _path(self, sql, env):
+        key = hashlib.sha256(f"{env}\n{self.normalize_sql(sql)}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, sql, env):
+        """Returns the cached DataFrame, or None on a miss / expired entry."""
+        path = self._path(sql, env)
+        with self._lock:
+            try:
+                with open(path, 'rb') as f:
+                    created, df = pickle.load(f)
+            except Exception:
+                # Missing, truncated or written by an incompatible pandas/numpy: a miss either way
+                self.misses += 1
+                return None
+
+            if time.time() - created > self.ttl:
+                _remove_if_exists(path)
+                self.misses += 1
+                return None
+
+            # mtime doubles as the LRU clock; another process may have evicted it meanwhile
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+            self.hits += 1
+            return df
+
+    def put(self, sql, env, df):
+        path = self._path(sql, env)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((time.time(), df), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pkl'):
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    continue  # evicted by another worker process
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            _remove_if_exists(os.path.join(self.cache_dir, name))
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.pkl'):
+                    _remove_if_exists(os.path.join(self.cache_dir, name))
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+_shared_cache = None
+
+def shared_query_cache():
+    """Process-wide cache instance, so hit/miss counters accumulate across DataManagers."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = QueryCache()
+    return _shared_cache
+
+_shared_managers = {}
+_shared_managers_lock = threading.Lock()
+
+def shared_data_manager(mode):
+    """
+    Process-wide DataManager per mode, so pipeline stages share one Live client instead
+    of connecting once per stage. A Live connection that fell back to Mock is not kept.
+    """
+    with _shared_managers_lock:
+        manager = _shared_managers.get(mode)
+    if manager is None:
+        manager = DataManager(mode)
+        if manager.mode == mode:
+            with _shared_managers_lock:
+                manager = _shared_managers.setdefault(mode, manager)
+    return manager
+
 class DataManager:
     """
     Handles data orchestration between the Live EPO Data Lake, 
-    Static CSV snapshots (Real Data), and Synthetic Mock data.
+    Static columnar/CSV snapshots (Real Data), and Synthetic Mock data.
     """
-    def __init__(self, mode="🟢 Mock Data (Safe)"):
+    def __init__(self, mode="🟢 Mock Data (Safe)", cache=None, use_cache=True, client=None):
         self.mode = mode
         self.client = None
+        self.env = 'PROD'
+        self.cache = None
         
         # Initialize connection ONLY if Live/Dynamic Mode is selected
         if "Live" in self.mode or "Dynamic" in self.mode:
+            if use_cache:
+                self.cache = cache if cache is not None else shared_query_cache()
+            if client is not None:
+                # Any object with sql_query(), e.g. LocalPatstatClient over synthetic tables
+                self.client = client
+                self.env = getattr(client, 'env', self.env)
+                return
             try:
                 from epo.tipdata.patstat import PatstatClient
                 # 'PROD' environment validated for multi-table JOIN access
-                self.client = PatstatClient(env='PROD')
+                self.client = PatstatClient(env=self.env)
                 print(f"📡 {self.mode}: Connected to EPO PROD Data Lake")
             except Exception as e:
                 print(f"⚠️ Live Connection Failed: {e}. Falling back to Mock.")
                 self.mode = "🟢 Mock Data (Safe)"
 
-    def get_data(self, query=None):
+    def get_data(self, query=None, columns=None, filters=None):
         """
         Retrieves data based on selected mode. 
         Maintains Standard SQL dialect for BigQuery-backed tables.
+        `columns` / `filters` are pushed down into the Static snapshot reader.
         """
         
         # 1. DYNAMIC / LIVE MODE (Real-time SQL)
@@ -40,43 +240,384 @@ class DataManager:
                 # Use a simple default if no query is passed
                 sql = query.strip() if query else "SELECT * FROM tls201_appln LIMIT 100"
                 
-                # Standard SQL is strictly required for JOINs in this environment
-                results = self.client.sql_query(sql, use_legacy_sql=False)
-                df = pd.DataFrame(results)
+                df = self._run_query(sql)
                 
                 if df.empty:
                     print("⚠️ Query returned 0 results. Checking Static Fallback...")
-                    return self._get_static_data()
+                    return self._get_static_data(columns, filters)
                 return df
                 
             except Exception as e:
                 print(f"❌ SQL Execution Error: {e}")
-                return self._get_static_data()
+                return self._get_static_data(columns, filters)
 
         # 2. STATIC MODE (Gold Standard Snapshot)
         elif "Static" in self.mode:
-            return self._get_static_data()
+            return self._get_static_data(columns, filters)
 
         # 3. MOCK MODE (Synthetic Data)
         else:
             return self._get_mock_data()
 
-    def _get_static_data(self):
+    def get_portfolio(self, n, min_year=2018, max_workers=4, batch_size=10_000):
+        """
+        Per-table alternative to the single four-way JOIN.
+        Live: selects `n` applications from tls201_appln, then fetches each child table's
+        projected columns for the same appln_id set concurrently and hash-joins them locally,
+        with IPC codes aggregated per application (abstracts cross the wire once, not once per IPC row).
+        Other modes: identical to get_data().
+        """
+        if not (("Live" in self.mode or "Dynamic" in self.mode) and self.client):
+            return self.get_data()
+
+        try:
+            # 1. Driving set (INNER JOIN on tls211 kept as a semi-join)
+            root = self._run_query(f"""
+                SELECT appln_id, appln_filing_year, docdb_family_size, docdb_family_id
+                FROM tls201_appln
+                WHERE appln_filing_year > {min_year}
+                  AND appln_id IN (SELECT appln_id FROM tls211_pat_publn)
+                LIMIT {n}
+            """)
+            if root.empty:
+                print("⚠️ Query returned 0 results. Checking Static Fallback...")
+                return self._get_static_data()
+
+            # 2. Concurrent projected fetches, batched on sorted ids (stable SQL -> cache hits)
+            ids = np.sort(root['appln_id'].unique())
+            tasks = [
+                (table, columns, ids[start:start + batch_size])
+                for table, columns in PORTFOLIO_TABLES.items()
+                for start in range(0, len(ids), batch_size)
+            ]
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                parts = list(pool.map(lambda task: self._fetch_projection(*task), tasks))
+
+            tables = {}
+            for (table, columns, _), part in zip(tasks, parts):
+                tables.setdefault(table, []).append(part)
+            tables = {
+                table: pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['appln_id'] + PORTFOLIO_TABLES[table])
+                for table, frames in tables.items()
+            }
+
+            # 3. Local hash joins on appln_id, one row per application
+            claims = tables['tls211_pat_publn'].groupby('appln_id')['publn_claims'].max()
+            abstracts = tables['tls203_appln_abstr'].drop_duplicates('appln_id').set_index('appln_id')['appln_abstract']
+            ipc = self._aggregate_ipc(tables['tls209_appln_ipc'])
+
+            df = root.join(claims, on='appln_id').join(ipc, on='appln_id').join(abstracts, on='appln_id')
+            df['Sector'] = df['Sector'].fillna(DEFAULT_SECTOR)
+            df['IPC_Count'] = df['IPC_Count'].fillna(0).astype(int)
+            return df
+
+        except Exception as e:
+            print(f"❌ SQL Execution Error: {e}")
+            return self._get_static_data()
+
+    def _fetch_projection(self, table, columns, ids):
+        """SELECT appln_id + projected columns of one table for a batch of ids."""
+        id_list = ', '.join(str(int(i)) for i in ids)
+        sql = f"SELECT appln_id, {', '.join(columns)} FROM {table} WHERE appln_id IN ({id_list})"
+        df = self._run_query(sql)
+        if df.empty:
+            return pd.DataFrame(columns=['appln_id'] + columns)
+        return df
+
+    def get_citations(self, appln_ids, max_workers=4, batch_size=10_000):
+        """
+        Live: tls212 citations touching `appln_ids` in either direction, resolved to
+        application level through tls211, plus tls201 year/family for every node.
+        Returns (edges with 'citing'/'cited', nodes indexed by appln_id with 'year'/'family'),
+        i.e. the input of CitationIndex.from_edges. Returns None outside Live mode or on error.
+        """
+        if not (("Live" in self.mode or "Dynamic" in self.mode) and self.client):
+            return None
+
+        try:
+            ids = np.sort(pd.unique(np.asarray(appln_ids, dtype=np.int64)))
+            batches = [ids[start:start + batch_size] for start in range(0, len(ids), batch_size)]
+            # Forward (our applications cited) and backward (our applications citing) per batch
+            tasks = [(side, batch) for batch in batches for side in ('cited', 'citing')]
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                parts = list(pool.map(lambda task: self._fetch_citations(*task), tasks))
+            edges = pd.concat(parts, ignore_index=True).drop_duplicates()
+
+            node_ids = np.unique(np.concatenate([ids, edges['citing'].to_numpy(dtype=np.int64),
+                                                 edges['cited'].to_numpy(dtype=np.int64)]))
+            columns = ['appln_filing_year', 'docdb_family_id']
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                parts = list(pool.map(
+                    lambda batch: self._fetch_projection('tls201_appln', columns, batch),
+                    [node_ids[start:start + batch_size] for start in range(0, len(node_ids), batch_size)],
+                ))
+            nodes = pd.concat(parts, ignore_index=True).drop_duplicates('appln_id').set_index('appln_id')
+            nodes = nodes.rename(columns={'appln_filing_year': 'year', 'docdb_family_id': 'family'})
+            return edges, nodes
+
+        except Exception as e:
+            print(f"❌ Citation Query Error: {e}")
+            return None
+
+    def get_ipc_codes(self, appln_ids, max_workers=4, batch_size=10_000):
+        """
+        Live: tls209 rows (appln_id, ipc_class_symbol) for `appln_ids`, e.g. the citing
+        applications of a CitationIndex. Returns None outside Live mode or on error.
+        """
+        if not (("Live" in self.mode or "Dynamic" in self.mode) and self.client):
+            return None
+
+        try:
+            ids = np.sort(pd.unique(np.asarray(appln_ids, dtype=np.int64)))
+            batches = [ids[start:start + batch_size] for start in range(0, len(ids), batch_size)]
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                parts = list(pool.map(
+                    lambda batch: self._fetch_projection('tls209_appln_ipc', ['ipc_class_symbol'], batch), batches
+                ))
+            if not parts:
+                return pd.DataFrame(columns=['appln_id', 'ipc_class_symbol'])
+            return pd.concat(parts, ignore_index=True)
+
+        except Exception as e:
+            print(f"❌ IPC Query Error: {e}")
+            return None
+
+    def iter_legal_events(self, appln_ids, max_workers=4, batch_size=10_000,
+                          columns=('event_code', 'event_publn_date')):
+        """
+        Live: tls231_inpadoc_legal_event rows for `appln_ids`, yielded one batch of
+        applications at a time (input for LegalStateEngine.fit_chunks). Yields nothing
+        outside Live mode. A failing batch raises: skipping it would silently leave its
+        applications 'Pending'. At most 2 * max_workers batches are in flight.
+        """
+        if not (("Live" in self.mode or "Dynamic" in self.mode) and self.client):
+            return
+
+        ids = np.sort(pd.unique(np.asarray(appln_ids, dtype=np.int64)))
+        batches = (ids[start:start + batch_size] for start in range(0, len(ids), batch_size))
+
+        def fetch(batch):
+            return self._fetch_projection('tls231_inpadoc_legal_event', list(columns), batch)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            yield from _bounded_map(pool, fetch, batches, 2 * max_workers)
+
+    def iter_family_members(self, family_ids, max_workers=4, batch_size=10_000,
+                            columns=('appln_id', 'appln_auth', 'earliest_filing_date')):
+        """
+        Live: every tls201_appln member of the DOCDB families `family_ids` (not only the
+        portfolio's own applications), yielded one batch of families at a time
+        (input for FamilyRollupEngine.fit_chunks). Yields nothing outside Live mode.
+        A failing batch raises (its families would otherwise shrink to the portfolio's
+        own members); at most 2 * max_workers batches are in flight.
+        """
+        if not (("Live" in self.mode or "Dynamic" in self.mode) and self.client):
+            return
+
+        ids = pd.to_numeric(pd.Series(np.asarray(family_ids)), errors='coerce').dropna()
+        ids = np.sort(pd.unique(ids.to_numpy(dtype=np.int64)))
+        batches = (ids[start:start + batch_size] for start in range(0, len(ids), batch_size))
+
+        def fetch(batch):
+            id_list = ', '.join(str(int(i)) for i in batch)
+            return self._run_query(
+                f"SELECT docdb_family_id, {', '.join(columns)} FROM tls201_appln "
+                f"WHERE docdb_family_id IN ({id_list})"
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            yield from _bounded_map(pool, fetch, batches, 2 * max_workers)
+
+    def _fetch_citations(self, side, ids):
+        """Application-level tls212 edges whose `side` ('citing' or 'cited') is in `ids`."""
+        id_list = ', '.join(str(int(i)) for i in ids)
+        sql = f"""
+            SELECT citing.appln_id AS citing, cited.appln_id AS cited
+            FROM tls212_citation c
+            JOIN tls211_pat_publn citing ON citing.pat_publn_id = c.pat_publn_id
+            JOIN tls211_pat_publn cited ON cited.pat_publn_id = c.cited_pat_publn_id
+            WHERE {side}.appln_id IN ({id_list})
+        """
+        df = self._run_query(sql)
+        if df.empty:
+            return pd.DataFrame({'citing': pd.Series(dtype=np.int64), 'cited': pd.Series(dtype=np.int64)})
+        return df
+
+    @staticmethod
+    def _aggregate_ipc(ipc_df):
+        """
+        Collapses tls209 rows (one per IPC code) into one row per application:
+        first symbol, code count, the code list and the dominant sector over all codes.
+        Null symbols (LEFT JOIN rows without a code) are skipped: they count as no code,
+        never become the first symbol and do not vote for the default sector.
+        """
+        collapsed = collapse_fanout(ipc_df[['appln_id', 'ipc_class_symbol']], key='appln_id')
+        return collapsed.set_index('appln_id')
+
+    def _run_query(self, sql):
+        """Executes a Live query through the persistent result cache."""
+        if self.cache is not None:
+            df = self.cache.get(sql, self.env)
+            if df is not None:
+                return df
+
+        # Standard SQL is strictly required for JOINs in this environment
+        results = self.client.sql_query(sql, use_legacy_sql=False)
+        df = pd.DataFrame(results)
+
+        # Empty results are not cached: they usually mean a transient upstream issue
+        if self.cache is not None and not df.empty:
+            self.cache.put(sql, self.env, df)
+        return df
+
+    def _get_static_data(self, columns=None, filters=None):
         """
         Loads the 'Gold Standard' snapshot. 
         This is real data saved from a previous Dynamic session.
+        Prefers the columnar snapshot (projection + row-group skipping, memory-mapped);
+        the legacy CSV is only parsed when no columnar snapshot exists.
         """
-        # Look for the snapshot in /data relative to project root
-        root = os.path.abspath(os.path.join(current_dir, '..'))
-        file_path = os.path.join(root, 'data', 'static_portfolio.csv')
+        snapshot_path, file_path = self._static_paths()
         
-        if os.path.exists(file_path):
+        if os.path.exists(os.path.join(snapshot_path, 'manifest.json')):
+            print(f"📁 Loading Static Snapshot: {snapshot_path}")
+            return read_snapshot(snapshot_path, columns=columns, filters=filters)
+        elif os.path.exists(file_path):
             print(f"📁 Loading Static Snapshot: {file_path}")
-            return pd.read_csv(file_path)
+            df = pd.read_csv(file_path, usecols=self._csv_usecols(columns, filters))
+            return self._apply_filters(df, filters, columns)
         else:
-            print("⚠️ Static snapshot 'static_portfolio.csv' not found. Falling back to Mock.")
+            print("⚠️ Static snapshot 'static_portfolio' not found. Falling back to Mock.")
             return self._get_mock_data()
 
+    @staticmethod
+    def _static_paths():
+        """Look for the snapshot in /data relative to project root."""
+        root = os.path.abspath(os.path.join(current_dir, '..'))
+        snapshot_path = os.path.join(root, 'data', 'static_portfolio' + SNAPSHOT_SUFFIX)
+        file_path = os.path.join(root, 'data', 'static_portfolio.csv')
+        return snapshot_path, file_path
+
+    def iter_data(self, chunk_size=100_000, query=None, key='appln_id', columns=None, filters=None):
+        """
+        Streaming counterpart of get_data(): yields DataFrames of at most `chunk_size` rows,
+        so memory depends on the chunk size rather than on the dataset size.
+        Live queries are paged with keyset pagination on `key`.
+        """
+        # 1. DYNAMIC / LIVE MODE (Keyset-paged SQL)
+        if ("Live" in self.mode or "Dynamic" in self.mode) and self.client:
+            yielded = False
+            try:
+                for chunk in self._iter_live_data(chunk_size, query, key):
+                    yielded = True
+                    yield chunk
+            except Exception as e:
+                # Falling back halfway through would duplicate rows already streamed
+                if yielded:
+                    raise
+                print(f"❌ SQL Execution Error: {e}")
+            if yielded:
+                return
+            print("⚠️ Live stream returned 0 results. Checking Static Fallback...")
+            yield from _rechunk(self._iter_static_data(columns, filters), chunk_size)
+
+        # 2. STATIC MODE (Row groups of the Gold Standard Snapshot)
+        elif "Static" in self.mode:
+            yield from _rechunk(self._iter_static_data(columns, filters), chunk_size)
+
+        # 3. MOCK MODE (Synthetic Data)
+        else:
+            yield from _rechunk([self._get_mock_data()], chunk_size)
+
+    def _iter_live_data(self, chunk_size, query, key):
+        """
+        Pages `query` by `key` (WHERE key > last ORDER BY key LIMIT chunk_size).
+        Rows sharing the last key of a full page are re-fetched with the next page,
+        so JOIN fan-out rows of one application are never split across chunks,
+        unless that key alone has more rows than a page (see _iter_live_key).
+        """
+        base = query.strip().rstrip(';') if query else "SELECT * FROM tls201_appln"
+        last_key = None
+        while True:
+            where = f"WHERE q.{key} > {_sql_literal(last_key)}" if last_key is not None else ""
+            sql = f"SELECT * FROM ({base}) AS q {where} ORDER BY q.{key} LIMIT {chunk_size}"
+            df = self._run_query(sql)
+            if df.empty:
+                return
+
+            full_page = len(df) == chunk_size
+            if full_page:
+                tail_key = df[key].iloc[-1]
+                complete = df[df[key] != tail_key]
+                if complete.empty:
+                    # A single key fills the page: stream all of its rows, then move past it
+                    yield from self._iter_live_key(base, key, tail_key, df.columns, chunk_size)
+                    last_key = tail_key
+                    continue
+                df = complete
+            yield df
+            if not full_page:
+                return
+            last_key = df[key].iloc[-1]
+
+    def _iter_live_key(self, base, key, value, columns, chunk_size):
+        """
+        Pages the rows of one oversized `key` value with LIMIT / OFFSET, ordered on every
+        column: a total order up to identical rows, so no row is skipped or repeated.
+        """
+        where = f"WHERE q.{key} = {_sql_literal(value)}"
+        order = ', '.join(f"q.{column}" for column in columns)
+        offset = 0
+        while True:
+            sql = f"SELECT * FROM ({base}) AS q {where} ORDER BY {order} LIMIT {chunk_size} OFFSET {offset}"
+            df = self._run_query(sql)
+            if df.empty:
+                return
+            yield df
+            if len(df) < chunk_size:
+                return
+            offset += chunk_size
+
+    def _iter_static_data(self, columns=None, filters=None):
+        """Row-group (or CSV chunk) iterator over the static snapshot."""
+        snapshot_path, file_path = self._static_paths()
+
+        if os.path.exists(os.path.join(snapshot_path, 'manifest.json')):
+            print(f"📁 Streaming Static Snapshot: {snapshot_path}")
+            yield from SnapshotReader(snapshot_path).iter_row_groups(columns, filters)
+        elif os.path.exists(file_path):
+            print(f"📁 Streaming Static Snapshot: {file_path}")
+            usecols = self._csv_usecols(columns, filters)
+            for chunk in pd.read_csv(file_path, usecols=usecols, chunksize=DEFAULT_ROW_GROUP_SIZE):
+                yield self._apply_filters(chunk, filters, columns)
+        else:
+            print("⚠️ Static snapshot 'static_portfolio' not found. Falling back to Mock.")
+            yield self._get_mock_data()
+
+    @staticmethod
+    def _csv_usecols(columns, filters):
+        """Projected columns plus the filtered ones (the snapshot reader also filters on unprojected columns)."""
+        if columns is None:
+            return None
+        return list(columns) + [name for name in (filters or {}) if name not in columns]
+
+    @staticmethod
+    def _apply_filters(df, filters, columns=None):
+        """Row filtering for the CSV fallback, same semantics as the snapshot reader."""
+        unknown = [name for name in (filters or {}) if name not in df.columns]
+        if unknown:
+            raise ValueError(f"Filter columns not in snapshot: {unknown}")
+        for name, condition in (filters or {}).items():
+            if isinstance(condition, tuple):
+                lo, hi = condition
+                if lo is not None:
+                    df = df[df[name] >= lo]
+                if hi is not None:
+                    df = df[df[name] <= hi]
+            else:
+                df = df[df[name].isin(list(condition))]
+        return df if columns is None else df[list(columns)]
+
     def _get_mock_data(self):
         """Internal helper to fetch synthetic mock portfolio."""
         try:
@@ -0,0 +1,338 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from src.harmonizer import CURRENT_YEAR
+from src.mock_data import MOCK_IPC_SUBCLASSES
+from src.snapshot_exporter import MANIFEST_NAME
+from src.snapshot_store import SNAPSHOT_SUFFIX, write_snapshot
+from src.sql_client import _bounded_map
+
+# Tables emitted per chunk; every one of them is keyed (or foreign-keyed) on appln_id
+SYNTHETIC_TABLES = ['tls201_appln', 'tls203_appln_abstr', 'tls209_appln_ipc', 'tls211_pat_publn',
+                    'tls212_citation', 'tls231_inpadoc_legal_event']
+FIRST_APPLN_ID = 400_000_000
+
+# Filing authorities with rough relative filing volumes
+AUTHORITIES = ['CN', 'US', 'EP', 'JP', 'KR', 'DE', 'WO', 'GB', 'FR', 'CA', 'AU', 'IN']
+AUTHORITY_WEIGHTS = [0.30, 0.20, 0.12, 0.10, 0.07, 0.05, 0.08, 0.02, 0.02, 0.02, 0.01, 0.01]
+# IPC symbols: subclass + main group / subgroup, PATSTAT spacing ('G06F  17/30')
+IPC_GROUPS = [1, 3, 5, 7, 9, 11, 13, 15, 17, 19, 21, 23]
+IPC_SUBGROUPS = ['00', '02', '10', '30']
+ABSTRACT_TEMPLATES = [
+    "A method and system in the field of {} with improved efficiency.",
+    "An apparatus relating to {} comprising a controller and a sensing unit.",
+    "A composition and process for {} applications.",
+]
+# Fee payments etc.: frequent tls231 codes that map to no legal state
+NOISE_EVENT_CODE = 'PGFP'
+DAYS_PER_YEAR = 365
+
+
+def _vocabulary():
+    symbols = np.array([f"{sub}{group:>4}/{subgroup}" for sub in MOCK_IPC_SUBCLASSES
+                        for group in IPC_GROUPS for subgroup in IPC_SUBGROUPS], dtype=object)
+    abstracts = np.array([t.format(sub) for sub in MOCK_IPC_SUBCLASSES for t in ABSTRACT_TEMPLATES], dtype=object)
+    return symbols, abstracts
+
+
+def _spread(counts):
+    """Owner index of each repeated row, plus its position 0..count-1 within the owner."""
+    owners = np.repeat(np.arange(len(counts)), counts)
+    position = np.arange(len(owners)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owners, position
+
+
+class SyntheticPatstat:
+    """
+    Seeded multi-table PATSTAT stand-in (tls201 / 203 / 209 / 211 / 212 / 231) for load tests.
+
+    Applications get contiguous ids in filing-date order (volume grows over the years),
+    split into chunks of `chunk_size` ids. Chunk k draws from its own Generator seeded
+    with (seed, k), so a chunk is the same whichever process generates it and in
+    whatever order; chunks can therefore be generated in parallel and streamed out.
+
+    Referential integrity: DOCDB families (heavy-tailed sizes) stay inside one chunk,
+    publications, IPC codes and legal events belong to their chunk's applications, and
+    citations only point to older applications outside the citing family (ids below
+    the family's first member), which exist in an earlier position of the same run.
+    """
+    def __init__(self, n_applications, seed=42, chunk_size=500_000, first_appln_id=FIRST_APPLN_ID,
+                 start_year=2000, end_year=CURRENT_YEAR - 1, mean_citations=5.0, growth=3.0):
+        self.n_applications = int(n_applications)
+        self.seed = seed
+        self.chunk_size = int(chunk_size)
+        self.first_appln_id = int(first_appln_id)
+        self.start_year = start_year
+        self.end_year = end_year
+        self.mean_citations = mean_citations
+        if growth <= 0:
+            raise ValueError(f"growth must be positive (1.0 = uniform volume), got {growth}")
+        self.growth = growth
+
+    @property
+    def params(self):
+        return {
+            'n_applications': self.n_applications, 'seed': self.seed, 'chunk_size': self.chunk_size,
+            'first_appln_id': self.first_appln_id, 'start_year': self.start_year, 'end_year': self.end_year,
+            'mean_citations': self.mean_citations, 'growth': self.growth,
+        }
+
+    @property
+    def n_chunks(self):
+        return -(-self.n_applications // self.chunk_size)
+
+    def chunk_bounds(self, chunk):
+        """appln_id range [lo, hi) of one chunk."""
+        lo = self.first_appln_id + chunk * self.chunk_size
+        return lo, min(lo + self.chunk_size, self.first_appln_id + self.n_applications)
+
+    # --- 1. ONE CHUNK ---
+    def _filing_dates(self, rng, positions):
+        """Filing dates for global positions: density grows `growth`-fold over the period."""
+        start = np.datetime64(f'{self.start_year}-01-01', 'D')
+        span = (np.datetime64(f'{self.end_year + 1}-01-01', 'D') - start).astype(np.int64)
+        fraction = (positions + 0.5) / self.n_applications
+        if self.growth == 1:
+            offset = fraction * span  # uniform volume over the period
+        else:
+            offset = np.log1p(fraction * (self.growth - 1)) / np.log(self.growth) * span
+        jitter = rng.integers(-15, 16, len(positions))
+        return start + np.clip(offset.astype(np.int64) + jitter, 0, span - 1).astype('timedelta64[D]')
+
+    def _published_positions(self):
+        """How many of the first positions are surely A-published (filing + 18 months) by now."""
+        start = np.datetime64(f'{self.start_year}-01-01', 'D')
+        span = (np.datetime64(f'{self.end_year + 1}-01-01', 'D') - start).astype(np.int64)
+        # Latest publication = priority + jitter + a year's delay for later members + 18 months
+        latest = np.datetime64(f'{CURRENT_YEAR}-01-01', 'D') - np.timedelta64(15 + DAYS_PER_YEAR + 548, 'D')
+        share = np.clip((latest - start).astype(np.int64) / span, 0, 1)
+        fraction = share if self.growth == 1 else (self.growth ** share - 1) / (self.growth - 1)
+        return int(np.clip(fraction * self.n_applications - 0.5, 0, self.n_applications))
+
+    def generate_chunk(self, chunk):
+        """All tables of one chunk as {table name: DataFrame}."""
+        rng = np.random.default_rng([self.seed, chunk])
+        lo, hi = self.chunk_bounds(chunk)
+        n = hi - lo
+        appln_ids = np.arange(lo, hi, dtype=np.int64)
+        horizon = np.datetime64(f'{CURRENT_YEAR}-01-01', 'D')
+        symbols, abstracts = _vocabulary()
+        n_subclasses = len(MOCK_IPC_SUBCLASSES)
+
+        # Families: heavy-tailed sizes over consecutive ids, cut at the chunk end
+        sizes = np.minimum(rng.zipf(2.2, n), 60)
+        sizes = sizes[:np.searchsorted(np.cumsum(sizes), n) + 1]
+        sizes[-1] -= sizes.sum() - n
+        family, member = _spread(sizes)
+        family_first = appln_ids[np.cumsum(sizes) - sizes][family]
+
+        # tls201: priority from the first member, others filed abroad within a year
+        priority = self._filing_dates(rng, np.flatnonzero(member == 0) + (lo - self.first_appln_id))
+        filed = priority[family] + np.where(member == 0, 0, rng.integers(0, DAYS_PER_YEAR, n)).astype('timedelta64[D]')
+        weights = np.asarray(AUTHORITY_WEIGHTS) / np.sum(AUTHORITY_WEIGHTS)
+        authority = np.asarray(AUTHORITIES, dtype=object)[rng.choice(len(AUTHORITIES), n, p=weights)]
+        tls201 = pd.DataFrame({
+            'appln_id': appln_ids,
+            'appln_auth': authority,
+            'appln_filing_date': filed,
+            'appln_filing_year': filed.astype('datetime64[Y]').astype(np.int64) + 1970,
+            'earliest_filing_date': priority[family],
+            'earliest_filing_year': priority[family].astype('datetime64[Y]').astype(np.int64) + 1970,
+            'docdb_family_id': family_first,
+            'docdb_family_size': sizes[family],
+        })
+
+        # tls209: a family shares a (Zipf-popular) home subclass; 1 + Poisson codes per application
+        popularity = 1.0 / np.arange(1, n_subclasses + 1)
+        home = rng.choice(n_subclasses, len(sizes), p=popularity / popularity.sum())[family]
+        n_codes = np.minimum(1 + rng.poisson(1.2, n), 8)
+        owner, position = _spread(n_codes)
+        subclass = np.where((position == 0) | (rng.random(len(owner)) < 0.7), home[owner],
+                            rng.integers(0, n_subclasses, len(owner)))
+        per_subclass = len(IPC_GROUPS) * len(IPC_SUBGROUPS)
+        tls209 = pd.DataFrame({
+            'appln_id': appln_ids[owner],
+            'ipc_class_symbol': symbols[subclass * per_subclass + rng.integers(0, per_subclass, len(owner))],
+        })
+        tls203 = pd.DataFrame({
+            'appln_id': appln_ids,
+            'appln_abstract': abstracts[home * len(ABSTRACT_TEMPLATES) + rng.integers(0, len(ABSTRACT_TEMPLATES), n)],
+        })
+
+        # Legal path (EP-style): grant 3-6 years after filing, oppositions, lapses, withdrawals
+        def days(low, high):
+            return rng.integers(low * DAYS_PER_YEAR, high * DAYS_PER_YEAR, n).astype('timedelta64[D]')
+
+        grant = filed + days(3, 6)
+        granted = (rng.random(n) < 0.65) & (grant < horizon)
+        opposed = granted & (rng.random(n) < 0.08)
+        opposition = grant + days(0, 1)
+        outcome = np.array(['REJO', '27A', '27W', None], dtype=object)[rng.choice(4, n, p=[0.4, 0.2, 0.3, 0.1])]
+        decided = opposed & (outcome != None)
+        revoked = decided & (outcome == '27W')
+        lapsed = granted & ~revoked & (rng.random(n) < 0.12)
+        withdrawn = ~granted & (rng.random(n) < 0.35)
+        n_fees = np.where(granted & ~revoked, rng.poisson(3, n), 0)
+        fee_owner, fee_year = _spread(n_fees)
+        events = [
+            (granted, 'GRAA', grant),
+            (opposed, 'PLBI', opposition),
+            (decided, outcome, opposition + days(1, 3)),
+            (lapsed, 'LAPS', grant + days(2, 12)),
+            (withdrawn, rng.choice(np.array(['WDRI', '18D'], dtype=object), n), filed + days(1, 4)),
+        ]
+        frames = [
+            pd.DataFrame({'appln_id': appln_ids[mask],
+                          'event_code': np.broadcast_to(np.asarray(code, dtype=object), (n,))[mask],
+                          'event_publn_date': dates[mask]})
+            for mask, code, dates in events
+        ]
+        frames.append(pd.DataFrame({
+            'appln_id': appln_ids[fee_owner],
+            'event_code': NOISE_EVENT_CODE,
+            'event_publn_date': grant[fee_owner] + ((fee_year + 1) * DAYS_PER_YEAR).astype('timedelta64[D]'),
+        }))
+        tls231 = pd.concat(frames, ignore_index=True)
+        tls231 = tls231[tls231['event_publn_date'] < horizon].sort_values('appln_id', kind='stable', ignore_index=True)
+
+        # tls211: A publication 18 months after filing (id 2 * appln_id), B at grant (2 * appln_id + 1)
+        a_date = filed + np.timedelta64(548, 'D')
+        a_published = a_date < horizon
+        claims = np.clip(rng.lognormal(2.7, 0.5, n), 1, 200).astype(np.int64)
+        tls211 = pd.concat([
+            pd.DataFrame({'pat_publn_id': appln_ids[a_published] * 2, 'appln_id': appln_ids[a_published],
+                          'publn_auth': authority[a_published], 'publn_kind': 'A1',
+                          'publn_date': a_date[a_published], 'publn_claims': claims[a_published]}),
+            pd.DataFrame({'pat_publn_id': appln_ids[granted] * 2 + 1, 'appln_id': appln_ids[granted],
+                          'publn_auth': authority[granted], 'publn_kind': 'B1',
+                          'publn_date': grant[granted], 'publn_claims': np.maximum(claims[granted] - 2, 1)}),
+        ]).sort_values('pat_publn_id', kind='stable', ignore_index=True)
+
+        # tls212: each A publication cites older applications outside its family; half of
+        # the citations go to recent work, half to a skewed pick over all older applications
+        # (early applications become heavily cited hubs)
+        # Only already published applications are cited, so every cited_pat_publn_id exists
+        older = np.minimum(family_first - self.first_appln_id, self._published_positions())
+        p = 2.0 / (2.0 + self.mean_citations)
+        n_cites = np.where(a_published & (older > 0), rng.negative_binomial(2, p, n), 0)
+        citing, citn_id = _spread(n_cites)
+        span = older[citing]
+        recent = rng.random(len(citing)) < 0.5
+        gap = 1 + np.minimum(rng.pareto(1.0, len(citing)) * np.maximum(span * 0.001, 1), span - 1).astype(np.int64)
+        cited = self.first_appln_id + np.where(recent, span - gap, (span * rng.random(len(citing)) ** 2).astype(np.int64))
+        tls212 = pd.DataFrame({
+            'pat_publn_id': appln_ids[citing] * 2,
+            'citn_id': citn_id + 1,
+            'cited_pat_publn_id': cited * 2,
+            'cited_appln_id': cited,
+        })
+
+        return {
+            'tls201_appln': tls201, 'tls203_appln_abstr': tls203, 'tls209_appln_ipc': tls209,
+            'tls211_pat_publn': tls211, 'tls212_citation': tls212, 'tls231_inpadoc_legal_event': tls231,
+        }
+
+    # --- 2. STREAMING / PARALLEL GENERATION ---
+    def iter_chunks(self, max_workers=1, chunks=None):
+        """Yields (chunk, tables) in chunk order; max_workers > 1 generates in worker processes."""
+        chunks = range(self.n_chunks) if chunks is None else list(chunks)
+        if max_workers <= 1:
+            for chunk in chunks:
+                yield chunk, self.generate_chunk(chunk)
+            return
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            # Bounded window: a slow consumer holds at most 2 * max_workers chunks in memory
+            tasks = ((self.params, chunk) for chunk in chunks)
+            yield from zip(chunks, _bounded_map(pool, _generate_chunk, tasks, 2 * max_workers))
+
+    def iter_table(self, table, max_workers=1):
+        """Streams one table chunk by chunk."""
+        for _, tables in self.iter_chunks(max_workers):
+            yield tables[table]
+
+    def tables(self, max_workers=1):
+        """Every table fully in memory (small runs, e.g. a LocalPatstatClient)."""
+        parts = {}
+        for _, tables in self.iter_chunks(max_workers):
+            for name, df in tables.items():
+                parts.setdefault(name, []).append(df)
+        return {name: pd.concat(frames, ignore_index=True) for name, frames in parts.items()}
+
+    def local_client(self, max_workers=1):
+        """LocalPatstatClient serving the generated tables (Live-mode code paths offline)."""
+        from src.local_patstat import LocalPatstatClient
+        return LocalPatstatClient(self.tables(max_workers))
+
+    # --- 3. EXPORT LAYOUT ---
+    def write_export(self, out_dir, max_workers=1, tables=None):
+        """
+        Writes the tables in the PatstatExporter layout (one columnar part per table and
+        chunk + export_manifest.json), so iter_exported_table and the Static loaders read
+        them like a real mirror. Workers write their own parts; chunks already recorded in
+        the manifest are skipped, so an interrupted run resumes.
+        """
+        tables = list(tables or SYNTHETIC_TABLES)
+        manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+        where = f"synthetic seed={self.seed} n={self.n_applications}"
+        manifest = None
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest['range_size'] != self.chunk_size or manifest['where'] != where:
+                raise ValueError(f"{manifest_path} holds a different export; use a new output directory.")
+        if manifest is None:
+            last = self.first_appln_id + self.n_applications - 1
+            manifest = {'version': 1, 'range_size': self.chunk_size, 'where': where,
+                        'key_bounds': [self.first_appln_id, last], 'completed': {}}
+        for table in tables:
+            manifest['completed'].setdefault(table, {})
+            os.makedirs(os.path.join(out_dir, table), exist_ok=True)
+
+        def done(chunk):
+            lo, hi = self.chunk_bounds(chunk)
+            return all(f"{lo}-{hi}" in manifest['completed'][t] for t in tables)
+
+        def save():
+            tmp_path = f"{manifest_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f, indent=1)
+            os.replace(tmp_path, manifest_path)
+
+        pending = [chunk for chunk in range(self.n_chunks) if not done(chunk)]
+        print(f"🧪 Writing {len(pending)} synthetic chunks ({self.n_chunks - len(pending)} already done) "
+              f"with {max_workers} workers...")
+        tasks = [(self.params, chunk, out_dir, tables) for chunk in pending]
+        save()
+        pool = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+        try:
+            for key, parts in (pool.map(_write_chunk, tasks) if pool else map(_write_chunk, tasks)):
+                for table, entry in parts.items():
+                    manifest['completed'][table][key] = entry
+                save()
+        finally:
+            if pool:
+                pool.shutdown()
+        print(f"✅ Synthetic export complete: {out_dir}")
+        return manifest
+
+
+def _generate_chunk(task):
+    params, chunk = task
+    return SyntheticPatstat(**params).generate_chunk(chunk)
+
+
+def _write_chunk(task):
+    """Worker: generates one chunk and writes its parts; returns the manifest entries."""
+    params, chunk, out_dir, tables = task
+    generator = SyntheticPatstat(**params)
+    lo, hi = generator.chunk_bounds(chunk)
+    generated = generator.generate_chunk(chunk)
+    parts = {}
+    for table in tables:
+        relpath = os.path.join(table, f"part-{lo:012d}-{hi:012d}{SNAPSHOT_SUFFIX}")
+        write_snapshot(generated[table], os.path.join(out_dir, relpath))
+        parts[table] = {'rows': len(generated[table]), 'part': relpath}
+    return f"{lo}-{hi}", parts
@@ -0,0 +1,152 @@
+import pandas as pd
+import numpy as np
+import os
+
+# IPC symbol prefix length per hierarchy level ('G06F 17/30' -> 'G', 'G06', 'G06F')
+IPC_LEVELS = {
+    'section': 1,
+    'class': 3,
+    'subclass': 4,
+}
+DEFAULT_LEVEL = 'subclass'
+DEFAULT_BASE = 2.0
+
+
+def shannon_entropies(distributions, base=DEFAULT_BASE):
+    """
+    Row-wise H = -sum(p * log p) of a 2-D array of distributions (zeros ignored, each
+    row renormalized). Rows are summed left to right, so zero padding never changes a
+    row's result: a ragged set of distributions can be padded into one array.
+    """
+    p = np.atleast_2d(np.asarray(distributions, dtype=np.float64))
+    p = np.where(p > 0, p, 0.0)
+    totals = np.cumsum(p, axis=1)[:, -1:] if p.shape[1] else np.zeros((len(p), 1))
+    p = np.divide(p, totals, out=np.zeros_like(p), where=totals > 0)
+    terms = p * np.log(np.where(p > 0, p, 1.0))
+    sums = np.cumsum(terms, axis=1)[:, -1] if p.shape[1] else np.zeros(len(p))
+    return 0.0 - sums / np.log(base)
+
+
+def shannon_entropy(probabilities, base=DEFAULT_BASE):
+    """H = -sum(p * log p) of one distribution (zeros ignored, weights renormalized)."""
+    return float(shannon_entropies(np.ravel(probabilities), base)[0])
+
+
+class TechDiversityEngine:
+    """
+    Technological breadth of each patent's impact: the Shannon entropy of the
+    IPC distribution of the applications citing it (Hall-style generality).
+
+    Every citing application counts once in each distinct IPC class (at `level`)
+    it carries. For a patent with class counts c_k and T = sum(c_k):
+        H = log T - sum(c_k * log c_k) / T
+    so each patent needs only T and sum(c log c), both bincounts over sorted
+    (patent, class) keys. Citation edges are streamed in chunks that end on patent
+    boundaries, which keeps memory flat for tens of millions of edges.
+
+    fit() stores the per-node result; scores() afterwards is a gather, so rescoring
+    never recomputes the entropy.
+    """
+    def __init__(self, level=DEFAULT_LEVEL, base=DEFAULT_BASE, window=None, chunk_size=5_000_000):
+        self.level = level
+        self.base = base
+        self.window = window
+        self.chunk_size = chunk_size
+        self.index = None
+        self.classes = None
+        self.entropy = None
+
+    @property
+    def is_fitted(self):
+        return self.entropy is not None
+
+    # --- 1. NODE -> IPC CLASSES ---
+    def _node_classes(self, index, ipc_df, id_col, symbol_col):
+        """CSR (indptr, class codes) of the distinct IPC classes per graph node."""
+        pos = index.positions(ipc_df[id_col])
+        symbols = ipc_df[symbol_col]
+        keep = (pos >= 0) & symbols.notna().to_numpy()
+        # String work happens once per distinct symbol, rows only carry integer codes
+        symbol_codes, symbol_uniques = pd.factorize(symbols[keep])
+        prefixes = pd.Series(symbol_uniques, dtype=object).astype(str).str.replace(' ', '', regex=False)
+        prefix_codes, self.classes = pd.factorize(prefixes.str[:IPC_LEVELS[self.level]])
+        codes = prefix_codes[symbol_codes]
+        n_classes = max(len(self.classes), 1)
+
+        keys = np.sort(pos[keep].astype(np.int64) * n_classes + codes)
+        if len(keys):
+            keys = keys[np.r_[True, keys[1:] != keys[:-1]]]
+        indptr = np.zeros(index.n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys // n_classes, minlength=index.n_nodes), out=indptr[1:])
+        return indptr, (keys % n_classes).astype(np.int32)
+
+    # --- 2. ENTROPY ---
+    def fit(self, index, ipc_df, id_col='appln_id', symbol_col='ipc_class_symbol'):
+        """
+        index: CitationIndex; ipc_df: tls209-style rows (one per application and IPC symbol)
+        covering the citing applications. Returns self.
+        """
+        class_ptr, class_codes = self._node_classes(index, ipc_df, id_col, symbol_col)
+        n_classes = max(len(self.classes), 1)
+        per_node = np.diff(class_ptr)
+        totals = np.zeros(index.n_nodes)
+        c_log_c = np.zeros(index.n_nodes)
+
+        for rows, citing in index.iter_forward_edges(self.chunk_size, self.window):
+            # One (cited row, class) key per class of every citing application
+            repeats = per_node[citing]
+            first = np.repeat(class_ptr[citing], repeats)
+            offsets = np.arange(len(first)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+            keys = np.sort(np.repeat(rows, repeats) * n_classes + class_codes[first + offsets])
+            if len(keys) == 0:
+                continue
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            counts = np.diff(np.r_[starts, len(keys)]).astype(np.float64)
+            owners = keys[starts] // n_classes
+            totals += np.bincount(owners, weights=counts, minlength=index.n_nodes)
+            c_log_c += np.bincount(owners, weights=counts * np.log(counts), minlength=index.n_nodes)
+
+        entropy = np.zeros(index.n_nodes)
+        cited = totals > 0
+        entropy[cited] = (np.log(totals[cited]) - c_log_c[cited] / totals[cited]) / np.log(self.base)
+        # Clean tiny negative round-off for single-class distributions
+        self.entropy = np.maximum(entropy, 0.0)
+        self.index = index
+        return self
+
+    # --- 3. LOOKUPS ---
+    def scores(self, ids=None):
+        """Entropy per application id (0 for patents without classified citing applications)."""
+        if not self.is_fitted:
+            raise ValueError("TechDiversityEngine.fit() must be called first.")
+        if ids is None:
+            return self.entropy
+        pos = self.index.positions(ids)
+        return np.where(pos >= 0, self.entropy[pos], 0.0)
+
+    def distribution(self, appln_id, ipc_df, id_col='appln_id', symbol_col='ipc_class_symbol'):
+        """IPC class shares of one patent's citing applications (for inspection)."""
+        citing = self.index.citing(appln_id)
+        rows = ipc_df[ipc_df[id_col].isin(citing) & ipc_df[symbol_col].notna()]
+        prefixes = rows[symbol_col].astype(str).str.replace(' ', '', regex=False).str[:IPC_LEVELS[self.level]]
+        distinct = pd.DataFrame({'appln': rows[id_col].to_numpy(), 'ipc': prefixes.to_numpy()}).drop_duplicates()
+        return distinct['ipc'].value_counts(normalize=True)
+
+    # --- 4. PERSISTENCE ---
+    def save(self, path):
+        """Writes the per-node entropy next to a saved CitationIndex (same node order)."""
+        target = os.path.join(path, f"tech_diversity_{self.level}.npy")
+        tmp_target = f"{target}.tmp.npy"
+        np.save(tmp_target, self.entropy, allow_pickle=False)
+        os.replace(tmp_target, target)
+        return target
+
+    @classmethod
+    def load(cls, index, path, level=DEFAULT_LEVEL, mmap=True, **kwargs):
+        """Fitted engine from save(); raises FileNotFoundError if this level was never saved."""
+        engine = cls(level=level, **kwargs)
+        entropy = np.load(os.path.join(path, f"tech_diversity_{level}.npy"), mmap_mode='r' if mmap else None)
+        if len(entropy) != index.n_nodes:
+            raise ValueError(f"{path}: tech diversity does not match the citation index.")
+        engine.entropy, engine.index = entropy, index
+        return engine
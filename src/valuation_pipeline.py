@@ -0,0 +1,537 @@
+import pandas as pd
+import numpy as np
+import threading
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from src.citation_index import DEFAULT_INDEX_DIR, CitationIndex
+from src.citation_influence import CitationInfluence
+from src.family_rollup import FAMILY_COLUMNS, FamilyRollupEngine
+from src.fanout import FANOUT_REDUCERS, collapse_fanout
+from src.harmonizer import CURRENT_YEAR, harmonize_portfolio
+from src.instrumentation import PipelineProfiler
+from src.legal_events import LegalStateEngine
+from src.scenario_engine import ScenarioEngine
+from src.schema import SCORE_DTYPE, apply_schema, memory_report
+from src.scoring_engine import ScoringEngine
+from src.sector_classifier import default_classifier
+from src.tech_diversity import TechDiversityEngine
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_EXPORT_DIR = os.path.abspath(os.path.join(current_dir, '..', 'data', 'export'))
+LEGAL_EVENT_COLUMNS = ['appln_id', 'event_code', 'event_publn_date']
+
+
+def load_raw_portfolio(n, mode):
+    """Default acquisition stage: Live per-table fetch, Static snapshot or Mock, with Mock fallback."""
+    from src.sql_client import shared_data_manager
+    dm = shared_data_manager(mode)
+    if "Live" in mode:
+        # Per-table projected fetches run concurrently and are joined locally,
+        # so abstracts are not repeated for every IPC row of the server-side JOIN
+        raw_df = dm.get_portfolio(n, min_year=2018)
+    else:
+        raw_df = dm.get_data()
+
+    # Fallback to Mock if fetch fails
+    if raw_df is None or raw_df.empty:
+        from src.mock_data import generate_mock_portfolio
+        raw_df = generate_mock_portfolio(n)
+    return raw_df
+
+
+def _mock_filing_years(raw_df):
+    if 'appln_filing_year' in raw_df.columns:
+        return raw_df['appln_filing_year']
+    return CURRENT_YEAR - 20 + raw_df['Remaining_Life']
+
+
+def load_citation_index(raw_df, mode):
+    """
+    Default citation stage: Live tls212 fetch for the portfolio's applications, the
+    Static index snapshot (data/citation_index) or a mock graph for mock-shaped frames.
+    Returns a CitationIndex, or None (Citations then falls back to the harmonizer proxy).
+    """
+    if 'appln_id' not in raw_df.columns:
+        # Mock portfolio (also reached when Live / Static fell back to Mock)
+        from src.mock_data import generate_mock_citations
+        edges, nodes = generate_mock_citations(raw_df['Patent_ID'], _mock_filing_years(raw_df))
+        return CitationIndex.from_edges(edges['citing'], edges['cited'], nodes)
+
+    if "Live" in mode:
+        from src.sql_client import shared_data_manager
+        fetched = shared_data_manager(mode).get_citations(raw_df['appln_id'])
+        if fetched is not None:
+            edges, nodes = fetched
+            return CitationIndex.from_edges(edges['citing'], edges['cited'], nodes)
+    elif os.path.exists(os.path.join(DEFAULT_INDEX_DIR, 'manifest.json')):
+        return CitationIndex.load(DEFAULT_INDEX_DIR)
+
+    print("⚠️ No citation index available. Using Family_Size proxy for Citations.")
+    return None
+
+
+def load_tech_diversity(index, raw_df, mode):
+    """
+    Default diversity stage: citing-field entropy over `index` from tls209 codes of the
+    citing applications (Live), the entropy saved next to the Static index, or mock codes.
+    Returns a fitted TechDiversityEngine, or None.
+    """
+    if 'appln_id' not in raw_df.columns:
+        from src.mock_data import generate_mock_ipc
+        # Citing applications inherit the topic of the (first) patent they cite
+        cites = np.diff(index.bwd_indptr) > 0
+        anchors = np.arange(index.n_nodes)
+        anchors[cites] = index.bwd_indices[index.bwd_indptr[:-1][cites]]
+        ipc_df = generate_mock_ipc(index.ids, anchors=index.ids[anchors])
+        return TechDiversityEngine().fit(index, ipc_df)
+
+    if "Live" in mode:
+        from src.sql_client import shared_data_manager
+        citing_ids = index.ids[np.diff(index.bwd_indptr) > 0]
+        ipc_df = shared_data_manager(mode).get_ipc_codes(citing_ids)
+        if ipc_df is not None:
+            return TechDiversityEngine().fit(index, ipc_df)
+    else:
+        try:
+            return TechDiversityEngine.load(index, DEFAULT_INDEX_DIR)
+        except (OSError, ValueError):
+            pass
+
+    print("⚠️ No citing-field IPC data available. Tech_Score without diversity term.")
+    return None
+
+
+def load_legal_states(raw_df, mode):
+    """
+    Default legal stage: tls231 events of the portfolio reduced to one legal state per
+    application, from batched Live queries, the Static export (data/export) or mock events.
+    Returns LegalStateEngine.fit() output indexed by the portfolio's id column, or None.
+    """
+    engine = LegalStateEngine()
+    if 'appln_id' not in raw_df.columns:
+        from src.mock_data import generate_mock_legal_events
+        # Mock ids are strings: events are keyed on dense codes and mapped back
+        codes, uniques = pd.factorize(raw_df['Patent_ID'])
+        first = np.unique(codes, return_index=True)[1]
+        years = np.asarray(_mock_filing_years(raw_df))[first]
+        states = engine.fit(generate_mock_legal_events(np.arange(len(uniques)), years))
+        states.index = pd.Index(np.asarray(uniques)[states.index], name='Patent_ID')
+        return states
+
+    appln_ids = raw_df['appln_id'].dropna().astype(np.int64)
+    if "Live" in mode:
+        from src.sql_client import shared_data_manager
+        try:
+            return engine.fit_chunks(shared_data_manager(mode).iter_legal_events(appln_ids))
+        except Exception as e:
+            # No states rather than partial ones: missing batches would all read 'Pending'
+            print(f"❌ Legal Event Query Error: {e}")
+    else:
+        from src.snapshot_exporter import MANIFEST_NAME, iter_exported_table
+        if os.path.exists(os.path.join(DEFAULT_EXPORT_DIR, MANIFEST_NAME)) and len(appln_ids):
+            # The id range skips whole row groups; isin keeps the portfolio's events
+            bounds = {'appln_id': (int(appln_ids.min()), int(appln_ids.max()))}
+            wanted = pd.Index(appln_ids.unique())
+            chunks = iter_exported_table(DEFAULT_EXPORT_DIR, 'tls231_inpadoc_legal_event', LEGAL_EVENT_COLUMNS, bounds)
+            return engine.fit_chunks(chunk[chunk['appln_id'].isin(wanted)] for chunk in chunks)
+
+    print("⚠️ No legal event data available. Legal_Score without event multiplier.")
+    return None
+
+
+def load_family_rollup(raw_df, mode):
+    """
+    Default family stage: DOCDB family figures (members, authorities, earliest priority)
+    for the portfolio's families from all their tls201 members, via batched Live queries,
+    the Static export (data/export) or mock families.
+    Returns FamilyRollupEngine.fit() output indexed by family key, or None.
+    """
+    engine = FamilyRollupEngine()
+    if 'appln_id' not in raw_df.columns:
+        from src.mock_data import generate_mock_families
+        # Every mock patent is its own family, keyed by Patent_ID (codes mapped back)
+        codes, uniques = pd.factorize(raw_df['Patent_ID'])
+        first = np.unique(codes, return_index=True)[1]
+        sizes = np.asarray(raw_df['Family_Size'])[first] if 'Family_Size' in raw_df.columns else 1
+        years = np.asarray(_mock_filing_years(raw_df))[first]
+        families = engine.fit(generate_mock_families(np.arange(len(uniques)) + 1, sizes, years))
+        families.index = pd.Index(np.asarray(uniques)[families.index - 1], name='Patent_ID')
+        return families
+
+    if 'docdb_family_id' not in raw_df.columns:
+        print("⚠️ No docdb_family_id in the portfolio. Market_Score from Family_Size.")
+        return None
+    family_ids = raw_df['docdb_family_id'].dropna()
+    if "Live" in mode:
+        from src.sql_client import shared_data_manager
+        try:
+            return engine.fit_chunks(shared_data_manager(mode).iter_family_members(family_ids))
+        except Exception as e:
+            print(f"❌ Family Query Error: {e}")
+    else:
+        from src.snapshot_exporter import MANIFEST_NAME, iter_exported_table
+        if os.path.exists(os.path.join(DEFAULT_EXPORT_DIR, MANIFEST_NAME)):
+            # Family members are spread over all appln_id ranges: every part is scanned
+            wanted = pd.Index(family_ids.unique())
+            chunks = iter_exported_table(DEFAULT_EXPORT_DIR, 'tls201_appln', FAMILY_COLUMNS)
+            return engine.fit_chunks(chunk[chunk['docdb_family_id'].isin(wanted)] for chunk in chunks)
+
+    print("⚠️ No family data available. Market_Score from Family_Size.")
+    return None
+
+
+class _Memo:
+    """Tiny thread-safe LRU keyed on a stage's own inputs."""
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class _KeyedLocks:
+    """One lock per key, created on first use and dropped once no thread holds or awaits it."""
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks = {}
+
+    @contextmanager
+    def hold(self, key):
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+
+class ValuationPipeline:
+    """
+    The Valuation Engine's data path as explicit stages, each memoized on its own inputs:
+
+        acquire(n, mode)                 -> raw frame
+        prepare(n, mode)                 -> classified, harmonized, scored frame (+ sector codes)
+        scenario_matrix(n, mode, ...)    -> N x S values for every scenario (one broadcast)
+        value(n, mode, scenario)         -> Standard_Value / AI_Value split (a column of the above)
+
+    Only the scenario stages depend on the scenario set, so switching "Market Condition"
+    reuses the scored frame, and switching between known scenarios is a column pick.
+    Thread-safe, so one instance can be shared across Streamlit sessions: each memo key
+    has its own lock, so sessions only wait on each other for the same stage inputs.
+    Per-session custom scenarios are passed in as a ScenarioEngine and memoized on its key.
+    """
+    def __init__(self, loader=None, scorer=None, classifier=None, scenarios=None, compact=True, memo_size=2,
+                 citation_loader=None, diversity_loader=None, influence=False, legal_loader=None,
+                 family_loader=None):
+        self.loader = loader or load_raw_portfolio
+        self.citation_loader = citation_loader or load_citation_index
+        self.diversity_loader = diversity_loader or load_tech_diversity
+        self.legal_loader = legal_loader or load_legal_states
+        self.family_loader = family_loader or load_family_rollup
+        self.compact = compact
+        # influence=True scores Tech on influence-weighted citations (src/citation_influence.py)
+        self.influence = influence
+        citation_column = 'Influence_Citations' if influence else 'Citations'
+        # Compact portfolios are scored in float32 (see src/schema.py)
+        self.scorer = scorer or ScoringEngine(SCORE_DTYPE if compact else np.float64, citation_column)
+        self.classifier = classifier or default_classifier
+        self.scenarios = scenarios or ScenarioEngine()
+        self._raw = _Memo(memo_size)
+        self._citations = _Memo(memo_size)
+        self._diversity = _Memo(memo_size)
+        self._influence = _Memo(memo_size)
+        self._legal = _Memo(memo_size)
+        self._families = _Memo(memo_size)
+        # Survives clear(): the next fit (e.g. after a re-fetch) warm-starts from it
+        self._last_influence = None
+        self._prepared = _Memo(memo_size)
+        self._memory = _Memo(memo_size)
+        self._matrices = _Memo(memo_size * 4)
+        self._valued = _Memo(memo_size * 8)
+        # One lock per (stage, key): a slow Live fetch only blocks callers waiting for the
+        # same result; stages nest in one direction (value -> ... -> acquire), so no cycles
+        self._stage_locks = _KeyedLocks()
+        # Guards the warm-start chain (_last_influence), which every key shares
+        self._influence_lock = threading.Lock()
+
+    def clear(self):
+        for memo in (self._raw, self._citations, self._diversity, self._influence, self._legal, self._families, self._prepared, self._memory, self._matrices, self._valued):
+            memo.clear()
+
+    # --- STAGE 1: ACQUISITION ---
+    def acquire(self, n, mode, profiler=None):
+        profiler = profiler or PipelineProfiler()
+        key = (n, mode)
+        with self._stage_locks.hold(('raw', key)):
+            raw_df = self._raw.get(key)
+            if raw_df is None:
+                with profiler.stage('acquisition') as stage:
+                    raw_df = stage.output(self.loader(n, mode))
+                self._raw.put(key, raw_df)
+            return raw_df
+
+    def citation_index(self, n, mode, profiler=None):
+        """CitationIndex for the acquired portfolio (None if no citation source is available)."""
+        profiler = profiler or PipelineProfiler()
+        key = (n, mode)
+        with self._stage_locks.hold(('citations', key)):
+            cached = self._citations.get(key)
+            if cached is None:
+                raw_df = self.acquire(n, mode, profiler)
+                with profiler.stage('citation_index', rows_in=len(raw_df)):
+                    cached = (self.citation_loader(raw_df, mode),)
+                self._citations.put(key, cached)
+            return cached[0]
+
+    def tech_diversity(self, n, mode, profiler=None):
+        """Fitted TechDiversityEngine for the portfolio's citation graph (None without one)."""
+        profiler = profiler or PipelineProfiler()
+        key = (n, mode)
+        with self._stage_locks.hold(('diversity', key)):
+            cached = self._diversity.get(key)
+            if cached is None:
+                index = self.citation_index(n, mode, profiler)
+                engine = None
+                if index is not None:
+                    with profiler.stage('tech_diversity', rows_in=index.n_edges):
+                        engine = self.diversity_loader(index, self.acquire(n, mode, profiler), mode)
+                cached = (engine,)
+                self._diversity.put(key, cached)
+            return cached[0]
+
+    def citation_influence(self, n, mode, profiler=None):
+        """Fitted CitationInfluence for the portfolio's citation graph (None without one)."""
+        profiler = profiler or PipelineProfiler()
+        key = (n, mode)
+        with self._stage_locks.hold(('influence', key)):
+            cached = self._influence.get(key)
+            if cached is None:
+                index = self.citation_index(n, mode, profiler)
+                scorer = None
+                if index is not None:
+                    with self._influence_lock, profiler.stage('citation_influence', rows_in=index.n_edges):
+                        if self._last_influence is not None:
+                            # Re-fetched / resized portfolio: push only what changed
+                            scorer = self._last_influence.update(index)
+                        else:
+                            warm_start = None
+                            if "Static" in mode:
+                                warm_start = CitationInfluence.load_warm_start(DEFAULT_INDEX_DIR)
+                            scorer = CitationInfluence().fit(index, warm_start=warm_start)
+                        self._last_influence = scorer
+                cached = (scorer,)
+                self._influence.put(key, cached)
+            return cached[0]
+
+    def legal_states(self, n, mode, profiler=None):
+        """Legal state per application from tls231 events (None without an event source)."""
+        profiler = profiler or PipelineProfiler()
+        key = (n, mode)
+        with self._stage_locks.hold(('legal', key)):
+            cached = self._legal.get(key)
+            if cached is None:
+                raw_df = self.acquire(n, mode, profiler)
+                with profiler.stage('legal_events', rows_in=len(raw_df)):
+                    cached = (self.legal_loader(raw_df, mode),)
+                self._legal.put(key, cached)
+            return cached[0]
+
+    def family_rollup(self, n, mode, profiler=None):
+        """DOCDB family figures for the portfolio's families (None without a family source)."""
+        profiler = profiler or PipelineProfiler()
+        key = (n, mode)
+        with self._stage_locks.hold(('families', key)):
+            cached = self._families.get(key)
+            if cached is None:
+                raw_df = self.acquire(n, mode, profiler)
+                with profiler.stage('family_rollup', rows_in=len(raw_df)):
+                    cached = (self.family_loader(raw_df, mode),)
+                self._families.put(key, cached)
+            return cached[0]
+
+    # --- STAGES 2-5: FAN-OUT, CITATIONS, CLASSIFICATION, HARMONIZATION, SCHEMA, SCORING ---
+    def prepare(self, n, mode, profiler=None):
+        profiler = profiler or PipelineProfiler()
+        key = (n, mode)
+        with self._stage_locks.hold(('prepared', key)):
+            prepared = self._prepared.get(key)
+            if prepared is not None:
+                return prepared
+            raw_df = self.acquire(n, mode, profiler)
+            index = self.citation_index(n, mode, profiler)
+            df = self.score_frame(
+                raw_df, profiler,
+                index=index,
+                diversity=self.tech_diversity(n, mode, profiler) if index is not None else None,
+                influence=self.citation_influence(n, mode, profiler) if index is not None and self.influence else None,
+                states=self.legal_states(n, mode, profiler),
+                families=self.family_rollup(n, mode, profiler),
+                memory_key=key,
+            )
+            # Sector codes let every scenario be applied as a small-table gather
+            codes, sectors = pd.factorize(df['Sector'], use_na_sentinel=True)
+            prepared = (df, codes, pd.Index(sectors))
+            self._prepared.put(key, prepared)
+            return prepared
+
+    def stage_inputs(self, raw_df, mode, profiler=None, graph=None):
+        """
+        Unmemoized stage inputs for one raw frame, straight from the loaders, as keyword
+        arguments of score_frame(). `graph` = (index, diversity, influence) reuses an
+        already loaded citation graph instead of calling the citation loaders again.
+        """
+        profiler = profiler or PipelineProfiler()
+        if graph is None:
+            with profiler.stage('citation_index', rows_in=len(raw_df)):
+                index = self.citation_loader(raw_df, mode)
+            diversity = influence = None
+            if index is not None:
+                with profiler.stage('tech_diversity', rows_in=index.n_edges):
+                    diversity = self.diversity_loader(index, raw_df, mode)
+                if self.influence:
+                    with profiler.stage('citation_influence', rows_in=index.n_edges):
+                        influence = CitationInfluence().fit(index)
+            graph = (index, diversity, influence)
+        with profiler.stage('legal_events', rows_in=len(raw_df)):
+            states = self.legal_loader(raw_df, mode)
+        with profiler.stage('family_rollup', rows_in=len(raw_df)):
+            families = self.family_loader(raw_df, mode)
+        index, diversity, influence = graph
+        return {'index': index, 'diversity': diversity, 'influence': influence,
+                'states': states, 'families': families}
+
+    def score_frame(self, raw_df, profiler=None, index=None, diversity=None, influence=None,
+                    states=None, families=None, memory_key=None):
+        """
+        Stages 2-5 on one raw frame given the loaded stage inputs: fan-out collapse,
+        citation / legal / family columns, classification, harmonization, schema and
+        scoring. prepare() runs it on the whole portfolio, StreamingScorer on every
+        key-aligned chunk, so both paths produce the same rows.
+        """
+        profiler = profiler or PipelineProfiler()
+
+        # One row per application before anything is scored or summed
+        id_column = 'appln_id' if 'appln_id' in raw_df.columns else 'Patent_ID'
+        if id_column in raw_df.columns and not raw_df[id_column].is_unique:
+            with profiler.stage('collapse_fanout', rows_in=len(raw_df)) as stage:
+                reducers = {c: r for c, r in FANOUT_REDUCERS.items() if c in raw_df.columns}
+                raw_df = stage.output(collapse_fanout(raw_df, key=id_column, reducers=reducers,
+                                                      classifier=self.classifier))
+
+        # Forward citations (distinct citing families) and prior art from the citation graph
+        if index is not None:
+            with profiler.stage('citation_counts', rows_in=len(raw_df)) as stage:
+                ids = raw_df[id_column]
+                raw_df = stage.output(raw_df.assign(
+                    Citations=index.forward_counts(ids, dedup_families=True),
+                    Backward_Citations=index.backward_counts(ids),
+                ))
+            if diversity is not None:
+                raw_df = raw_df.assign(Tech_Diversity=diversity.scores(ids))
+            if influence is not None:
+                raw_df = raw_df.assign(
+                    Citation_Influence=influence.influence(ids),
+                    Influence_Citations=influence.weighted_citations(ids),
+                )
+
+        # Latest legal event per application (Pending without any mapped event)
+        if states is not None:
+            aligned = LegalStateEngine.align(states, raw_df[id_column])
+            raw_df = raw_df.assign(**{
+                column: aligned[column].to_numpy()
+                for column in ('Legal_Status', 'Legal_Status_Date', 'Event_Code', 'Grant_Date')
+            })
+
+        # Family-level economics broadcast to members, with each family's value share
+        if families is not None:
+            family_key = raw_df['docdb_family_id'] if 'docdb_family_id' in raw_df.columns else raw_df[id_column]
+            aligned = FamilyRollupEngine.broadcast(families, family_key)
+            raw_df = raw_df.assign(**{column: aligned[column].to_numpy() for column in aligned.columns})
+
+        # Live already returns a Sector column computed from all IPC codes
+        if 'Sector' not in raw_df.columns and 'ipc_class_symbol' in raw_df.columns:
+            with profiler.stage('sector_classification', rows_in=len(raw_df)) as stage:
+                raw_df = stage.output(raw_df.assign(Sector=self.classifier.classify(raw_df['ipc_class_symbol'])))
+
+        with profiler.stage('harmonization', rows_in=len(raw_df)) as stage:
+            df = stage.output(harmonize_portfolio(raw_df, classifier=self.classifier))
+
+        if self.compact:
+            with profiler.stage('schema', rows_in=len(df)) as stage:
+                compact_df = stage.output(apply_schema(df))
+                if memory_key is not None:
+                    self._memory.put(memory_key, memory_report(df, compact_df))
+                df = compact_df
+
+        with profiler.stage('scoring', rows_in=len(df)) as stage:
+            df = self.scorer.bulk_score(df)
+            df['Standard_Value'] = df['Estimated_Value']
+            stage.output(df)
+        return df
+
+    def memory_report(self, n, mode):
+        """Per-column bytes before/after the compact schema (None until prepared, or if not compact)."""
+        return self._memory.get((n, mode))
+
+    # --- STAGE 6: SCENARIO MATRIX ---
+    def scenario_matrix(self, n, mode, scenarios=None, profiler=None):
+        """Returns (N x S value matrix, scenario names) for every scenario in `scenarios`."""
+        profiler = profiler or PipelineProfiler()
+        scenarios = self.scenarios if scenarios is None else scenarios
+        key = (n, mode, scenarios.key)
+        with self._stage_locks.hold(('matrix', key)):
+            cached = self._matrices.get(key)
+            if cached is not None:
+                return cached
+            df, codes, sectors = self.prepare(n, mode, profiler)
+            with profiler.stage('scenario_matrix', rows_in=len(df)) as stage:
+                matrix = stage.output(scenarios.value_matrix(df['Standard_Value'], codes, sectors))
+            cached = (matrix, list(scenarios.names))
+            self._matrices.put(key, cached)
+            return cached
+
+    # --- STAGE 7: DYNAMIC VALUATION SPLIT ---
+    def value(self, n, mode, scenario, scenarios=None, profiler=None):
+        profiler = profiler or PipelineProfiler()
+        scenarios = self.scenarios if scenarios is None else scenarios
+        key = (n, mode, scenarios.key, scenario)
+        with self._stage_locks.hold(('valued', key)):
+            valued = self._valued.get(key)
+            if valued is not None:
+                return valued
+            df = self.prepare(n, mode, profiler)[0]
+            matrix = self.scenario_matrix(n, mode, scenarios, profiler)[0]
+            with profiler.stage('valuation_split', rows_in=len(df)) as stage:
+                valued = stage.output(df.assign(AI_Value=matrix[:, scenarios.index(scenario)]))
+            self._valued.put(key, valued)
+            return valued
+
+    def run(self, n, mode, scenario, scenarios=None, profiler=None):
+        """Returns (frame, profile report) with only the recomputed stages in the report."""
+        profiler = profiler or PipelineProfiler()
+        df = self.value(n, mode, scenario, scenarios, profiler)
+        return df, profiler.report()
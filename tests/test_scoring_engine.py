@@ -0,0 +1,36 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(root_dir)
+
+from src.scoring_engine import PatentValueEngine
+
+
+def test_tech_scores_match_scalar_for_distributions():
+    engine = PatentValueEngine()
+    rng = np.random.default_rng(3)
+    # Ragged IPC share vectors, some with zero shares, some empty
+    distributions = [rng.random(rng.integers(0, 20)) for _ in range(500)]
+    for d in distributions[::3]:
+        d[rng.random(len(d)) < 0.4] = 0.0
+    expected = np.array([engine.calculate_tech_score(d) for d in distributions])
+
+    np.testing.assert_array_equal(engine.calculate_tech_scores(pd.Series(distributions)), expected)
+
+    square = rng.random((200, 12))
+    square[square < 0.3] = 0.0
+    np.testing.assert_array_equal(engine.calculate_tech_scores(square),
+                                  [engine.calculate_tech_score(row) for row in square])
+
+
+def test_tech_scores_keep_precomputed_entropies():
+    engine = PatentValueEngine()
+    entropies = [0.0, 1.2, 3.0]
+    np.testing.assert_array_equal(engine.calculate_tech_scores(entropies),
+                                  [engine.calculate_tech_score(h) for h in entropies])
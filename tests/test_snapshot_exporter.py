@@ -0,0 +1,97 @@
+import os
+import sys
+
+import pytest
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(root_dir)
+
+from src.local_patstat import LocalPatstatClient
+from src.snapshot_exporter import EXPORT_TABLES, PatstatExporter, read_exported_table
+from src.synthetic_patstat import SyntheticPatstat
+
+RANGE_SIZE = 500
+
+
+class FlakyClient:
+    """Wraps a LocalPatstatClient; `fail(sql, calls)` decides which range queries raise."""
+    def __init__(self, client, fail):
+        self.client = client
+        self.fail = fail
+        self.calls = 0
+
+    def sql_query(self, query, use_legacy_sql=False):
+        self.calls += 1
+        error = self.fail(query, self.calls)
+        if error is not None:
+            raise error
+        return self.client.sql_query(query, use_legacy_sql=use_legacy_sql)
+
+
+@pytest.fixture(scope='module')
+def source():
+    tables = SyntheticPatstat(3_000, chunk_size=1_000).tables()
+    return {name: tables[name] for name in EXPORT_TABLES}
+
+
+@pytest.fixture(scope='module')
+def client(source):
+    return LocalPatstatClient(source)
+
+
+def assert_matches_source(out_dir, source):
+    for table, df in source.items():
+        exported = read_exported_table(out_dir, table)
+        assert len(exported) == len(df), table
+        assert exported['appln_id'].sort_values().tolist() == df['appln_id'].sort_values().tolist()
+
+
+def test_interrupted_export_resumes(tmp_path, client, source):
+    out_dir = str(tmp_path / 'export')
+    # Interrupt the first run after a few range queries (1 bounds query + ranges)
+    interrupting = FlakyClient(client, lambda sql, calls: KeyboardInterrupt() if calls > 6 else None)
+    with pytest.raises(KeyboardInterrupt):
+        PatstatExporter(interrupting, out_dir, range_size=RANGE_SIZE, max_workers=1).run()
+
+    resumed = PatstatExporter(client, out_dir, range_size=RANGE_SIZE, max_workers=2)
+    n_logged = len(client.query_log)
+    result = resumed.run()
+
+    assert result['complete']
+    n_ranges = len(resumed.plan())
+    done_before = n_ranges - (len(client.query_log) - n_logged)
+    assert 0 < done_before < n_ranges
+    assert_matches_source(out_dir, source)
+
+
+def test_failed_ranges_are_retried(tmp_path, client, source):
+    out_dir = str(tmp_path / 'export')
+    failed_once = set()
+
+    def fail_first_attempt(sql, calls):
+        # Every tls209 range fails on its first attempt, then succeeds
+        if 'FROM tls209_appln_ipc' in sql and sql not in failed_once:
+            failed_once.add(sql)
+            return RuntimeError("transient upstream error")
+        return None
+
+    result = PatstatExporter(FlakyClient(client, fail_first_attempt), out_dir,
+                             range_size=RANGE_SIZE, max_retries=1).run()
+
+    assert result['complete'] and failed_once
+    assert_matches_source(out_dir, source)
+
+
+def test_exhausted_retries_are_left_for_the_next_run(tmp_path, client, source):
+    out_dir = str(tmp_path / 'export')
+    down = FlakyClient(client, lambda sql, calls: RuntimeError("down") if 'FROM tls231' in sql else None)
+
+    result = PatstatExporter(down, out_dir, range_size=RANGE_SIZE, max_retries=1).run()
+    assert not result['complete']
+    assert {table for table, _, _ in result['failed']} == {'tls231_inpadoc_legal_event'}
+
+    resumed = PatstatExporter(client, out_dir, range_size=RANGE_SIZE)
+    assert resumed.run()['complete']
+    assert_matches_source(out_dir, source)
@@ -0,0 +1,57 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(root_dir)
+
+from src.snapshot_store import SnapshotReader, write_snapshot
+
+
+def _is_memory_mapped(array):
+    """True if `array` is a view whose base chain ends in a np.memmap (no copy in between)."""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base if isinstance(array, np.ndarray) else None
+    return False
+
+
+def make_snapshot(path, n_rows=10_000):
+    df = pd.DataFrame({
+        'appln_id': np.arange(n_rows, dtype=np.int64),
+        'Citations': np.arange(n_rows, dtype=np.float64) / 3,
+        'Sector': np.where(np.arange(n_rows) % 2, 'Biotech', 'AI & Software'),
+    })
+    write_snapshot(df, path, row_group_size=4_000)
+    return df
+
+
+def test_projected_numeric_columns_stay_memory_mapped(tmp_path):
+    path = str(tmp_path / 'portfolio.snapshot')
+    make_snapshot(path)
+    reader = SnapshotReader(path)
+
+    for df in reader.iter_row_groups(columns=['appln_id', 'Citations']):
+        for name in df.columns:
+            assert _is_memory_mapped(df[name].to_numpy()), name
+
+    # A single row group is handed back without any copy as well
+    single = reader.read(columns=['Citations'], filters={'appln_id': (0, 100)})
+    assert len(single) == 101
+
+
+def test_filters_match_source(tmp_path):
+    path = str(tmp_path / 'portfolio.snapshot')
+    source = make_snapshot(path)
+    reader = SnapshotReader(path)
+
+    ranged = reader.read(columns=['appln_id'], filters={'appln_id': (3_500, 4_500)})
+    assert ranged['appln_id'].tolist() == list(range(3_500, 4_501))
+    # Range filter on a dictionary-encoded column: no min/max stats, labels compared row by row
+    labelled = reader.read(columns=['appln_id'], filters={'Sector': ('B', 'C')})
+    assert len(labelled) == (source['Sector'] == 'Biotech').sum()
@@ -0,0 +1,111 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(root_dir)
+
+from src.citation_index import CitationIndex
+from src.family_rollup import FamilyRollupEngine
+from src.legal_events import LegalStateEngine
+from src.mock_data import MOCK_AUTHORITIES, generate_mock_ipc, generate_mock_legal_events
+from src.streaming import StreamingScorer
+from src.tech_diversity import TechDiversityEngine
+from src.valuation_pipeline import ValuationPipeline
+
+MODE = "📁 Static Snapshot"
+N_APPLICATIONS = 600
+
+
+class ChunkedSource:
+    """DataManager stand-in: fixed-size row chunks that ignore application boundaries."""
+    mode = MODE
+
+    def __init__(self, raw_df):
+        self.raw_df = raw_df
+
+    def iter_data(self, chunk_size, query=None, columns=None, filters=None):
+        for start in range(0, len(self.raw_df), chunk_size):
+            yield self.raw_df.iloc[start:start + chunk_size]
+
+
+@pytest.fixture(scope='module')
+def world():
+    """JOIN-shaped portfolio with IPC fan-out, plus chunk-independent stage sources."""
+    rng = np.random.default_rng(7)
+    ids = np.arange(1, N_APPLICATIONS + 1, dtype=np.int64) * 10
+    years = rng.integers(2005, 2022, N_APPLICATIONS)
+    fanout = rng.integers(1, 5, N_APPLICATIONS)
+    owner = np.repeat(np.arange(N_APPLICATIONS), fanout)
+    raw_df = pd.DataFrame({
+        'appln_id': ids[owner],
+        'appln_filing_year': years[owner],
+        'docdb_family_size': rng.integers(1, 12, N_APPLICATIONS)[owner],
+        'docdb_family_id': (ids + 1)[owner],
+        # Claims differ between fan-out rows (one per publication): reduced with max
+        'publn_claims': rng.integers(1, 40, len(owner)),
+        'ipc_class_symbol': generate_mock_ipc(ids[owner], max_codes=1)['ipc_class_symbol'].to_numpy(),
+    })
+
+    # Citation graph over the portfolio and outside applications
+    outside = np.arange(1, 3 * N_APPLICATIONS, dtype=np.int64) * 10 + 5
+    citing = rng.choice(np.r_[ids, outside], 4 * N_APPLICATIONS)
+    cited = rng.choice(ids, 4 * N_APPLICATIONS)
+    all_ids = np.unique(np.r_[ids, outside])
+    nodes = pd.DataFrame({'year': rng.integers(2000, 2024, len(all_ids)),
+                          'family': all_ids // 20}, index=all_ids)
+    index = CitationIndex.from_edges(citing, cited, nodes)
+    diversity = TechDiversityEngine().fit(index, generate_mock_ipc(index.ids))
+
+    events = generate_mock_legal_events(ids, years)
+    # Every family: the portfolio member plus 0-3 members held by others
+    extra = rng.integers(0, 4, N_APPLICATIONS)
+    members = np.r_[np.arange(N_APPLICATIONS), np.repeat(np.arange(N_APPLICATIONS), extra)]
+    tls201 = pd.DataFrame({
+        'docdb_family_id': (ids + 1)[members],
+        'appln_id': np.r_[ids, np.arange(len(members) - N_APPLICATIONS) * 10 + 7],
+        'appln_auth': np.asarray(MOCK_AUTHORITIES, dtype=object)[rng.integers(0, len(MOCK_AUTHORITIES), len(members))],
+        'earliest_filing_date': pd.Series(years[members]).astype(str).add('-03-01').to_numpy(dtype=object),
+    })
+    return raw_df, index, diversity, events, tls201
+
+
+def make_pipeline(world, influence=False):
+    raw_df, index, diversity, events, tls201 = world
+    return ValuationPipeline(
+        loader=lambda n, mode: raw_df,
+        citation_loader=lambda raw, mode: index,
+        diversity_loader=lambda index, raw, mode: diversity,
+        legal_loader=lambda raw, mode: LegalStateEngine().fit(events[events['appln_id'].isin(raw['appln_id'])]),
+        family_loader=lambda raw, mode: FamilyRollupEngine().fit(
+            tls201[tls201['docdb_family_id'].isin(raw['docdb_family_id'])]),
+        influence=influence,
+    )
+
+
+@pytest.mark.parametrize('chunk_size', [97, 1_000, 10_000])
+def test_streamed_output_matches_in_memory(world, chunk_size):
+    raw_df = world[0]
+    expected = make_pipeline(world).prepare(N_APPLICATIONS, MODE)[0]
+    scorer = StreamingScorer(ChunkedSource(raw_df), chunk_size=chunk_size, pipeline=make_pipeline(world))
+    batches = list(scorer.iter_scored())
+    streamed = pd.concat(batches, ignore_index=True)
+
+    # One row per application, fan-out collapsed inside key-aligned chunks
+    assert len(streamed) == len(expected) == N_APPLICATIONS
+    assert streamed['Patent_ID'].is_unique
+    assert list(streamed.columns) == list(expected.columns)
+    # Same compact scoring dtype as the in-memory path
+    assert streamed['Estimated_Value'].dtype == expected['Estimated_Value'].dtype
+
+    codes = 'ipc_codes'
+    assert [list(c) for c in streamed[codes]] == [list(c) for c in expected[codes]]
+    pd.testing.assert_frame_equal(
+        streamed.drop(columns=codes), expected.drop(columns=codes).reset_index(drop=True),
+        check_dtype=False, check_categorical=False,
+    )